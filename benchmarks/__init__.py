@@ -0,0 +1,7 @@
+"""Synthetic data and timing harness for the journal.
+
+Run from the repository root::
+
+    python -m benchmarks.synthetic --years 3 --out /tmp/journal-3y
+    python -m benchmarks.run --years 3
+"""
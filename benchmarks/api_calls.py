@@ -0,0 +1,110 @@
+"""GitHub API cost of the user actions that write to the journal.
+
+Each action runs the way the app runs it with GitHub connected: the change
+is saved to the local journal and the sync engine's next round brings the
+repository up to date (a screenshot is also uploaded straight away, as the
+pages do). The repository is a :class:`benchmarks.fake_github.FakeGitHub`
+seeded with the journal, answering after ``latency`` seconds, so the
+numbers are requests, bytes and wall time rather than GitHub's weather:
+
+- ``add trade``: one manual trade on the last day;
+- ``add screenshot``: a 200 KB trading screenshot on the last day;
+- ``save review``: the last day's trading review;
+- ``import log``: a broker log of a new session's trades.
+
+For each action :func:`run_api_benchmarks` reports the median wall time
+and, per action, the requests made (``calls``, ``metered`` of them against
+the rate limit) and the bytes uploaded and downloaded.
+"""
+
+import json
+import os
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.fake_github import FakeGitHub
+from benchmarks.synthetic import fills_to_trade_log, generate_fills
+from journal.importer import merge_trades
+from journal.reconcile import reconcile_days
+from journal.risk import evaluate_from
+from journal.storage import DATA_FILE, GitHubStorage, save_local_data
+from journal.sync import SyncEngine
+from journal.trade_log import group_fills_into_trades, parse_trade_log
+
+SCREENSHOT_SIZE = 200_000
+
+
+def _add_trade(data, date_key, run):
+    trade = dict(data[date_key]['trade_day']['trades'][0])
+    trade.update(id=str(uuid.uuid4()), timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                 description=f"Benchmark trade {run}")
+    data[date_key]['trade_day']['trades'].append(trade)
+    reconcile_days(data, [date_key])
+    evaluate_from(data, date_key)
+
+
+def _save_review(data, date_key, run):
+    data[date_key]['trading'].update(general_comments=f"Benchmark review {run}", process_grade="B")
+
+
+def _import_log(data, date_key, run, seed):
+    day = datetime.strptime(date_key, "%Y-%m-%d").date() + timedelta(days=run + 1)
+    log = fills_to_trade_log(generate_fills(random.Random(seed + run), day, 10, [900000 + run * 1000]))
+    fills, _ = parse_trade_log(log)
+    added, updated, _ = merge_trades(data, group_fills_into_trades(fills))
+    days = sorted(set(added) | set(updated))
+    reconcile_days(data, days)
+    evaluate_from(data, days[0])
+
+
+def run_api_benchmarks(data, date_key, repeat, latency=0.05, seed=0):
+    """``{"api: <action>": timing and request counts}`` for each action, ``repeat`` times each
+
+    Runs in the working directory, which must hold ``data`` as the local
+    journal (and is where the sync state is written).
+    """
+    results = {}
+    with FakeGitHub(latency=latency) as github:
+        github.put_file(DATA_FILE, json.dumps(data, indent=2, default=str).encode())
+        remote = GitHubStorage()
+        remote.base_url = github.url
+        if not remote.connect("benchmark", github.owner, github.repo):
+            raise RuntimeError(f"Fake GitHub refused the connection: {remote.last_error}")
+        engine = SyncEngine(remote, state_file=os.path.abspath("benchmark_sync_state.json"))
+        # Both sides start with the same journal: the first round only records it as synced
+        if not engine.sync_once():
+            raise RuntimeError(f"First sync failed: {engine.error}")
+
+        def upload_screenshot(data, date_key, run):
+            url = remote.upload_screenshot(os.urandom(SCREENSHOT_SIZE), f"trading_{run}_chart.png", date_key)
+            data[date_key]['trading'].setdefault('trading_screenshots', []).append(
+                {'url': url, 'caption': f"Benchmark screenshot {run}"})
+
+        actions = {
+            'add trade': _add_trade,
+            'add screenshot': upload_screenshot,
+            'save review': _save_review,
+            'import log': lambda data, date_key, run: _import_log(data, date_key, run, seed),
+        }
+        for name, action in actions.items():
+            times, counts = [], []
+            for run in range(repeat):
+                github.reset()
+                start = time.perf_counter()
+                action(data, date_key, run)
+                save_local_data(data)
+                if not engine.sync_once():
+                    raise RuntimeError(f"{name}: sync failed: {engine.error}")
+                times.append(time.perf_counter() - start)
+                counts.append(github.stats())
+            results[f"api: {name}"] = {
+                'min': min(times),
+                'median': statistics.median(times),
+                'runs': repeat,
+                **{key: statistics.median(count[key] for count in counts) for key in counts[0]},
+            }
+        remote.client.close()
+    return results
@@ -0,0 +1,253 @@
+"""An in-process stand-in for the parts of the GitHub REST API the journal uses.
+
+:class:`FakeGitHub` serves one repository over HTTP on a local port, so
+:class:`journal.storage.GitHubStorage` and the sync engine can run against
+it unchanged (point ``base_url`` at :attr:`FakeGitHub.url` before
+connecting):
+
+- ``GET /repos/{owner}/{repo}``;
+- ``GET /repos/{owner}/{repo}/contents/{path}``: a file (base64, or without
+  content over 1 MB as GitHub does), its raw bytes with the
+  ``application/vnd.github.raw`` media type, or a directory listing. Files
+  carry an ``ETag`` and answer ``304`` to a matching ``If-None-Match``;
+- ``PUT /repos/{owner}/{repo}/contents/{path}``: creates or replaces a
+  file. Replacing needs the current blob SHA (``422`` without it, ``409``
+  with a stale one);
+- ``GET /repos/{owner}/{repo}/git/trees/{ref}``: every file, recursive.
+
+Blob SHAs are git's. Every response has the ``X-RateLimit-*`` headers of a
+token's hourly budget; a ``304`` does not spend it. When the budget runs
+out requests answer ``403``, and :attr:`FakeGitHub.retry_after` makes them
+answer ``429`` with ``Retry-After`` like GitHub's secondary limit.
+:attr:`FakeGitHub.latency` (plus up to :attr:`FakeGitHub.jitter`) seconds
+are added to every request.
+
+Each request is recorded with its status and the bytes sent each way;
+:meth:`FakeGitHub.stats` sums them since the last :meth:`FakeGitHub.reset`.
+
+    with FakeGitHub(latency=0.05) as github:
+        github.put_file("trading_journal_data.json", raw)
+        storage = GitHubStorage()
+        storage.base_url = github.url
+        storage.connect("token", github.owner, github.repo)
+"""
+
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+# Files over this size come from the contents API without their content
+MAX_INLINE_SIZE = 1024 * 1024
+
+RATE_LIMIT = 5000
+
+
+def blob_sha(raw):
+    """Git's blob id of ``raw``, what GitHub reports as a file's ``sha``"""
+    return hashlib.sha1(b"blob %d\0" % len(raw) + raw).hexdigest()
+
+
+class FakeGitHub:
+    """One repository behind a local HTTP server; see the module docstring"""
+
+    def __init__(self, owner="trader", repo="journal", latency=0.0, jitter=0.0, rate_limit=RATE_LIMIT, seed=0):
+        self.owner = owner
+        self.repo = repo
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self.retry_after = None
+        self.files = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        handler = type('Handler', (_Handler,), {'github': self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-github", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def put_file(self, path, raw):
+        """Set a file directly, without a request; returns its SHA"""
+        sha = blob_sha(raw)
+        with self.lock:
+            self.files[path] = (raw, sha)
+        return sha
+
+    def get_file(self, path):
+        with self.lock:
+            return self.files.get(path, (None, None))[0]
+
+    def reset(self):
+        """Forget the recorded requests"""
+        with self.lock:
+            self.requests = []
+
+    def stats(self):
+        """Requests since the last :meth:`reset`: counts and bytes each way"""
+        with self.lock:
+            requests = list(self.requests)
+        return {
+            'calls': len(requests),
+            'metered': sum(1 for r in requests if r['metered']),
+            'reads': sum(1 for r in requests if r['method'] == 'GET'),
+            'writes': sum(1 for r in requests if r['method'] != 'GET'),
+            'not_modified': sum(1 for r in requests if r['status'] == 304),
+            'bytes_up': sum(r['bytes_up'] for r in requests),
+            'bytes_down': sum(r['bytes_down'] for r in requests),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    github = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def _handle(self, method):
+        github = self.github
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b""
+        delay = github.latency + (github._random.uniform(0, github.jitter) if github.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        if github.retry_after:
+            status, payload, headers = 429, {'message': "You have exceeded a secondary rate limit."}, {
+                'Retry-After': str(github.retry_after)}
+        elif github.remaining <= 0:
+            status, payload, headers = 403, {'message': "API rate limit exceeded"}, {}
+        else:
+            try:
+                status, payload, headers = self._route(method, unquote(urlsplit(self.path).path), body)
+            except (ValueError, KeyError) as e:
+                status, payload, headers = 400, {'message': f"Problems parsing request: {e}"}, {}
+
+        raw = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        with github.lock:
+            metered = status != 304
+            if metered and status not in (403, 429):
+                github.remaining -= 1
+            github.requests.append({'method': method, 'path': self.path, 'status': status, 'metered': metered,
+                                    'bytes_up': length, 'bytes_down': len(raw)})
+            remaining = max(github.remaining, 0)
+
+        self.send_response(status)
+        self.send_header('Content-Type', headers.pop('Content-Type', "application/json; charset=utf-8"))
+        self.send_header('Content-Length', str(len(raw)))
+        self.send_header('X-RateLimit-Limit', str(github.rate_limit))
+        self.send_header('X-RateLimit-Remaining', str(remaining))
+        self.send_header('X-RateLimit-Used', str(github.rate_limit - remaining))
+        self.send_header('X-RateLimit-Reset', str(github.reset_at))
+        self.send_header('X-RateLimit-Resource', "core")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _route(self, method, path, body):
+        github = self.github
+        repo = f"/repos/{github.owner}/{github.repo}"
+        if path == repo and method == 'GET':
+            return 200, {'name': github.repo, 'full_name': f"{github.owner}/{github.repo}",
+                         'default_branch': "main", 'private': True}, {}
+        if path == repo + "/contents" or path.startswith(repo + "/contents/"):
+            file_path = path[len(repo + "/contents"):].strip("/")
+            if method == 'GET':
+                return self._get_contents(file_path)
+            if method == 'PUT':
+                return self._put_contents(file_path, json.loads(body))
+        if path.startswith(repo + "/git/trees/") and method == 'GET':
+            with github.lock:
+                files = sorted(github.files.items())
+            return 200, {'sha': blob_sha(repr(files).encode()), 'truncated': False, 'tree': [
+                {'path': name, 'type': 'blob', 'sha': sha, 'size': len(raw)} for name, (raw, sha) in files]}, {}
+        return 404, {'message': "Not Found"}, {}
+
+    def _get_contents(self, path):
+        github = self.github
+        with github.lock:
+            file = github.files.get(path)
+            files = dict(github.files)
+        if file is None:
+            return self._list_directory(path, files)
+
+        raw, sha = file
+        etag = f'W/"{sha}"'
+        if self.headers.get('If-None-Match') == etag:
+            return 304, b"", {'ETag': etag}
+        if self.headers.get('Accept') == "application/vnd.github.raw":
+            return 200, raw, {'Content-Type': "application/vnd.github.raw", 'ETag': etag}
+        content = {'name': path.rsplit("/", 1)[-1], 'path': path, 'sha': sha, 'size': len(raw), 'type': 'file'}
+        if len(raw) > MAX_INLINE_SIZE:
+            content.update(content="", encoding="none")
+        else:
+            content.update(content=base64.b64encode(raw).decode(), encoding="base64")
+        return 200, content, {'ETag': etag}
+
+    def _list_directory(self, path, files):
+        prefix = path + "/" if path else ""
+        items = {}
+        for name, (raw, sha) in files.items():
+            if not name.startswith(prefix):
+                continue
+            child, _, rest = name[len(prefix):].partition("/")
+            if rest:
+                items.setdefault(child, {'name': child, 'path': prefix + child, 'sha': None, 'size': 0, 'type': 'dir'})
+            else:
+                items[child] = {'name': child, 'path': name, 'sha': sha, 'size': len(raw), 'type': 'file'}
+        if not items:
+            return 404, {'message': "Not Found"}, {}
+        return 200, [items[name] for name in sorted(items)], {}
+
+    def _put_contents(self, path, body):
+        github = self.github
+        raw = base64.b64decode(body['content'])
+        sha = blob_sha(raw)
+        with github.lock:
+            current = github.files.get(path)
+            if current is not None and 'sha' not in body:
+                return 422, {'message': "Invalid request.\n\n\"sha\" wasn't supplied."}, {}
+            if current is not None and body['sha'] != current[1]:
+                return 409, {'message': f"{path} does not match {body['sha']}"}, {}
+            github.files[path] = (raw, sha)
+        return (200 if current else 201), {'content': {'name': path.rsplit("/", 1)[-1], 'path': path, 'sha': sha,
+                                                       'size': len(raw)},
+                                           'commit': {'message': body.get('message', '')}}, {}
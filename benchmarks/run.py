@@ -0,0 +1,291 @@
+"""Time the journal's hot paths on a synthetic journal and record the results.
+
+Each run generates a journal with :mod:`benchmarks.synthetic`, times the
+storage, balance, statistics, trade-log and market data (bar ingest,
+MAE/MFE, trade replay, live capture) functions plus a render of every page, and appends one JSON line to the results file. The GitHub API cost of
+each saving action (requests, bytes and wall time against a local fake of
+the API, see :mod:`benchmarks.api_calls`) is recorded alongside. The run is
+compared with the previous one recorded for the same parameters; any
+benchmark whose median, request count or bytes transferred got above
+``--threshold`` times the previous one is reported and the exit status is 1.
+
+    python -m benchmarks.run --years 3 --repeat 5
+    python -m benchmarks.run --years 1 --skip-pages --latency 200
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.api_calls import run_api_benchmarks
+from benchmarks.synthetic import generate_bars, generate_journal
+from journal.account import calculate_running_balance, get_account_settings
+from journal.analytics import trade_frame
+from journal.entries import get_trade_statistics
+from journal.git_storage import LocalGitBackend
+from journal.market_data import BarStore, trade_excursions
+from journal.pages import PAGES
+from journal.replay import _replay_figure, replay_figure
+from journal.risk import DEFAULT_RISK_SETTINGS, RiskEngine, RiskState, evaluate_from
+from journal.reconcile import get_commission_per_contract, reconcile_journal
+from journal.schema import is_date_key, migrate_journal
+from journal.tailer import LogTailer
+from journal.storage import load_local_data, save_local_data
+from journal.trade_log import group_fills_into_trades, parse_trade_log
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS = os.path.join(ROOT, 'benchmarks', 'results.jsonl')
+
+
+def measure(fn, repeat):
+    """Run ``fn`` ``repeat`` times; min and median wall time in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {'min': min(times), 'median': statistics.median(times), 'runs': repeat}
+
+
+def render_pages(date_key, repeat):
+    """Render each page through Streamlit's AppTest: first render and median rerun"""
+    from streamlit.testing.v1 import AppTest
+
+    timings = {}
+    for page in PAGES:
+        app = AppTest.from_file(os.path.join(ROOT, 'streamlit_app.py'), default_timeout=600)
+        # The app reads st.secrets on every run; give it a secrets dict without GitHub
+        app.secrets['benchmark'] = {'enabled': True}
+        app.session_state.page = page
+        app.session_state.current_date = datetime.strptime(date_key, "%Y-%m-%d").date()
+
+        start = time.perf_counter()
+        app.run()
+        first = time.perf_counter() - start
+        if app.exception:
+            raise RuntimeError(f"{page} raised: {app.exception[0].value}")
+
+        rerun = measure(app.run, repeat)
+        timings[f"page: {page}"] = {**rerun, 'first': first}
+    return timings
+
+
+def run_benchmarks(years, trades_per_day, seed, repeat, pages=True, api_latency=0.05):
+    """Generate a journal in a scratch directory and time every benchmark
+
+    ``api_latency`` is the fake GitHub's delay per request in seconds;
+    None skips the API benchmarks.
+    """
+    data, trade_logs = generate_journal(years, trades_per_day, seed)
+    day_keys = sorted(key for key in data if is_date_key(key))
+    settings = get_account_settings(data)
+
+    # One file with every session, the shape of a full-history broker export
+    header, _, _ = next(iter(trade_logs.values())).partition('\r\n')
+    full_log = header + '\r\n' + ''.join(log.partition('\r\n')[2] for log in trade_logs.values())
+    fills, _ = parse_trade_log(full_log)
+
+    timings = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        # Storage uses a path relative to the working directory, like the app
+        os.chdir(scratch)
+        try:
+            save_local_data(data)
+            size = os.path.getsize("trading_journal_data.json")
+
+            timings['load_local_data'] = measure(load_local_data, repeat)
+            timings['save_local_data'] = measure(lambda: save_local_data(data), repeat)
+            # The same save into a git working copy: the JSON write plus an in-process commit
+            git_backend = LocalGitBackend("git_journal")
+            saves = iter(range(repeat))
+            timings['save_local_git'] = measure(lambda: git_backend.save({**data, 'benchmark_save': next(saves)}), repeat)
+            timings['git_commit_screenshot'] = measure(
+                lambda: git_backend.save_file(f"screenshots/{day_keys[-1]}/shot.png", os.urandom(200_000)), repeat)
+            timings['calculate_running_balance'] = measure(
+                lambda: calculate_running_balance(data, day_keys[-1], settings['starting_balance'], settings['start_date']),
+                repeat)
+            timings['get_trade_statistics'] = measure(lambda: get_trade_statistics(data), repeat)
+            timings['reconcile_journal'] = measure(lambda: reconcile_journal(data, force=True), repeat)
+            # Unversioned copies take the full one-pass migration, as on the first load after an upgrade
+            unversioned = json.dumps({key: value for key, value in data.items() if key != 'schema_version'}, default=str)
+            copies = [json.loads(unversioned) for _ in range(repeat)]
+            timings['migrate_journal'] = measure(lambda: migrate_journal(copies.pop()), repeat)
+            # Every risk rule on: a full replay (new limits) and the per-trade check of live capture and imports
+            engine = RiskEngine({**DEFAULT_RISK_SETTINGS, 'daily_loss_limit': 500.0, 'trailing_drawdown': 2000.0,
+                                 'max_trades_per_day': 5, 'max_contracts': 2, 'news_times': ['08:30', '10:00']},
+                                get_commission_per_contract(data))
+            risk_data = json.loads(json.dumps(data, default=str))
+            timings['risk_evaluate_from'] = measure(lambda: evaluate_from(risk_data, "", engine), repeat)
+            day_trades = data[day_keys[-1]]['trade_day']['trades']
+            timings['risk_on_trade_x1000'] = measure(
+                lambda: [engine.on_trade(state, day_trades[i % len(day_trades)])
+                         for state in [RiskState()] for i in range(1000)], repeat)
+            timings['parse_trade_log'] = measure(lambda: parse_trade_log(full_log), repeat)
+            timings['group_fills_into_trades'] = measure(lambda: group_fills_into_trades([dict(fill) for fill in fills]), repeat)
+            # A fresh store per run: ingest is the first import of every symbol's history
+            bars = generate_bars(data, seed)
+            stores = iter([BarStore(f"market_data_{run}") for run in range(repeat)])
+
+            def ingest_bars():
+                store = next(stores)
+                for symbol, frame in bars.items():
+                    store.ingest(symbol, frame)
+
+            timings['bars_ingest'] = measure(ingest_bars, repeat)
+            trades = trade_frame(data, 'benchmark')
+            timings['trade_excursions'] = measure(lambda: trade_excursions(trades, BarStore("market_data_0")), repeat)
+
+            # Replay spanning the last day's session of one-second bars (every fill of its first trade's
+            # symbol), uncached and serialized for the browser as st.plotly_chart does
+            last_day = {day_keys[-1]: data[day_keys[-1]]}
+            for symbol, frame in generate_bars(last_day, seed, seconds=1).items():
+                BarStore().ingest(symbol, frame)
+            day_trades = data[day_keys[-1]]['trade_day']['trades']
+            trade = {'id': 'session', 'symbol': day_trades[0]['symbol'],
+                     'raw_fills': [fill for t in day_trades if t['symbol'] == day_trades[0]['symbol'] for fill in t['raw_fills']]}
+
+            def replay():
+                _replay_figure.clear()
+                replay_figure(trade, 'benchmark').to_json()
+
+            timings['trade_replay'] = measure(replay, repeat)
+
+            # The live panel's refresh: a snapshot of the tailer's session after the last day's log
+            with open("live_log.txt", 'w', newline='') as f:
+                f.write(trade_logs[day_keys[-1]])
+            tailer = LogTailer("live_log.txt", state_file="live_capture.json")
+            timings['tailer_poll'] = measure(tailer.poll, 1)
+            timings['live_snapshot_x1000'] = measure(lambda: [tailer.live_snapshot(1.0, 500.0) for _ in range(1000)], repeat)
+            if pages:
+                timings.update(render_pages(day_keys[-1], repeat))
+            # Last: the actions save to the local journal the pages render
+            if api_latency is not None:
+                api_data = json.loads(json.dumps(data, default=str))
+                timings.update(run_api_benchmarks(api_data, day_keys[-1], repeat, api_latency, seed))
+        finally:
+            os.chdir(cwd)
+
+    dataset = {
+        'days': len(day_keys),
+        'trades': sum(len(data[key]['trade_day']['trades']) for key in day_keys),
+        'fills': len(fills),
+        'bars': sum(len(frame) for frame in bars.values()),
+        'json_bytes': size,
+    }
+    return dataset, timings
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def previous_result(path, params):
+    """The last recorded run with the same parameters, or None"""
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                if record.get('params') == params:
+                    previous = record
+    return previous
+
+
+API_COUNTERS = ('calls', 'metered', 'bytes_up', 'bytes_down')
+
+
+def compare(timings, previous, threshold):
+    """Print each benchmark against the previous run; names that regressed"""
+    regressions = []
+    print(f"{'benchmark':<40} {'median':>10} {'min':>10} {'previous':>10} {'ratio':>7}")
+    for name, result in timings.items():
+        before = (previous or {}).get('timings', {}).get(name)
+        ratio = result['median'] / before['median'] if before and before['median'] > 0 else None
+        flag = ""
+        if ratio is not None and ratio > threshold:
+            regressions.append(name)
+            flag = "  << slower"
+        previous_median = f"{before['median'] * 1000:.1f}ms" if before else "—"
+        print(f"{name:<40} {result['median'] * 1000:>8.1f}ms {result['min'] * 1000:>8.1f}ms "
+              f"{previous_median:>10} {(f'{ratio:.2f}x' if ratio else '—'):>7}{flag}")
+
+    # Request counts and bytes are exact: any growth past the threshold is a regression, however fast the run
+    api = {name: result for name, result in timings.items() if 'calls' in result}
+    if api:
+        print(f"\n{'GitHub API per action':<40} {'calls':>6} {'metered':>8} {'uploaded':>10} {'downloaded':>11}")
+    for name, result in api.items():
+        before = (previous or {}).get('timings', {}).get(name) or {}
+        grew = [counter for counter in API_COUNTERS
+                if before.get(counter) is not None and result[counter] > before[counter] * threshold]
+        if grew and name not in regressions:
+            regressions.append(name)
+        flag = f"  << more {', '.join(grew)}" if grew else ""
+        print(f"{name:<40} {result['calls']:>6.0f} {result['metered']:>8.0f} {result['bytes_up'] / 1e3:>8.1f}kB "
+              f"{result['bytes_down'] / 1e3:>9.1f}kB{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the journal on synthetic data")
+    parser.add_argument('--years', type=float, default=1)
+    parser.add_argument('--trades-per-day', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--skip-pages', action='store_true', help="Do not render pages through AppTest")
+    parser.add_argument('--skip-api', action='store_true', help="Do not measure GitHub API calls per action")
+    parser.add_argument('--latency', type=float, default=50,
+                        help="Milliseconds the fake GitHub API takes per request")
+    parser.add_argument('--results', default=DEFAULT_RESULTS, help="JSONL file results are appended to")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="Report a regression when the median is this many times the previous one")
+    parser.add_argument('--no-record', action='store_true', help="Compare without appending this run")
+    args = parser.parse_args()
+
+    # Streamlit logs bare-mode and deprecation notices on every render; they would bury the table
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    api_latency = None if args.skip_api else args.latency / 1000
+    params = {'years': args.years, 'trades_per_day': args.trades_per_day, 'seed': args.seed,
+              'repeat': args.repeat, 'pages': not args.skip_pages, 'api_latency': api_latency}
+    dataset, timings = run_benchmarks(args.years, args.trades_per_day, args.seed, args.repeat,
+                                      pages=not args.skip_pages, api_latency=api_latency)
+
+    print(f"{dataset['days']} days, {dataset['trades']} trades, {dataset['fills']} fills, {dataset['bars']} bars, "
+          f"{dataset['json_bytes'] / 1e6:.1f} MB journal")
+    regressions = compare(timings, previous_result(args.results, params), args.threshold)
+
+    if not args.no_record:
+        record = {
+            'recorded_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'params': params,
+            'dataset': dataset,
+            'timings': timings,
+        }
+        with open(args.results, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) past {args.threshold}x the previous run: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
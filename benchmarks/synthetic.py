@@ -0,0 +1,295 @@
+"""Synthetic journals and broker trade logs.
+
+:func:`generate_journal` builds a journal shaped like the one the app
+writes: every weekday has a morning check-in, a trade day whose trades come
+from simulated fills (grouped by the app's own
+:func:`journal.trade_log.group_fills_into_trades`), a trading review with
+rule compliance and an evening recap, plus tags, rules, deposits and
+withdrawals. Each day's fills are also rendered as a Sierra Chart style TSV
+trade log (tab separated, CRLF line endings, double space in ``DateTime``)
+so the import path can be exercised on the same data.
+:func:`generate_bars` adds bars (one-minute by default) through those fills
+for the market data store, MAE/MFE and trade replays.
+
+Output is deterministic for a given seed apart from trade ids.
+"""
+
+import argparse
+import json
+import os
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from journal.entries import get_date_key
+from journal.reconcile import reconcile_journal
+from journal.rules import add_rule, to_bits
+from journal.schema import SCHEMA_VERSION, iter_days
+from journal.trade_log import group_fills_into_trades, parse_trade_log
+
+TRADE_LOG_HEADERS = [
+    'ActivityType', 'DateTime', 'TransDateTime', 'Symbol', 'OrderActionSource', 'InternalOrderID',
+    'ServiceOrderID', 'OrderType', 'Quantity', 'BuySell', 'Price', 'Price2', 'OrderStatus', 'FillPrice',
+    'FilledQuantity', 'TradeAccount', 'OpenClose', 'ParentInternalOrderID', 'PositionQuantity',
+    'FillExecutionServiceID', 'HighDuringPosition', 'LowDuringPosition', 'Note', 'AccountBalance',
+    'ExchangeOrderID', 'ClientOrderID', 'TimeInForce', 'Username', 'IsAutomated',
+]
+
+SYMBOLS = ['F.US.MNQU25', 'F.US.MNQU25', 'F.US.MNQU25', 'F.US.ENQU25']
+TICK = 0.25
+
+EMOTIONAL_STATES = ["Calm & Focused", "Excited", "Anxious", "Stressed", "Tired", "Confident", "Uncertain"]
+GRADES = ["A", "B", "C", "D", "F"]
+TAGS = ['2nd-entry', '3rd-entry', 'OD-continuation', 'absorption', 'breakout', 'long-continuation',
+        'failed-auction', 'news', 'reversal', 'trend-day']
+RULES = [
+    "Wait first 5 minutes",
+    "Micros only",
+    "30% giveback rule",
+    "No tilt reentries",
+    "No moving stops away from price",
+    "Take a breather between trades",
+    "Stop after 3 losers",
+]
+SENTENCES = [
+    "Market opened with a gap and filled it within the first hour.",
+    "Volume was light into lunch so I stepped aside.",
+    "Stuck to the plan on the first two entries, chased the third.",
+    "Good read on the overnight inventory, held the runner.",
+    "News at 10 made the open choppy, waited for acceptance.",
+    "Felt rushed after the first loser and sized up too early.",
+]
+
+
+def _text(rng, sentences=2):
+    return " ".join(rng.choice(SENTENCES) for _ in range(sentences))
+
+
+def _timestamp(day, seconds):
+    """Sierra Chart style timestamp: date, two spaces, time with microseconds"""
+    moment = datetime(day.year, day.month, day.day, 9, 30) + timedelta(seconds=seconds)
+    return moment.strftime("%Y-%m-%d  %H:%M:%S.%f")
+
+
+def generate_fills(rng, day, trades_per_day, counter):
+    """Simulated fills for one session as dicts keyed by TRADE_LOG_HEADERS
+
+    Each trade scales in with 1-3 entry fills and out with 1-3 exit fills,
+    so position quantity returns to zero at the end of every trade.
+    ``counter`` is a one-item list holding the next order/execution number.
+    """
+    fills = []
+    price = rng.uniform(15000, 25000) // TICK * TICK
+    clock = rng.randint(0, 300)
+
+    for _ in range(trades_per_day):
+        symbol = rng.choice(SYMBOLS)
+        side, opposite, sign = ('Buy', 'Sell', 1) if rng.random() < 0.5 else ('Sell', 'Buy', -1)
+        position = 0
+        high = low = price
+
+        entries = [rng.randint(1, 3) for _ in range(rng.randint(1, 3))]
+        total = sum(entries)
+        exits = []
+        while sum(exits) < total:
+            exits.append(min(rng.randint(1, 3), total - sum(exits)))
+
+        legs = [(side, quantity, 'Open') for quantity in entries] + [(opposite, quantity, 'Close') for quantity in exits]
+        for leg, (buy_sell, quantity, open_close) in enumerate(legs):
+            clock += rng.randint(5, 240)
+            price = round((price + rng.gauss(0, 8)) / TICK) * TICK
+            high, low = max(high, price), min(low, price)
+            position += quantity * (sign if open_close == 'Open' else -sign)
+            counter[0] += 1
+            fills.append({
+                'ActivityType': 'Fills',
+                'DateTime': _timestamp(day, clock),
+                'TransDateTime': '00:00:00.000000',
+                'Symbol': symbol,
+                'OrderActionSource': 'CQG order update. Status: FILL',
+                'InternalOrderID': str(counter[0]),
+                'ServiceOrderID': str(28000000 + counter[0]),
+                'OrderType': rng.choice(['Market', 'Limit', 'Stop']),
+                'Quantity': str(quantity),
+                'BuySell': buy_sell,
+                'Price': '',
+                'Price2': '',
+                'OrderStatus': 'Filled',
+                'FillPrice': f"{price:.2f}",
+                'FilledQuantity': str(quantity),
+                'TradeAccount': '156774',
+                'OpenClose': open_close,
+                'ParentInternalOrderID': '',
+                'PositionQuantity': str(position),
+                'FillExecutionServiceID': str(67500000000 + counter[0]),
+                # The broker leaves these blank on the fill that opens the position
+                'HighDuringPosition': f"{high:.2f}" if leg else '',
+                'LowDuringPosition': f"{low:.2f}" if leg else '',
+                'Note': '',
+                'AccountBalance': '0.00',
+                'ExchangeOrderID': '',
+                'ClientOrderID': f"{counter[0]}.{rng.randint(10000, 99999)}",
+                'TimeInForce': 'Day',
+                'Username': '',
+                'IsAutomated': 'N',
+            })
+        clock += rng.randint(60, 900)
+    return fills
+
+
+def fills_to_trade_log(fills):
+    """Render fills as a broker TSV export (CRLF line endings, header first)"""
+    lines = ['\t'.join(TRADE_LOG_HEADERS)]
+    for fill in fills:
+        lines.append('\t'.join(fill[header] for header in TRADE_LOG_HEADERS))
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def generate_journal(years=1, trades_per_day=10, seed=0, start=None):
+    """A journal covering ``years`` years of weekdays and each day's trade log
+
+    Returns ``(data, trade_logs)`` where ``trade_logs`` maps date keys to
+    TSV text. ``start`` defaults to ``years`` years before today.
+    """
+    rng = random.Random(seed)
+    start = start or date.today() - timedelta(days=365 * years)
+    end = start + timedelta(days=365 * years)
+
+    data = {'schema_version': SCHEMA_VERSION, 'tags': sorted(TAGS), 'transactions': []}
+    rule_ids = [add_rule(data, rule, created=get_date_key(start)) for rule in RULES]
+    data['account_settings'] = {
+        'starting_balance': 10000.0,
+        'start_date': get_date_key(start),
+        'last_updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    trade_logs = {}
+    counter = [10000]
+    day = start
+    while day <= end:
+        date_key = get_date_key(day)
+        if day.weekday() < 5:
+            log = fills_to_trade_log(generate_fills(rng, day, max(1, int(rng.gauss(trades_per_day, trades_per_day / 4))), counter))
+            trade_logs[date_key] = log
+
+            fills, _ = parse_trade_log(log)
+            trades = group_fills_into_trades(fills)
+            for trade in trades:
+                trade['tags'] = rng.sample(TAGS, rng.randint(0, 3))
+                if rng.random() < 0.3:
+                    below = -1 if trade['direction'] == "Long" else 1
+                    trade['stop_price'] = trade['entry_price'] + below * rng.randint(8, 60) * TICK
+
+            day_rules = rng.sample(rule_ids, rng.randint(3, len(rule_ids)))
+            followed = [rule_id for rule_id in day_rules if rng.random() < 0.75]
+            data[date_key] = {
+                'morning': {
+                    'sleep_quality': rng.randint(3, 10),
+                    'emotional_state': rng.choice(EMOTIONAL_STATES),
+                    'post_night_shift': rng.random() < 0.2,
+                    'checked_news': rng.random() < 0.8,
+                    'market_news': _text(rng, 1),
+                    'triggers_present': _text(rng, 1),
+                    'grateful_for': _text(rng, 1),
+                    'daily_goal': "Follow my rules",
+                    'trading_process': _text(rng, 3),
+                    'morning_screenshots': [],
+                },
+                'trade_day': {
+                    'market_observations': _text(rng, 2),
+                    'trades': trades,
+                },
+                'trading': {
+                    'pnl': round(sum(trade['pnl'] for trade in trades), 2),
+                    'process_grade': rng.choice(GRADES),
+                    'grade_reasoning': _text(rng, 2),
+                    'general_comments': _text(rng, 2),
+                    'screenshot_notes': "",
+                    'rule_mask': to_bits(day_rules),
+                    'rule_bits': to_bits(followed),
+                    'what_could_improve': _text(rng, 1),
+                    'tomorrow_focus': _text(rng, 1),
+                    'trading_screenshots': [],
+                },
+                'evening': {
+                    'personal_recap': _text(rng, 2),
+                    'family_highlights': _text(rng, 1),
+                    'personal_wins': _text(rng, 1),
+                    'tomorrow_intentions': _text(rng, 1),
+                },
+                'rules': day_rules,
+            }
+
+        if day.day == 1 or rng.random() < 0.01:
+            data['transactions'].append({
+                'date': date_key,
+                'type': 'deposit' if rng.random() < 0.7 else 'withdrawal',
+                'amount': float(rng.choice([250, 500, 1000])),
+                'description': "Synthetic transfer",
+                'timestamp': f"{date_key} 12:00:00",
+            })
+        day += timedelta(days=1)
+
+    reconcile_journal(data)
+    return data, trade_logs
+
+
+def generate_bars(data, seed=0, seconds=60, session_minutes=390):
+    """Bars of ``seconds`` each per symbol for every day with trades: ``{symbol: frame}``
+
+    Each session's bars run from 09:30 and follow the day's fill prices
+    (interpolated, plus noise) so trades have a plausible path to measure.
+    """
+    rng = np.random.default_rng(seed)
+    sessions = {}
+    for date_key, entry in iter_days(data):
+        open_time = pd.Timestamp(f"{date_key} 09:30")
+        for trade in entry['trade_day']['trades']:
+            for fill in trade.get('raw_fills') or []:
+                offset = (pd.Timestamp(' '.join(fill['DateTime'].split())) - open_time).total_seconds() / seconds
+                sessions.setdefault((trade['symbol'], open_time), []).append((offset, float(fill['FillPrice'])))
+
+    frames = {}
+    for (symbol, open_time), fills in sessions.items():
+        fills.sort()
+        offsets, prices = zip(*fills)
+        count = max(session_minutes * 60 // seconds, int(offsets[-1]) + 2)
+        close = np.interp(np.arange(count) + 1, offsets, prices) + rng.normal(0, 2, count)
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        frames.setdefault(symbol, []).append(pd.DataFrame({
+            'time': open_time + pd.to_timedelta(np.arange(count) * seconds, unit='s'),
+            'open': open_,
+            'high': np.maximum(open_, close) + np.abs(rng.normal(0, 2, count)),
+            'low': np.minimum(open_, close) - np.abs(rng.normal(0, 2, count)),
+            'close': close,
+            'volume': rng.integers(10, 2000, count).astype(float),
+        }))
+    return {symbol: pd.concat(parts, ignore_index=True).sort_values('time', kind='stable').reset_index(drop=True)
+            for symbol, parts in frames.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic journal and broker trade logs")
+    parser.add_argument('--years', type=float, default=1)
+    parser.add_argument('--trades-per-day', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', required=True, help="Directory for trading_journal_data.json and logs/")
+    args = parser.parse_args()
+
+    data, trade_logs = generate_journal(args.years, args.trades_per_day, args.seed)
+    os.makedirs(os.path.join(args.out, 'logs'), exist_ok=True)
+    with open(os.path.join(args.out, 'trading_journal_data.json'), 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    for date_key, log in trade_logs.items():
+        with open(os.path.join(args.out, 'logs', f"{date_key}.txt"), 'w', newline='') as f:
+            f.write(log)
+
+    days = sum(1 for key in data if key[:1].isdigit())
+    trades = sum(len(data[key]['trade_day']['trades']) for key in data if key[:1].isdigit())
+    print(f"Wrote {days} days, {trades} trades and {len(trade_logs)} trade logs to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
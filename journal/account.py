@@ -0,0 +1,130 @@
+"""Account balance settings, deposits/withdrawals and running balance."""
+
+from datetime import date, datetime, timedelta
+
+from journal.entries import get_date_key
+from journal.perf import traced
+from journal.reconcile import day_pnl
+
+
+@traced()
+def calculate_running_balance(data, target_date, starting_balance, start_date):
+    """Calculate running account balance up to target date including deposits/withdrawals"""
+    if not starting_balance or not start_date:
+        return starting_balance if starting_balance else 0
+
+    # Convert string dates to date objects if needed
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+    if isinstance(target_date, str):
+        target_date = datetime.strptime(target_date, "%Y-%m-%d").date()
+
+    running_balance = starting_balance
+    current_date = start_date
+
+    while current_date <= target_date:
+        date_key = get_date_key(current_date)
+
+        # Add trading P&L (derived from the day's trades when it has any)
+        if date_key in data:
+            running_balance += day_pnl(data[date_key])
+
+        # Add deposits/withdrawals for this date
+        transactions = get_transactions_for_date(data, current_date)
+        for transaction in transactions:
+            if transaction['type'] == 'deposit':
+                running_balance += transaction['amount']
+            elif transaction['type'] == 'withdrawal':
+                running_balance -= transaction['amount']
+
+        current_date += timedelta(days=1)
+
+    return running_balance
+
+def get_account_settings(data):
+    """Get account balance settings from data"""
+    return data.get('account_settings', {
+        'starting_balance': 0.0,
+        'start_date': None,
+        'last_updated': None
+    })
+
+def save_account_settings(data, starting_balance, start_date, commission_per_contract=None):
+    """Save account balance settings to data"""
+    if 'account_settings' not in data:
+        data['account_settings'] = {}
+
+    data['account_settings']['starting_balance'] = starting_balance
+    data['account_settings']['start_date'] = start_date.strftime("%Y-%m-%d") if isinstance(start_date, date) else start_date
+    if commission_per_contract is not None:
+        data['account_settings']['commission_per_contract'] = float(commission_per_contract)
+    data['account_settings']['last_updated'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    return data
+
+# Transaction Management Functions
+def get_all_transactions(data):
+    """Get all deposits and withdrawals"""
+    return data.get('transactions', [])
+
+def add_transaction(data, transaction_date, transaction_type, amount, description=""):
+    """Add a deposit or withdrawal transaction"""
+    if 'transactions' not in data:
+        data['transactions'] = []
+
+    transaction = {
+        'date': transaction_date.strftime("%Y-%m-%d") if isinstance(transaction_date, date) else transaction_date,
+        'type': transaction_type,  # 'deposit' or 'withdrawal'
+        'amount': float(amount),
+        'description': description,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+    data['transactions'].append(transaction)
+
+    # Sort transactions by date
+    data['transactions'].sort(key=lambda x: x['date'])
+
+    return data
+
+def delete_transaction(data, transaction_index):
+    """Delete a transaction by index"""
+    if 'transactions' in data and 0 <= transaction_index < len(data['transactions']):
+        data['transactions'].pop(transaction_index)
+    return data
+
+def get_transactions_for_date(data, target_date):
+    """Get all transactions for a specific date"""
+    if isinstance(target_date, date):
+        target_date = target_date.strftime("%Y-%m-%d")
+
+    transactions = data.get('transactions', [])
+    return [t for t in transactions if t['date'] == target_date]
+
+def calculate_total_deposits(data, up_to_date=None):
+    """Calculate total deposits up to a specific date"""
+    transactions = data.get('transactions', [])
+    total = 0
+
+    for transaction in transactions:
+        transaction_date = transaction['date']
+        if up_to_date and transaction_date > up_to_date.strftime("%Y-%m-%d"):
+            continue
+        if transaction['type'] == 'deposit':
+            total += transaction['amount']
+
+    return total
+
+def calculate_total_withdrawals(data, up_to_date=None):
+    """Calculate total withdrawals up to a specific date"""
+    transactions = data.get('transactions', [])
+    total = 0
+
+    for transaction in transactions:
+        transaction_date = transaction['date']
+        if up_to_date and transaction_date > up_to_date.strftime("%Y-%m-%d"):
+            continue
+        if transaction['type'] == 'withdrawal':
+            total += transaction['amount']
+
+    return total
@@ -0,0 +1,346 @@
+"""Vectorized performance analytics over the per-trade and per-day series.
+
+The journal is flattened once per revision into two DataFrames -- one row
+per trade, one row per calendar day -- and every metric is computed with
+pandas/numpy operations on those frames rather than by walking the nested
+dicts. :func:`period_analytics` is cached on ``(revision, start, end)`` so
+re-opening a date range is a dictionary lookup.
+
+Day-level P&L comes from :func:`journal.reconcile.day_pnl` (the figure the
+calendar, balance and Quick Stats use). Trade-level metrics use trades that carry a numeric
+``pnl`` (imported trades; manual entries only have an outcome). Rule
+adherence unpacks the per-day compliance bitsets (see :mod:`journal.rules`)
+into a days x rules matrix once per revision. MAE/MFE joins the trade frame
+with the local bar store (:mod:`journal.market_data`).
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from journal.account import get_account_settings
+from journal.market_data import BarStore, trade_excursions
+from journal.perf import traced
+from journal.reconcile import day_pnl, has_day_pnl
+from journal.rules import get_rule_registry
+from journal.schema import iter_days
+from journal.sessions import sortable_timestamp
+from journal.trade_log import get_point_value
+
+TRADING_DAYS_PER_YEAR = 252
+
+TRADE_COLUMNS = ['date', 'timestamp', 'trade_id', 'symbol', 'direction', 'quantity',
+                 'entry_price', 'exit_price', 'stop_price', 'pnl', 'outcome', 'entry_time', 'exit_time']
+
+
+def _fill_times(trade):
+    """First entry and last exit fill time of an imported trade ('' for manual trades)"""
+    fills = trade.get('raw_fills') or []
+    entries = [fill.get('DateTime', '') for fill in fills if fill.get('OpenClose') == 'Open']
+    exits = [fill.get('DateTime', '') for fill in fills if fill.get('OpenClose') == 'Close']
+    return (entries[0] if entries else ''), (exits[-1] if exits else '')
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+@traced()
+@st.cache_data(show_spinner=False, max_entries=4)
+def trade_frame(_data, revision):
+    """One row per trade across the journal, sorted by date and time"""
+    rows = []
+    for date_key, entry in iter_days(_data):
+        for trade in entry['trade_day']['trades']:
+            rows.append((
+                date_key,
+                trade['timestamp'],
+                trade['id'],
+                trade.get('symbol', ''),
+                trade.get('direction', ''),
+                _to_float(trade.get('quantity')),
+                _to_float(trade.get('entry_price')),
+                _to_float(trade.get('exit_price')),
+                _to_float(trade.get('stop_price')),
+                _to_float(trade.get('pnl')),
+                trade['outcome'],
+                *_fill_times(trade),
+            ))
+
+    trades = pd.DataFrame.from_records(rows, columns=TRADE_COLUMNS)
+    trades['date'] = pd.to_datetime(trades['date'])
+    for column in ('entry_time', 'exit_time'):
+        # Trade log times have a double space between date and time
+        trades[column] = pd.to_datetime(trades[column].str.split().str.join(' '), errors='coerce')
+    # Timestamps in order whatever the log's locale
+    trades = (trades.assign(sort_time=trades['timestamp'].map(sortable_timestamp))
+              .sort_values(['date', 'sort_time'], kind='stable').drop(columns='sort_time').reset_index(drop=True))
+
+    # Planned risk in dollars from the stop: |entry - stop| * qty * point value
+    point_values = trades['symbol'].map(get_point_value) if len(trades) else pd.Series(dtype=float)
+    risk = (trades['entry_price'] - trades['stop_price']).abs() * trades['quantity'] * point_values
+    trades['r_multiple'] = trades['pnl'] / risk.where(risk > 0)
+    return trades
+
+
+@traced()
+@st.cache_data(show_spinner=False, max_entries=4)
+def day_frame(_data, revision):
+    """One row per calendar day from the first to the last journal day
+
+    Columns: ``pnl`` (0 on days without a review), ``traded`` (a P&L was
+    recorded), ``deposits``, ``withdrawals`` and, when account tracking is
+    set up, ``balance`` (end-of-day balance).
+    """
+    pnl = {}
+    for date_key, entry in iter_days(_data):
+        if has_day_pnl(entry):
+            pnl[date_key] = _to_float(day_pnl(entry))
+
+    transactions = pd.DataFrame(_data.get('transactions', []), columns=['date', 'type', 'amount'])
+    transactions['date'] = pd.to_datetime(transactions['date'])
+    transactions['amount'] = transactions['amount'].astype(float)
+    flows = transactions.pivot_table(index='date', columns='type', values='amount', aggfunc='sum')
+
+    settings = get_account_settings(_data)
+    start_date = settings.get('start_date')
+
+    pnl_series = pd.Series(pnl, dtype=float)
+    pnl_series.index = pd.to_datetime(pnl_series.index)
+    bounds = [idx for idx in (pnl_series.index, flows.index) if len(idx)]
+    if start_date:
+        bounds.append(pd.DatetimeIndex([start_date]))
+    if not bounds:
+        return pd.DataFrame(columns=['pnl', 'traded', 'deposits', 'withdrawals'])
+
+    first = min(idx.min() for idx in bounds)
+    last = max(idx.max() for idx in bounds)
+    days = pd.DataFrame(index=pd.date_range(first, last, freq='D', name='date'))
+    days['pnl'] = pnl_series.reindex(days.index).fillna(0.0)
+    days['traded'] = days.index.isin(pnl_series.index)
+    days['deposits'] = flows.get('deposit', pd.Series(dtype=float)).reindex(days.index).fillna(0.0)
+    days['withdrawals'] = flows.get('withdrawal', pd.Series(dtype=float)).reindex(days.index).fillna(0.0)
+
+    if settings.get('starting_balance') and start_date:
+        # Same accounting as calculate_running_balance: nothing before start_date counts
+        counted = days.index >= pd.Timestamp(start_date)
+        change = (days['pnl'] + days['deposits'] - days['withdrawals']).where(counted, 0.0)
+        days['balance'] = settings['starting_balance'] + change.cumsum()
+    return days
+
+
+def drawdown_stats(equity):
+    """Max drawdown (amount and % of peak) and the longest time under water
+
+    ``equity`` is a date-indexed series. Duration is measured in calendar
+    days from the peak to the recovery (or to the last point if the
+    drawdown has not recovered).
+    """
+    if equity.empty:
+        return {'max_drawdown': 0.0, 'max_drawdown_pct': 0.0, 'max_drawdown_days': 0, 'drawdown': equity}
+
+    peak = equity.cummax()
+    drawdown = equity - peak
+    trough = drawdown.idxmin()
+    peak_value = peak.loc[trough]
+
+    # Each point at a high starts a new episode; an episode with underwater
+    # points lasts from its peak until the next episode's first point
+    underwater = drawdown < 0
+    episode = (~underwater).cumsum()
+    dates = equity.index.to_series()
+    peak_dates = dates.groupby(episode).first()
+    end_dates = peak_dates.shift(-1).fillna(dates.groupby(episode).last())
+    durations = (end_dates - peak_dates)[underwater.groupby(episode).any()]
+
+    return {
+        'max_drawdown': float(drawdown.min()),
+        'max_drawdown_pct': float(drawdown.loc[trough] / peak_value * 100) if peak_value > 0 else 0.0,
+        'max_drawdown_days': int(durations.max().days) if len(durations) else 0,
+        'drawdown': drawdown,
+    }
+
+
+def streaks(outcomes):
+    """Longest win/loss streaks and the current streak from a win/loss series
+
+    Break-even and pending trades are skipped rather than breaking a streak.
+    """
+    outcomes = outcomes[outcomes.isin(['win', 'loss'])].reset_index(drop=True)
+    if outcomes.empty:
+        return {'longest_win_streak': 0, 'longest_loss_streak': 0, 'current_streak': 0}
+
+    run_id = (outcomes != outcomes.shift()).cumsum()
+    run_lengths = outcomes.groupby(run_id).agg(['first', 'size'])
+    longest = run_lengths.groupby('first')['size'].max()
+    current = run_lengths.iloc[-1]
+    return {
+        'longest_win_streak': int(longest.get('win', 0)),
+        'longest_loss_streak': int(longest.get('loss', 0)),
+        # Positive for a winning streak, negative for a losing one
+        'current_streak': int(current['size'] if current['first'] == 'win' else -current['size']),
+    }
+
+
+def trade_metrics(trades):
+    """Expectancy, profit factor, average win/loss and R-multiples"""
+    closed = trades[trades['pnl'].notna()]
+    pnl = closed['pnl']
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+    gross_loss = -losses.sum()
+    r = trades['r_multiple'].dropna()
+
+    return {
+        'trades': int(len(trades)),
+        'trades_with_pnl': int(len(closed)),
+        'expectancy': float(pnl.mean()) if len(pnl) else 0.0,
+        'profit_factor': float(wins.sum() / gross_loss) if gross_loss > 0 else (np.inf if len(wins) else 0.0),
+        'avg_win': float(wins.mean()) if len(wins) else 0.0,
+        'avg_loss': float(losses.mean()) if len(losses) else 0.0,
+        'largest_win': float(wins.max()) if len(wins) else 0.0,
+        'largest_loss': float(losses.min()) if len(losses) else 0.0,
+        'avg_r': float(r.mean()) if len(r) else np.nan,
+        'trades_with_r': int(len(r)),
+    }
+
+
+def return_ratios(days):
+    """Annualized Sharpe and Sortino of daily returns on trading days
+
+    Returns are the day's trading P&L over the previous day's closing
+    balance, so deposits and withdrawals do not count as performance.
+    """
+    if 'balance' not in days or days.empty:
+        return {'sharpe': np.nan, 'sortino': np.nan}
+
+    prior_balance = (days['balance'] - days['pnl'] - days['deposits'] + days['withdrawals'])
+    returns = (days['pnl'] / prior_balance.where(prior_balance > 0))[days['traded']].dropna()
+    if len(returns) < 2:
+        return {'sharpe': np.nan, 'sortino': np.nan}
+
+    mean = returns.mean()
+    std = returns.std(ddof=1)
+    downside = np.sqrt((np.minimum(returns, 0.0) ** 2).mean())
+    scale = np.sqrt(TRADING_DAYS_PER_YEAR)
+    return {
+        'sharpe': float(mean / std * scale) if std > 0 else np.nan,
+        'sortino': float(mean / downside * scale) if downside > 0 else np.nan,
+    }
+
+
+@traced()
+@st.cache_data(show_spinner=False, max_entries=4)
+def rule_frame(_data, revision):
+    """Each reviewed day's rule bitsets unpacked into boolean matrices
+
+    Returns ``(days, in_force, followed)``: ``days`` is a date-indexed frame
+    with the day's ``pnl``; ``in_force`` and ``followed`` are arrays of shape
+    (days, registered rules) where column ``i`` is rule id ``i``.
+    """
+    rule_count = len(get_rule_registry(_data))
+    width = max(1, (rule_count + 7) // 8)
+
+    dates, pnl, masks, bits = [], [], [], []
+    for date_key, entry in sorted(iter_days(_data)):
+        trading = entry['trading']
+        if not trading.get('rule_mask'):
+            continue
+        dates.append(date_key)
+        pnl.append(_to_float(day_pnl(entry)))
+        masks.append(trading['rule_mask'].to_bytes(width, 'little'))
+        bits.append((trading.get('rule_bits', 0) & trading['rule_mask']).to_bytes(width, 'little'))
+
+    def unpack(rows):
+        packed = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), width)
+        return np.unpackbits(packed, axis=1, bitorder='little')[:, :rule_count].astype(bool)
+
+    days = pd.DataFrame({'pnl': pnl}, index=pd.DatetimeIndex(pd.to_datetime(dates), name='date'))
+    return days, unpack(masks), unpack(bits)
+
+
+@traced()
+@st.cache_data(show_spinner=False, max_entries=64)
+def rule_adherence(_data, revision, start, end):
+    """Per-rule adherence and P&L on days it was followed vs. broken
+
+    One row per rule that was in force on a reviewed day between ``start``
+    and ``end``. ``pnl_impact`` is the mean daily P&L when followed minus
+    the mean when broken (NaN until the rule has both kinds of day).
+    """
+    days, in_force, followed = rule_frame(_data, revision)
+    period = ((days.index >= pd.Timestamp(start)) & (days.index <= pd.Timestamp(end)))
+    in_force, followed = in_force[period], followed[period]
+    broken = in_force & ~followed
+    pnl = days['pnl'].to_numpy()[period, None]
+
+    days_in_force = in_force.sum(axis=0)
+    days_followed = followed.sum(axis=0)
+    days_broken = broken.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pnl_followed = (pnl * followed).sum(axis=0) / days_followed
+        pnl_broken = (pnl * broken).sum(axis=0) / days_broken
+        adherence = days_followed / days_in_force
+
+    registry = get_rule_registry(_data)
+    report = pd.DataFrame({
+        'rule': [rule['text'] for rule in registry],
+        'days': days_in_force,
+        'followed': days_followed,
+        'broken': days_broken,
+        'adherence': adherence,
+        'pnl_followed': pnl_followed,
+        'pnl_broken': pnl_broken,
+        'pnl_impact': pnl_followed - pnl_broken,
+        'pnl_on_broken_days': (pnl * broken).sum(axis=0),
+    }, index=pd.Index([rule['id'] for rule in registry], name='id'))
+    return report[report['days'] > 0].sort_values(['adherence', 'days'], ascending=[True, False])
+
+
+@traced()
+@st.cache_data(show_spinner=False, max_entries=64)
+def period_analytics(_data, revision, start, end):
+    """All performance metrics for trades and days between start and end
+
+    ``start``/``end`` are dates (inclusive). Cached per revision and range.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    trades = trade_frame(_data, revision)
+    days = day_frame(_data, revision)
+
+    trades = trades[(trades['date'] >= start) & (trades['date'] <= end)]
+    days = days.loc[(days.index >= start) & (days.index <= end)] if len(days) else days
+
+    # The balance curve when account tracking is set up, otherwise cumulative P&L
+    equity = days['balance'] if 'balance' in days else days['pnl'].cumsum()
+    drawdown = drawdown_stats(equity)
+
+    return {
+        'computed_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        **trade_metrics(trades),
+        **streaks(trades['outcome']),
+        **return_ratios(days),
+        'max_drawdown': drawdown['max_drawdown'],
+        'max_drawdown_pct': drawdown['max_drawdown_pct'],
+        'max_drawdown_days': drawdown['max_drawdown_days'],
+        'equity': equity,
+        'drawdown': drawdown['drawdown'],
+    }
+
+
+@traced()
+@st.cache_data(show_spinner=False, max_entries=4)
+def excursion_frame(_data, revision, bars_revision):
+    """Trade frame joined with MAE/MFE from the local bar store
+
+    Only trades with stored bars for their session; cached until either the
+    journal or the bar store changes.
+    """
+    trades = trade_frame(_data, revision)
+    excursions = trade_excursions(trades, BarStore())
+    return trades.join(excursions)[excursions['bars'] > 0]
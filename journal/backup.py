@@ -0,0 +1,244 @@
+"""Streaming journal backups and merge-on-import.
+
+A backup is gzip-compressed JSON lines: a header line, then one line per
+top-level journal key (settings, rule registry, tags and transactions
+first, then one line per day in date order)::
+
+    {"format": "trading-journal-backup", "version": 1, "exported": "..."}
+    {"key": "rule_registry", "value": [...]}
+    {"key": "2025-09-11", "value": {"morning": {...}, "trade_day": {...}, ...}}
+
+:func:`write_backup` serialises one key at a time into the compressed
+stream and :func:`read_backup` decodes one line at a time, so neither holds
+a second copy of the journal as text. Plain (uncompressed) JSON lines and
+the single JSON object written by older versions of the app are read too;
+the latter is parsed in one go.
+
+:func:`merge_backup` merges the records into the journal instead of
+replacing whole keys: days are merged section by section, trades by id (or
+by their broker fills, see :func:`journal.trade_log.fill_key`), rules by
+text, and tags and transactions as sets. Where both sides have a value the
+backup's wins, unless it is empty, so blank fields in an old backup do not
+wipe notes written since. Nothing is saved; the caller writes the journal
+once.
+"""
+
+import gzip
+import io
+import json
+from collections import Counter
+from datetime import datetime
+
+from journal.perf import traced
+from journal.reconcile import reconcile_days
+from journal.risk import evaluate_from
+from journal.rules import add_rule, find_rule, from_bits, get_rule_registry, migrate_day_rules, to_bits
+from journal.schema import Transaction, is_date_key, normalize_day
+from journal.trade_log import fill_key
+
+BACKUP_FORMAT = "trading-journal-backup"
+BACKUP_VERSION = 1
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+_MISSING = object()
+
+
+def _is_empty(value):
+    return value is None or value == "" or value == [] or value == {}
+
+
+def iter_backup(data):
+    """Backup lines (with newlines): the header, then settings, then days in date order"""
+    header = {'format': BACKUP_FORMAT, 'version': BACKUP_VERSION,
+              'exported': datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+    yield json.dumps(header) + "\n"
+
+    keys = sorted(data, key=lambda key: (is_date_key(key), key))
+    for key in keys:
+        yield json.dumps({'key': key, 'value': data[key]}, default=str) + "\n"
+
+
+@traced()
+def write_backup(data, fileobj, compress=True):
+    """Stream a backup of the journal into a binary file object"""
+    stream = gzip.GzipFile(fileobj=fileobj, mode='wb', mtime=0) if compress else fileobj
+    try:
+        for line in iter_backup(data):
+            stream.write(line.encode('utf-8'))
+    finally:
+        if compress:
+            stream.close()
+
+
+def backup_bytes(data):
+    """The compressed backup as bytes, e.g. for a download button"""
+    buffer = io.BytesIO()
+    write_backup(data, buffer)
+    return buffer.getvalue()
+
+
+def read_backup(fileobj):
+    """Yield ``(key, value)`` records from a backup in any supported format
+
+    Accepts gzip JSON lines, plain JSON lines or a legacy single-object
+    export, read from a binary file object.
+    """
+    start = fileobj.read(2)
+    fileobj.seek(0)
+    if start == GZIP_MAGIC:
+        fileobj = gzip.GzipFile(fileobj=fileobj, mode='rb')
+
+    lines = io.TextIOWrapper(fileobj, encoding='utf-8')
+    first = lines.readline()
+    try:
+        header = json.loads(first)
+    except json.JSONDecodeError:
+        header = None
+
+    if not (isinstance(header, dict) and header.get('format') == BACKUP_FORMAT):
+        # Export from an older version: one indented JSON object
+        legacy = json.loads(first + lines.read())
+        if not isinstance(legacy, dict):
+            raise ValueError("Not a trading journal export")
+        # Settings (the rule registry above all) before days, as iter_backup writes them
+        for key in sorted(legacy, key=lambda key: (is_date_key(key), key)):
+            yield key, legacy[key]
+        return
+
+    if header.get('version', 1) > BACKUP_VERSION:
+        raise ValueError(f"Backup version {header['version']} is newer than this app supports")
+    for line in lines:
+        if line.strip():
+            record = json.loads(line)
+            yield record['key'], record['value']
+
+
+def _merge_fields(existing, imported):
+    """Shallow field merge: the backup wins unless its value is empty; returns True if anything changed"""
+    changed = False
+    for field, value in imported.items():
+        if (not _is_empty(value) or field not in existing) and existing.get(field, _MISSING) != value:
+            existing[field] = value
+            changed = True
+    return changed
+
+
+def _remap_rules(ids, rule_map):
+    return [rule_map.get(rule_id, rule_id) for rule_id in ids]
+
+
+def _merge_rule_registry(data, rules, rule_map):
+    """Register the backup's rules by text; fills rule_map with backup id -> journal id"""
+    for rule in rules:
+        rule_id = find_rule(data, rule['text'])
+        if rule_id is None:
+            rule_id = add_rule(data, rule['text'], created=rule.get('created'))
+        rule_map[rule['id']] = rule_id
+
+
+def _merge_trades(stored_trades, imported_trades, counts):
+    """Merge a day's trades by id, falling back to broker fills for trades saved under another id
+
+    Returns True if any trade was added or changed.
+    """
+    changed = False
+    by_id = {trade.get('id'): trade for trade in stored_trades}
+    by_fill = {fill_key(fill): trade for trade in stored_trades for fill in trade.get('raw_fills') or []}
+
+    for trade in imported_trades:
+        stored = by_id.get(trade.get('id'))
+        if stored is None:
+            stored = next((by_fill[key] for key in map(fill_key, trade.get('raw_fills') or []) if key in by_fill), None)
+        if stored is None:
+            stored_trades.append(trade)
+            by_id[trade.get('id')] = trade
+            counts['trades_added'] += 1
+            changed = True
+        elif _merge_fields(stored, {field: value for field, value in trade.items() if field != 'id'}):
+            counts['trades_merged'] += 1
+            changed = True
+    return changed
+
+
+def _merge_day(data, date_key, imported, rule_map, counts):
+    """Merge one day of the backup into the journal"""
+    imported = normalize_day(imported)
+    if rule_map:
+        imported['rules'] = [rule_map.get(rule, rule) if isinstance(rule, int) else rule for rule in imported['rules']]
+        trading = imported['trading']
+        for field in ('rule_mask', 'rule_bits'):
+            if trading.get(field):
+                trading[field] = to_bits(_remap_rules(from_bits(trading[field]), rule_map))
+    # Days from backups written before the rule registry still carry rule texts
+    migrate_day_rules(data, date_key, imported)
+
+    entry = data.get(date_key)
+    if not isinstance(entry, dict):
+        data[date_key] = imported
+        counts['days_added'] += 1
+        counts['trades_added'] += len(imported['trade_day']['trades'])
+        return
+
+    changed = False
+    for section, value in imported.items():
+        current = entry.get(section)
+        if section == 'rules' and isinstance(current, list) and isinstance(value, list):
+            rules = list(dict.fromkeys(current + value))
+            changed |= rules != current
+            entry['rules'] = rules
+        elif section == 'trade_day' and isinstance(current, dict) and isinstance(value, dict):
+            changed |= _merge_trades(current.setdefault('trades', []), value.get('trades', []), counts)
+            changed |= _merge_fields(current, {field: item for field, item in value.items() if field not in ('trades', 'totals')})
+        elif isinstance(current, dict) and isinstance(value, dict):
+            changed |= _merge_fields(current, value)
+        else:
+            changed |= _merge_fields(entry, {section: value})
+    counts['days_merged' if changed else 'days_unchanged'] += 1
+
+
+@traced()
+def merge_backup(data, records):
+    """Merge backup records into the journal; returns a Counter of what changed
+
+    Counts ``days_added``, ``days_merged``, ``days_unchanged``,
+    ``trades_added``, ``trades_merged``, ``rules_added``, ``tags_added``,
+    ``transactions_added`` and ``settings_merged``. Days are brought to the
+    current schema (legacy rule texts included) and the derived P&L of every
+    touched day is rebuilt; nothing is saved.
+    """
+    counts = Counter()
+    rule_map = {}
+    touched = []
+    rules_before = len(get_rule_registry(data))
+
+    for key, value in records:
+        if is_date_key(key) and isinstance(value, dict):
+            _merge_day(data, key, value, rule_map, counts)
+            touched.append(key)
+        elif key == 'rule_registry':
+            _merge_rule_registry(data, value, rule_map)
+        elif key == 'tags':
+            tags = data.setdefault('tags', [])
+            new_tags = [tag for tag in value if tag not in tags]
+            tags.extend(new_tags)
+            counts['tags_added'] += len(new_tags)
+        elif key == 'transactions':
+            transactions = data.setdefault('transactions', [])
+            seen = {json.dumps(transaction, sort_keys=True) for transaction in transactions}
+            for transaction in (Transaction.from_raw(raw).to_dict() for raw in value):
+                if json.dumps(transaction, sort_keys=True) not in seen:
+                    transactions.append(transaction)
+                    counts['transactions_added'] += 1
+            transactions.sort(key=lambda transaction: transaction['date'])
+        elif isinstance(value, dict) and isinstance(data.get(key), dict):
+            counts['settings_merged'] += _merge_fields(data[key], value)
+        elif key not in data and key != 'schema_version':
+            data[key] = value
+            counts['settings_merged'] += 1
+
+    counts['rules_added'] = len(get_rule_registry(data)) - rules_before
+    reconcile_days(data, touched)
+    if touched:
+        evaluate_from(data, min(touched))
+    return counts
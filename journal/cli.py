@@ -0,0 +1,245 @@
+"""Command-line tools for working on the journal without the app.
+
+    python -m journal.cli import LOG_DIR [--pattern "*.txt"] [--workers 4] [--dry-run]
+    python -m journal.cli recompute [--dry-run]
+    python -m journal.cli backup FILE.jsonl.gz
+    python -m journal.cli restore FILE [--dry-run]
+    python -m journal.cli tables OUT_DIR [--format parquet] [--force]
+    python -m journal.cli bars FILE... --symbol F.US.MNQU25 [--dry-run]
+
+``import`` parses every broker log in a directory in a process pool, files
+each trade under its session date, skips or merges trades whose fills the
+journal already has and saves the journal once. ``recompute`` re-derives
+prices, size and P&L of every imported trade from its raw fills (e.g. after
+a point value fix). ``backup`` streams the journal to a gzip JSON lines
+file and ``restore`` merges a backup (or an old JSON export) into the
+journal (see :mod:`journal.backup`). ``tables`` writes Parquet/CSV
+tables for analysis, rewriting only months that changed since the last run
+(see :mod:`journal.tables`). ``bars`` imports bar or tick exports into the
+local market data store used for MAE/MFE (see :mod:`journal.market_data`).
+
+The journal commands read and write ``trading_journal_data.json`` in the
+working directory, or the GitHub repository given with ``--github
+OWNER/REPO`` (token from ``GITHUB_TOKEN``) in a single commit.
+"""
+
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import time
+from zoneinfo import ZoneInfo
+
+from journal.backup import merge_backup, read_backup, write_backup
+from journal.importer import merge_trades, read_trade_log, recompute_trade
+from journal.market_data import MARKET_DATA_DIR, BarStore, read_bar_file
+from journal.reconcile import reconcile_days, reconcile_journal
+from journal.risk import evaluate_from
+from journal.schema import is_date_key, iter_days, migrate_journal
+from journal.sessions import SessionCalendar
+from journal.storage import DATA_FILE, GitHubStorage, load_local_data, save_local_data
+from journal.tables import FORMATS, export_tables
+
+
+def load_journal(args):
+    """(data, storage) from GitHub when --github is given, else the local file
+
+    Applies the same load-time upgrades as the app (schema migration, derived P&L).
+    """
+    data, storage = _load(args)
+    migrate_journal(data)
+    reconcile_journal(data)
+    return data, storage
+
+
+def _load(args):
+    if not args.github:
+        return load_local_data(), None
+
+    owner, _, repo = args.github.partition('/')
+    token = os.environ.get('GITHUB_TOKEN')
+    if not token or not repo:
+        sys.exit("--github needs OWNER/REPO and a GITHUB_TOKEN environment variable")
+    storage = GitHubStorage()
+    if not storage.connect(token, owner, repo):
+        sys.exit(f"Could not connect to github.com/{args.github}")
+    return storage.load_all_journal_data(), storage
+
+
+def save_journal(data, storage):
+    """Write the whole journal once through the storage layer"""
+    if storage is None:
+        save_local_data(data)
+        return True
+    return storage.save_file_content(DATA_FILE, data, storage.data_sha)
+
+
+def time_zone(value):
+    """argparse type for an IANA time zone name, e.g. America/New_York"""
+    try:
+        ZoneInfo(value)
+    except (ValueError, KeyError):
+        raise argparse.ArgumentTypeError(f"unknown time zone: {value!r}") from None
+    return value
+
+
+def clock_time(value):
+    """argparse type for a time of day, normalized to the HH:MM the session calendar reads"""
+    try:
+        return time.fromisoformat(value).strftime('%H:%M')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a time of day (HH:MM): {value!r}") from None
+
+
+def import_logs(args):
+    paths = sorted(glob.glob(os.path.join(args.directory, args.pattern)))
+    if not paths:
+        sys.exit(f"No files matching {args.pattern} in {args.directory}")
+
+    trades = []
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for path, file_trades, error in pool.map(read_trade_log, paths, chunksize=max(1, len(paths) // 64)):
+            if error:
+                failed += 1
+                print(f"  {os.path.basename(path)}: {error}", file=sys.stderr)
+            trades.extend(file_trades)
+
+    data, storage = load_journal(args)
+    overrides = {'log_timezone': args.log_timezone, 'roll_time': args.roll_time}
+    calendar = replace(SessionCalendar.from_settings(data), **{key: value for key, value in overrides.items() if value})
+    added, updated, skipped = merge_trades(data, trades, calendar=calendar)
+
+    undated = skipped.pop("", 0)
+    for date_key in sorted(set(added) | set(updated) | set(skipped)):
+        print(f"  {date_key}: {added.get(date_key, 0)} added, {updated.get(date_key, 0)} merged, "
+              f"{skipped.get(date_key, 0)} already in journal")
+    changed = sum(added.values()) + sum(updated.values())
+    print(f"{len(paths)} files ({failed} failed), {len(trades)} trades: {sum(added.values())} added to "
+          f"{len(added)} days, {sum(updated.values())} merged, {sum(skipped.values())} duplicates skipped")
+    if undated:
+        print(f"{undated} trades not imported: their timestamps are in a format this journal cannot read",
+              file=sys.stderr)
+
+    if args.dry_run or not changed:
+        return 0
+    if not save_journal(data, storage):
+        print("Saving the journal failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+def recompute(args):
+    data, storage = load_journal(args)
+    changed, days = 0, set()
+    for date_key, entry in iter_days(data):
+        for trade in entry['trade_day']['trades']:
+            if recompute_trade(trade):
+                changed += 1
+                days.add(date_key)
+    reconcile_days(data, days)
+    if days:
+        evaluate_from(data, min(days))
+    print(f"{changed} trades updated on {len(days)} days")
+
+    if args.dry_run or not changed:
+        return 0
+    if not save_journal(data, storage):
+        print("Saving the journal failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+def backup(args):
+    data, _ = load_journal(args)
+    with open(args.file, 'wb') as f:
+        write_backup(data, f, compress=args.file.endswith('.gz'))
+    print(f"{sum(1 for key in data if is_date_key(key))} days written to {args.file}")
+    return 0
+
+
+def restore(args):
+    data, storage = load_journal(args)
+    with open(args.file, 'rb') as f:
+        counts = merge_backup(data, read_backup(f))
+    print(", ".join(f"{value} {key.replace('_', ' ')}" for key, value in sorted(counts.items())) or "Nothing to merge")
+
+    if args.dry_run or not any(value for key, value in counts.items() if key != 'days_unchanged'):
+        return 0
+    if not save_journal(data, storage):
+        print("Saving the journal failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+def tables(args):
+    data, _ = load_journal(args)
+    written, unchanged, removed = export_tables(data, args.out_dir, args.format or FORMATS, force=args.force)
+    print(f"{len(written)} months written, {len(unchanged)} unchanged, {len(removed)} removed "
+          f"({', '.join(args.format or FORMATS)} in {args.out_dir})")
+    return 0
+
+
+def bars(args):
+    store = BarStore(args.root)
+    total = 0
+    for path in args.files:
+        frame = read_bar_file(path)
+        rows = len(frame) if args.dry_run else store.ingest(args.symbol, frame)
+        print(f"{path}: {rows} bars" + (f" ({frame['time'].iloc[0]} to {frame['time'].iloc[-1]})" if rows else ""))
+        total += rows
+    print(f"{total} bars {'read' if args.dry_run else 'stored'} for {args.symbol} in {args.root}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m journal.cli", description="Trading journal tools")
+    parser.add_argument('--github', metavar="OWNER/REPO", help="Use the journal in a GitHub repo (needs GITHUB_TOKEN)")
+    parser.add_argument('--dry-run', action='store_true', help="Report what would change without saving")
+    # The same options after the command; SUPPRESS keeps a command from resetting one given before it
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--github', metavar="OWNER/REPO", default=argparse.SUPPRESS,
+                        help="Use the journal in a GitHub repo (needs GITHUB_TOKEN)")
+    common.add_argument('--dry-run', action='store_true', default=argparse.SUPPRESS,
+                        help="Report what would change without saving")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', parents=[common], help="Import every broker trade log in a directory")
+    import_parser.add_argument('directory')
+    import_parser.add_argument('--pattern', default="*.txt", help="Glob for log files (default *.txt)")
+    import_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    import_parser.add_argument('--log-timezone', type=time_zone, help="Time zone of the log's timestamps (default: journal setting)")
+    import_parser.add_argument('--roll-time', type=clock_time, help="Session roll time on the exchange clock, HH:MM (default 17:00)")
+    import_parser.set_defaults(run=import_logs)
+
+    recompute_parser = commands.add_parser('recompute', parents=[common], help="Re-derive imported trades from their raw fills")
+    recompute_parser.set_defaults(run=recompute)
+
+    backup_parser = commands.add_parser('backup', parents=[common], help="Write a streaming backup (gzip JSON lines for *.gz)")
+    backup_parser.add_argument('file')
+    backup_parser.set_defaults(run=backup)
+
+    restore_parser = commands.add_parser('restore', parents=[common], help="Merge a backup or old JSON export into the journal")
+    restore_parser.add_argument('file')
+    restore_parser.set_defaults(run=restore)
+
+    tables_parser = commands.add_parser('tables', parents=[common], help="Export days, trades, tags, fills and transactions by month")
+    tables_parser.add_argument('out_dir')
+    tables_parser.add_argument('--format', action='append', choices=FORMATS, help="parquet and/or csv (default both)")
+    tables_parser.add_argument('--force', action='store_true', help="Rewrite every month")
+    tables_parser.set_defaults(run=tables)
+
+    bars_parser = commands.add_parser('bars', parents=[common], help="Import bar or tick exports into the local market data store")
+    bars_parser.add_argument('files', nargs='+')
+    bars_parser.add_argument('--symbol', required=True, help="Symbol as in the trade log, e.g. F.US.MNQU25")
+    bars_parser.add_argument('--root', default=MARKET_DATA_DIR, help=f"Store directory (default {MARKET_DATA_DIR})")
+    bars_parser.set_defaults(run=bars)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
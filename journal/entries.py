@@ -0,0 +1,102 @@
+"""Day entries, trades and the global tag list."""
+
+import uuid
+from datetime import date, datetime
+
+from journal.perf import traced
+from journal.schema import Day, iter_days
+from journal.sessions import sortable_timestamp
+
+
+def get_date_key(date_obj=None):
+    """Get date key in YYYY-MM-DD format"""
+    if date_obj is None:
+        date_obj = date.today()
+    return date_obj.strftime("%Y-%m-%d")
+
+def create_day_entry():
+    """Empty journal day with every section present"""
+    return Day().to_dict()
+
+def get_all_tags(data):
+    """Get all unique tags from the system"""
+    return data.get('tags', [])
+
+def add_tag_to_system(data, new_tag):
+    """Add a new tag to the global tag system"""
+    if 'tags' not in data:
+        data['tags'] = []
+
+    # Normalize tag (lowercase, strip whitespace)
+    normalized_tag = new_tag.strip().lower()
+
+    if normalized_tag and normalized_tag not in [tag.lower() for tag in data['tags']]:
+        data['tags'].append(new_tag.strip())
+        data['tags'].sort()  # Keep tags sorted
+
+    return data
+
+def create_new_trade(trade_description, tags, outcome, screenshot_data=None):
+    """Create a new trade entry"""
+    return {
+        'id': str(uuid.uuid4()),
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'description': trade_description,
+        'tags': tags,
+        'outcome': outcome,  # 'win', 'loss', 'pending'
+        'screenshot': screenshot_data  # {'url': '', 'caption': ''} or None
+    }
+
+@traced()
+def get_trade_statistics(data):
+    """Get statistics across all trades"""
+    # Collect all trades from all dates
+    dated_trades = [(date_key, trade) for date_key, entry in iter_days(data) for trade in entry['trade_day']['trades']]
+    all_trades = [trade for _, trade in dated_trades]
+
+    if not all_trades:
+        return {}
+
+    # Calculate statistics
+    total_trades = len(all_trades)
+    win_trades = [t for t in all_trades if t['outcome'] == 'win']
+    loss_trades = [t for t in all_trades if t['outcome'] == 'loss']
+    break_even_trades = [t for t in all_trades if t['outcome'] == 'break-even']
+    pending_trades = [t for t in all_trades if t['outcome'] == 'pending']
+
+    # Win rate calculation (exclude break-evens and pending from denominator)
+    completed_trades = len(win_trades) + len(loss_trades)
+    win_rate = (len(win_trades) / completed_trades * 100) if completed_trades > 0 else 0
+
+    # Tag statistics
+    tag_counts = {}
+    tag_win_rates = {}
+
+    for trade in all_trades:
+        for tag in trade['tags']:
+            if tag not in tag_counts:
+                tag_counts[tag] = {'total': 0, 'wins': 0, 'losses': 0}
+
+            tag_counts[tag]['total'] += 1
+            if trade['outcome'] == 'win':
+                tag_counts[tag]['wins'] += 1
+            elif trade['outcome'] == 'loss':
+                tag_counts[tag]['losses'] += 1
+
+    # Calculate win rates for each tag
+    for tag, counts in tag_counts.items():
+        completed = counts['wins'] + counts['losses']
+        tag_win_rates[tag] = (counts['wins'] / completed * 100) if completed > 0 else 0
+
+    return {
+        'total_trades': total_trades,
+        'win_trades': len(win_trades),
+        'loss_trades': len(loss_trades),
+        'break_even_trades': len(break_even_trades),
+        'pending_trades': len(pending_trades),
+        'win_rate': win_rate,
+        'tag_counts': tag_counts,
+        'tag_win_rates': tag_win_rates,
+        'recent_trades': [{**trade, 'date': date_key}
+                          for date_key, trade in sorted(dated_trades, key=lambda x: (x[0], sortable_timestamp(x[1]['timestamp'])), reverse=True)[:10]]
+    }
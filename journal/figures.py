@@ -0,0 +1,297 @@
+"""Plotly figures shared by the analysis pages and the periodic reports.
+
+Each function takes already computed data and returns a
+``plotly.graph_objects.Figure`` in the app's dark theme; the pages show
+them with ``st.plotly_chart`` and :mod:`journal.reports` renders the same
+figures into HTML or static images.
+"""
+
+import plotly.graph_objects as go
+
+
+def _pnl_colors(values):
+    return ['green' if value > 0 else 'red' if value < 0 else 'gray' for value in values]
+
+
+def daily_pnl_figure(dates, pnls):
+    """Bar chart of daily P&L"""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=dates,
+        y=pnls,
+        marker_color=_pnl_colors(pnls),
+        name="Daily P&L"
+    ))
+    fig.update_layout(
+        title="Daily P&L Over Time",
+        xaxis_title="Date",
+        yaxis_title="P&L ($)",
+        template="plotly_dark"
+    )
+    return fig
+
+
+def equity_drawdown_figure(equity, drawdown):
+    """Equity line with the drawdown from its running peak on a second axis"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=equity.index,
+        y=equity.values,
+        mode='lines',
+        name='Equity',
+        line=dict(color='#64ffda', width=2)
+    ))
+    fig.add_trace(go.Scatter(
+        x=drawdown.index,
+        y=drawdown.values,
+        mode='lines',
+        name='Drawdown',
+        fill='tozeroy',
+        line=dict(color='red', width=1),
+        yaxis='y2'
+    ))
+    fig.update_layout(
+        title="Equity and Drawdown",
+        xaxis_title="Date",
+        yaxis=dict(title="Equity ($)"),
+        yaxis2=dict(title="Drawdown ($)", overlaying='y', side='right'),
+        template="plotly_dark"
+    )
+    return fig
+
+
+def balance_figure(balance_data, starting_balance):
+    """Account balance with deposit and withdrawal markers
+
+    ``balance_data`` is a list of dicts with ``date``, ``balance``,
+    ``daily_deposits`` and ``daily_withdrawals``.
+    """
+    fig = go.Figure()
+
+    # Balance line
+    fig.add_trace(go.Scatter(
+        x=[d['date'] for d in balance_data],
+        y=[d['balance'] for d in balance_data],
+        mode='lines+markers',
+        name='Account Balance',
+        line=dict(color='#64ffda', width=3),
+        marker=dict(size=4),
+        hovertemplate='<b>%{x}</b><br>Balance: $%{y:,.2f}<extra></extra>'
+    ))
+
+    # Add deposit markers
+    deposit_dates = [d['date'] for d in balance_data if d['daily_deposits'] > 0]
+    deposit_balances = [d['balance'] for d in balance_data if d['daily_deposits'] > 0]
+    deposit_amounts = [d['daily_deposits'] for d in balance_data if d['daily_deposits'] > 0]
+
+    if deposit_dates:
+        fig.add_trace(go.Scatter(
+            x=deposit_dates,
+            y=deposit_balances,
+            mode='markers',
+            name='💰 Deposits',
+            marker=dict(color='green', size=8, symbol='triangle-up'),
+            hovertemplate='<b>%{x}</b><br>Deposit: $%{text}<br>Balance: $%{y:,.2f}<extra></extra>',
+            text=[f"{amt:,.2f}" for amt in deposit_amounts]
+        ))
+
+    # Add withdrawal markers
+    withdrawal_dates = [d['date'] for d in balance_data if d['daily_withdrawals'] > 0]
+    withdrawal_balances = [d['balance'] for d in balance_data if d['daily_withdrawals'] > 0]
+    withdrawal_amounts = [d['daily_withdrawals'] for d in balance_data if d['daily_withdrawals'] > 0]
+
+    if withdrawal_dates:
+        fig.add_trace(go.Scatter(
+            x=withdrawal_dates,
+            y=withdrawal_balances,
+            mode='markers',
+            name='💸 Withdrawals',
+            marker=dict(color='red', size=8, symbol='triangle-down'),
+            hovertemplate='<b>%{x}</b><br>Withdrawal: $%{text}<br>Balance: $%{y:,.2f}<extra></extra>',
+            text=[f"{amt:,.2f}" for amt in withdrawal_amounts]
+        ))
+
+    # Starting balance reference line
+    fig.add_hline(
+        y=starting_balance,
+        line_dash="dash",
+        line_color="gray",
+        annotation_text=f"Starting Balance: ${starting_balance:,.2f}"
+    )
+
+    fig.update_layout(
+        title="Account Balance Over Time (with Transactions)",
+        xaxis_title="Date",
+        yaxis_title="Balance ($)",
+        template="plotly_dark",
+        height=500
+    )
+    return fig
+
+
+def factor_pnl_figure(groups, factor_label):
+    """Mean daily P&L per level of a psychology factor with bootstrap error bars
+
+    ``groups`` comes from :func:`journal.psychology.grouped_stats`.
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=[str(level) for level in groups.index],
+        y=groups['mean_pnl'],
+        error_y=dict(
+            type='data',
+            symmetric=False,
+            array=(groups['ci_high'] - groups['mean_pnl']).fillna(0),
+            arrayminus=(groups['mean_pnl'] - groups['ci_low']).fillna(0),
+        ),
+        marker_color=['green' if pnl >= 0 else 'red' for pnl in groups['mean_pnl']],
+        text=[f"{days} days" for days in groups['days']],
+        name='Mean P&L'
+    ))
+    fig.update_layout(
+        title=f"Mean Daily P&L by {factor_label} (95% bootstrap CI)",
+        xaxis_title=factor_label,
+        yaxis_title="P&L ($)",
+        template="plotly_dark"
+    )
+    return fig
+
+
+def calendar_heatmap_figure(pnl):
+    """Weeks x weekdays heatmap of daily P&L
+
+    ``pnl`` is a date-indexed series; days without a P&L are left blank.
+    """
+    weeks = pnl.index.to_period('W-SUN').start_time
+    grid = pnl.groupby([weeks, pnl.index.dayofweek]).sum().unstack().reindex(columns=range(7))
+    limit = max(abs(pnl.min()), abs(pnl.max()), 1.0)
+
+    fig = go.Figure(go.Heatmap(
+        z=grid.values,
+        x=["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+        y=[f"Week of {week:%b %d}" for week in grid.index],
+        colorscale=[[0, 'red'], [0.5, '#222222'], [1, 'green']],
+        zmin=-limit,
+        zmax=limit,
+        text=[[f"${value:,.0f}" if value == value else "" for value in row] for row in grid.values],
+        texttemplate="%{text}",
+        hovertemplate='%{y} %{x}: $%{z:,.2f}<extra></extra>',
+        xgap=3,
+        ygap=3
+    ))
+    fig.update_layout(
+        title="P&L Calendar",
+        yaxis=dict(autorange='reversed'),
+        template="plotly_dark",
+        height=120 + 60 * len(grid)
+    )
+    return fig
+
+
+def tag_performance_figure(tags):
+    """Total P&L per tag; ``tags`` is indexed by tag with ``pnl`` and ``trades`` columns"""
+    tags = tags.sort_values('pnl')
+    fig = go.Figure(go.Bar(
+        x=tags['pnl'],
+        y=tags.index,
+        orientation='h',
+        marker_color=_pnl_colors(tags['pnl']),
+        text=[f"{count} trades" for count in tags['trades']],
+        name="P&L by Tag"
+    ))
+    fig.update_layout(
+        title="P&L by Tag",
+        xaxis_title="P&L ($)",
+        template="plotly_dark",
+        height=200 + 30 * len(tags)
+    )
+    return fig
+
+
+def rule_adherence_figure(report):
+    """Adherence per rule from :func:`journal.analytics.rule_adherence`"""
+    fig = go.Figure(go.Bar(
+        x=report['adherence'] * 100,
+        y=report['rule'],
+        orientation='h',
+        marker_color=['green' if value >= 0.8 else 'red' for value in report['adherence']],
+        text=[f"{followed}/{days} days" for followed, days in zip(report['followed'], report['days'])],
+        name="Adherence"
+    ))
+    fig.update_layout(
+        title="Rule Adherence",
+        xaxis=dict(title="Days followed (%)", range=[0, 100]),
+        yaxis=dict(autorange='reversed'),
+        template="plotly_dark",
+        height=200 + 30 * len(report)
+    )
+    return fig
+
+
+def excursion_figure(trades):
+    """Each trade's P&L against how far it went against (MAE) and for (MFE) it, in dollars"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=-trades['mae_usd'],
+        y=trades['pnl'],
+        mode='markers',
+        name='MAE',
+        marker=dict(color='red', size=7, opacity=0.7),
+        text=trades['symbol']
+    ))
+    fig.add_trace(go.Scatter(
+        x=trades['mfe_usd'],
+        y=trades['pnl'],
+        mode='markers',
+        name='MFE',
+        marker=dict(color='green', size=7, opacity=0.7),
+        text=trades['symbol']
+    ))
+    fig.update_layout(
+        title="P&L vs Excursion",
+        xaxis_title="Excursion while open ($, adverse < 0 < favourable)",
+        yaxis_title="Realized P&L ($)",
+        template="plotly_dark"
+    )
+    return fig
+
+
+def trade_replay_figure(times, prices, fills, entry_time, exit_time, stop_price=None, title="Trade Replay"):
+    """Price line around a trade with its fills as markers (WebGL traces)
+
+    ``fills`` has ``time``, ``price``, ``side``, ``quantity`` and
+    ``open_close`` columns (see :func:`journal.replay.trade_fills`).
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=times,
+        y=prices,
+        mode='lines',
+        name='Price',
+        line=dict(color='#64ffda', width=1)
+    ))
+    for side, symbol, color in (('Buy', 'triangle-up', 'green'), ('Sell', 'triangle-down', 'red')):
+        side_fills = fills[fills['side'] == side]
+        if side_fills.empty:
+            continue
+        fig.add_trace(go.Scattergl(
+            x=side_fills['time'],
+            y=side_fills['price'],
+            mode='markers',
+            name=side,
+            marker=dict(symbol=symbol, color=color, size=12, line=dict(color='white', width=1)),
+            text=[f"{side} {quantity:g} @ {price:.2f} ({open_close})" for quantity, price, open_close
+                  in zip(side_fills['quantity'], side_fills['price'], side_fills['open_close'])],
+            hoverinfo='text+x'
+        ))
+    fig.add_vrect(x0=entry_time, x1=exit_time, fillcolor='white', opacity=0.08, line_width=0)
+    if stop_price:
+        fig.add_hline(y=stop_price, line=dict(color='red', dash='dash', width=1), annotation_text="Stop")
+    fig.update_layout(
+        title=title,
+        xaxis_title="Time",
+        yaxis_title="Price",
+        template="plotly_dark",
+        hovermode='closest'
+    )
+    return fig
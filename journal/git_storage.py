@@ -0,0 +1,360 @@
+"""A local git working copy as the journal's storage.
+
+:class:`LocalGitBackend` writes the journal file and screenshots into a git
+working copy like :class:`journal.storage.LocalDirectoryBackend` and makes
+each save a commit on the current branch. The commit is made in-process:
+the blob, the trees on the changed paths and the commit object are written
+as loose objects and the branch ref is moved, without starting ``git``. The
+tree of ``HEAD`` is kept as a path -> object map (and saved in
+``.git/journal-tree.json``) so a commit only hashes the files it changes and
+their parent directories. A save is the JSON write plus a few milliseconds.
+
+Sharing the history is left to the ``git`` command line in the background:
+every :data:`PUSH_INTERVAL` a thread pushes the branch if it is ahead of
+the remote's, in one push however many saves were made, and keeps retrying
+while offline. Every :data:`MAINTENANCE_EVERY` commits it runs ``git gc``,
+which packs the loose objects with deltas between journal versions. Only
+``ls-tree`` (when ``HEAD`` was moved by something else, e.g. a pull) and
+those background jobs run ``git``; a working copy without a remote or
+without ``git`` installed still commits.
+
+The index is not updated by these commits; the background job resets the
+entries of the paths it committed to ``HEAD`` so ``git status`` in the
+working copy stays clean. Other staged changes are left alone. By default
+the working copy is a directory of its own
+(:data:`journal.storage.GIT_DATA_DIR`), not the app's checkout.
+"""
+
+import configparser
+import hashlib
+import json
+import os
+import posixpath
+import subprocess
+import threading
+import time
+import zlib
+
+from journal.perf import traced
+from journal.storage import DATA_FILE, LocalDirectoryBackend
+
+# Seconds between background pushes of new commits
+PUSH_INTERVAL = 60
+
+# Seconds a push or gc may take before it is abandoned until the next round
+GIT_TIMEOUT = 120
+
+# Commits between background ``git gc`` runs
+MAINTENANCE_EVERY = 50
+
+# Path -> object map of HEAD's tree, in the git directory
+TREE_STATE_FILE = "journal-tree.json"
+
+DEFAULT_AUTHOR = ("Trading Journal", "journal@localhost")
+
+TREE_MODE = "40000"
+FILE_MODE = "100644"
+
+
+def _depth(directory):
+    return 0 if directory == "" else directory.count('/') + 1
+
+
+class LocalGitBackend(LocalDirectoryBackend):
+    """Journal files in a git working copy, committed on every save"""
+
+    name = "git"
+
+    def __init__(self, root=".", remote="origin"):
+        super().__init__(root)
+        self.git_dir = os.path.join(root, ".git")
+        self.remote = remote
+        self.lock = threading.Lock()
+        # HEAD's tree: {path: (mode, sha)} for files, {directory: sha} for trees ("" = root)
+        self._head = None
+        self._files = None
+        self._trees = {}
+        self.unpushed = None
+        # Paths committed since the index was last brought in line with HEAD
+        self.committed_paths = set()
+        self.commits_since_gc = 0
+        self.last_push = None
+        self.push_error = None
+        self._stop = threading.Event()
+        self._thread = None
+        if not os.path.isdir(self.git_dir):
+            self._init()
+        self.author = self._author()
+
+    def _init(self):
+        for directory in ("objects/info", "objects/pack", "refs/heads", "refs/tags"):
+            os.makedirs(os.path.join(self.git_dir, directory), exist_ok=True)
+        with open(os.path.join(self.git_dir, "HEAD"), 'w') as f:
+            f.write("ref: refs/heads/main\n")
+        with open(os.path.join(self.git_dir, "config"), 'w') as f:
+            f.write("[core]\n\trepositoryformatversion = 0\n\tfilemode = true\n\tbare = false\n")
+
+    def _config(self):
+        config = configparser.ConfigParser(strict=False, interpolation=None)
+        try:
+            config.read(os.path.join(self.git_dir, "config"))
+        except configparser.Error:
+            pass
+        return config
+
+    def _author(self):
+        config = self._config()
+        name = os.environ.get("GIT_AUTHOR_NAME") or config.get("user", "name", fallback=None)
+        email = os.environ.get("GIT_AUTHOR_EMAIL") or config.get("user", "email", fallback=None)
+        return name or DEFAULT_AUTHOR[0], email or DEFAULT_AUTHOR[1]
+
+    @property
+    def has_remote(self):
+        return self._config().has_section(f'remote "{self.remote}"')
+
+    # Refs
+
+    def _branch(self):
+        """The ref HEAD points at, e.g. ``refs/heads/main``"""
+        with open(os.path.join(self.git_dir, "HEAD")) as f:
+            head = f.read().strip()
+        if not head.startswith("ref: "):
+            raise RuntimeError(f"{self.root} has a detached HEAD; check out a branch to save the journal there")
+        return head[len("ref: "):]
+
+    def _read_ref(self, ref):
+        try:
+            with open(os.path.join(self.git_dir, ref)) as f:
+                return f.read().strip() or None
+        except OSError:
+            pass
+        try:
+            with open(os.path.join(self.git_dir, "packed-refs")) as f:
+                for line in f:
+                    sha, _, name = line.strip().partition(" ")
+                    if name == ref:
+                        return sha
+        except OSError:
+            pass
+        return None
+
+    def _write_ref(self, ref, sha):
+        path = os.path.join(self.git_dir, ref)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".lock", 'w') as f:
+            f.write(sha + "\n")
+        os.replace(path + ".lock", path)
+
+    # Objects
+
+    def _write_object(self, kind, body):
+        raw = f"{kind} {len(body)}\0".encode() + body
+        sha = hashlib.sha1(raw).hexdigest()
+        path = os.path.join(self.git_dir, "objects", sha[:2], sha[2:])
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(zlib.compress(raw, 1))
+            os.replace(tmp, path)
+        return sha
+
+    def _load_tree(self, head):
+        """Bring the path -> object map to ``head``"""
+        if self._files is not None and self._head == head:
+            return
+        if head is None:
+            self._files, self._trees = {}, {}
+        else:
+            try:
+                with open(os.path.join(self.git_dir, TREE_STATE_FILE)) as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+            if state.get('head') == head:
+                self._files = {path: tuple(value) for path, value in state['files'].items()}
+                self._trees = state['trees']
+            else:
+                # HEAD moved outside the app (a pull, a manual commit): list its tree once
+                self._files, self._trees = self._ls_tree(head)
+        self._head = head
+
+    def _ls_tree(self, head):
+        output = subprocess.run(["git", "-C", self.root, "ls-tree", "-r", "-t", "-z", "--full-tree", head],
+                                capture_output=True, check=True, timeout=GIT_TIMEOUT).stdout.decode()
+        files, trees = {}, {}
+        for line in filter(None, output.split("\0")):
+            meta, path = line.split("\t", 1)
+            mode, kind, sha = meta.split()
+            if kind == "tree":
+                trees[path] = sha
+            else:
+                # Blobs, and submodules (commit entries) carried through as they are
+                files[path] = (mode, sha)
+        return files, trees
+
+    def _save_tree_state(self):
+        tmp = os.path.join(self.git_dir, TREE_STATE_FILE + ".tmp")
+        with open(tmp, 'w') as f:
+            json.dump({'head': self._head, 'files': self._files, 'trees': self._trees}, f)
+        os.replace(tmp, os.path.join(self.git_dir, TREE_STATE_FILE))
+
+    def _write_trees(self, files, changed):
+        """Tree objects for ``files``, rewriting only the directories above ``changed`` paths"""
+        dirty = set()
+        for path in changed:
+            directory = posixpath.dirname(path)
+            while directory not in dirty:
+                dirty.add(directory)
+                if not directory:
+                    break
+                directory = posixpath.dirname(directory)
+
+        entries, directories = {}, {""}
+        for path, (mode, sha) in files.items():
+            parent, name = posixpath.split(path)
+            entries.setdefault(parent, []).append((name, mode, sha))
+            while parent not in directories:
+                directories.add(parent)
+                parent = posixpath.dirname(parent)
+
+        trees = {}
+        # Deepest first, so a directory's subtrees are known when it is written
+        for directory in sorted(directories, key=_depth, reverse=True):
+            if directory in dirty or directory not in self._trees:
+                # Git orders entries by name, comparing a directory as "name/"
+                items = sorted(entries.get(directory, []), key=lambda e: e[0] + ('/' if e[1] == TREE_MODE else ''))
+                body = b"".join(f"{mode} {name}".encode() + b"\0" + bytes.fromhex(sha) for name, mode, sha in items)
+                trees[directory] = self._write_object("tree", body)
+            else:
+                trees[directory] = self._trees[directory]
+            if directory:
+                parent, name = posixpath.split(directory)
+                entries.setdefault(parent, []).append((name, TREE_MODE, trees[directory]))
+        return trees
+
+    @traced("git.commit")
+    def commit(self, contents, message):
+        """Commit ``{path: bytes}`` on the current branch; returns the new HEAD (unchanged if nothing changed)"""
+        with self.lock:
+            branch = self._branch()
+            head = self._read_ref(branch)
+            self._load_tree(head)
+
+            files, changed = dict(self._files), []
+            for path, raw in contents.items():
+                sha = self._write_object("blob", raw)
+                if files.get(path, (None, None))[1] != sha:
+                    files[path] = (FILE_MODE, sha)
+                    changed.append(path)
+            if not changed and head is not None:
+                return head
+
+            trees = self._write_trees(files, changed)
+            stamp = f"{int(time.time())} {time.strftime('%z')}"
+            name, email = self.author
+            lines = [f"tree {trees['']}"] + ([f"parent {head}"] if head else []) + [
+                f"author {name} <{email}> {stamp}",
+                f"committer {name} <{email}> {stamp}",
+            ]
+            sha = self._write_object("commit", ("\n".join(lines) + "\n\n" + message + "\n").encode())
+            self._write_ref(branch, sha)
+
+            self._head, self._files, self._trees = sha, files, trees
+            self._save_tree_state()
+            self.committed_paths.update(changed)
+            if self.unpushed is not None:
+                self.unpushed += 1
+            self.commits_since_gc += 1
+            return sha
+
+    def save_raw(self, raw, message=None):
+        self._write(DATA_FILE, raw)
+        self.commit({DATA_FILE: raw}, message or "Update journal")
+        return True
+
+    def save_file(self, path, raw, message=None):
+        self._write(path, raw)
+        self.commit({path: raw}, message or f"Add {path}")
+        return self.path(path)
+
+    # Background push and maintenance
+
+    def _git(self, *args):
+        return subprocess.run(["git", "-C", self.root, *args], capture_output=True, text=True, timeout=GIT_TIMEOUT)
+
+    def push(self):
+        """Push the branch if it is ahead of the remote's; returns True when the remote is up to date"""
+        if not self.has_remote:
+            return False
+        branch = self._branch()
+        head = self._read_ref(branch)
+        tracking = f"refs/remotes/{self.remote}/{branch[len('refs/heads/'):]}"
+        if head is None or head == self._read_ref(tracking):
+            self.unpushed = 0
+            return True
+        try:
+            result = self._git("push", "--quiet", self.remote, f"{branch}:{branch}")
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self.push_error = str(e)
+            return False
+        if result.returncode != 0:
+            self.push_error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "git push failed"
+            return False
+        self.push_error = None
+        self.last_push = time.time()
+        self.unpushed = 0
+        return True
+
+    def status(self):
+        """Branch head, commits not pushed yet (None = unknown) and the last push"""
+        if self.unpushed is None and self.has_remote:
+            branch = self._branch()
+            tracking = f"{self.remote}/{branch[len('refs/heads/'):]}"
+            try:
+                result = self._git("rev-list", "--count", f"{tracking}..{branch}")
+                self.unpushed = int(result.stdout) if result.returncode == 0 else None
+            except (OSError, subprocess.TimeoutExpired, ValueError):
+                pass
+        return {
+            'head': self._read_ref(self._branch()),
+            'remote': self.remote if self.has_remote else None,
+            'unpushed': self.unpushed,
+            'last_push': self.last_push,
+            'push_error': self.push_error,
+        }
+
+    def maintain(self):
+        """One round of the background job: sync the index, push, and gc when due"""
+        try:
+            with self.lock:
+                paths = sorted(self.committed_paths)
+            if paths and self._git("reset", "--quiet", "--", *paths).returncode == 0:
+                with self.lock:
+                    self.committed_paths.difference_update(paths)
+            if self.has_remote:
+                self.push()
+            if self.commits_since_gc >= MAINTENANCE_EVERY:
+                self._git("gc", "--quiet")
+                self.commits_since_gc = 0
+        except (OSError, subprocess.TimeoutExpired) as e:
+            # No git on this machine, or it hung: commits keep working, the next round tries again
+            self.push_error = str(e)
+
+    def start_pushing(self, interval=PUSH_INTERVAL):
+        """Run :meth:`maintain` every ``interval`` seconds in a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="journal-git-push", daemon=True)
+        self._thread.start()
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            self.maintain()
+
+    def stop_pushing(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.maintain()
@@ -0,0 +1,391 @@
+"""HTTP client for the GitHub REST API.
+
+One :class:`GitHubClient` holds a ``requests.Session`` whose connection pool
+keeps the TLS connection to api.github.com open between calls, so only the
+first request of a session pays for the handshake. Every request has a
+connect and read timeout (:data:`TIMEOUT`), and every failure -- an HTTP
+error status, a timeout, a dropped connection -- is raised as a
+:class:`GitHubError` carrying the status and GitHub's message rather than
+being swallowed.
+
+:meth:`GitHubClient.gather` runs many calls at once (the screenshots of a
+report) on a small thread pool, at most :data:`MAX_CONCURRENCY` in flight,
+each on a pooled connection: fetching many files costs about one round trip
+per :data:`MAX_CONCURRENCY` files instead of one per file. The app's scripts are synchronous, so the
+concurrency is threads over a blocking session rather than an event loop.
+
+Requests are scheduled against the token's REST budget (5,000 an hour),
+read from the ``X-RateLimit-*`` headers of every response into a
+:class:`RateLimit` shared by all clients of the token. Each request has a
+priority: writes (:data:`WRITE`) may spend the whole budget, reads
+(:data:`READ`) stop short of the last :data:`RESERVE` requests so saves keep
+working, and background work (:data:`BACKGROUND`: prefetch, clean-up,
+report thumbnails) stops much earlier and is deferred rather than waited
+for. When a slot frees up, a waiting write goes before a waiting read. A
+``Retry-After`` (secondary limit) or an exhausted budget holds requests
+until then: short waits are slept through, longer ones fail at once with a
+:class:`GitHubError` whose :attr:`~GitHubError.retry_at` says when to try
+again. File reads are conditional on the file's ETag; GitHub does not count
+a ``304 Not Modified`` against the budget, so reloading an unchanged journal
+on every rerun is free.
+
+``requests`` is imported when the first request is made so that a session
+which never talks to GitHub does not pay for importing it at startup.
+"""
+
+import base64
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+API_URL = "https://api.github.com"
+
+# (connect, read) seconds; a read covers uploading and downloading a whole journal file
+TIMEOUT = (5, 60)
+
+# Requests in flight at once from one client, and connections kept open for them
+MAX_CONCURRENCY = 8
+
+# Request priorities, most urgent first
+WRITE, READ, BACKGROUND = 0, 1, 2
+
+# Requests of each priority stop when the remaining budget is down to this
+RESERVE = {WRITE: 0, READ: 50, BACKGROUND: 500}
+
+# Seconds a write or read waits for the budget before failing
+MAX_RATE_LIMIT_WAIT = 3.0
+
+# Files whose last content is kept for conditional reads
+ETAG_CACHE_SIZE = 16
+
+# Hosts the token is sent to; other URLs (screenshots elsewhere) are fetched anonymously
+GITHUB_HOSTS = ("api.github.com", "raw.githubusercontent.com")
+
+
+class GitHubError(Exception):
+    """A failed GitHub request; ``status`` is None when no response arrived"""
+
+    def __init__(self, message, status=None, path=None, retry_at=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.path = path
+        self.retry_at = retry_at
+
+    def __str__(self):
+        where = f" ({self.path})" if self.path else ""
+        return f"{self.status}: {self.message}{where}" if self.status else f"{self.message}{where}"
+
+    @property
+    def not_found(self):
+        return self.status == 404
+
+    @property
+    def rate_limited(self):
+        """Refused or held back for the rate limit; retry after ``retry_at`` (epoch seconds)"""
+        return self.retry_at is not None
+
+    @property
+    def conflict(self):
+        """The file changed since its SHA was read (or a SHA was missing)"""
+        return self.status in (409, 422)
+
+
+class RateLimit:
+    """A token's REST budget as of its latest response"""
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+        self.blocked_until = 0.0
+        self.deferred = 0
+        self.lock = threading.Lock()
+
+    def update(self, status, headers):
+        with self.lock:
+            if 'X-RateLimit-Remaining' in headers:
+                self.limit = int(headers.get('X-RateLimit-Limit') or self.limit or 0)
+                self.remaining = int(headers['X-RateLimit-Remaining'])
+                self.reset = float(headers.get('X-RateLimit-Reset') or 0) or None
+            if status in (403, 429):
+                retry_after = headers.get('Retry-After')
+                if retry_after:
+                    self.blocked_until = max(self.blocked_until, time.time() + float(retry_after))
+                elif self.remaining == 0 and self.reset:
+                    self.blocked_until = max(self.blocked_until, self.reset)
+
+    def take(self, priority):
+        """Reserve one request of ``priority``; returns 0, or the epoch second it may go out at"""
+        now = time.time()
+        with self.lock:
+            if self.reset is not None and now >= self.reset:
+                # A new window: the next response tells the real numbers
+                self.remaining, self.reset = self.limit, None
+            if self.blocked_until > now:
+                return self.blocked_until
+            if self.remaining is not None and self.remaining <= RESERVE[priority]:
+                return self.reset or now + 60
+            if self.remaining is not None:
+                self.remaining -= 1
+            return 0
+
+    def snapshot(self):
+        with self.lock:
+            return {'limit': self.limit, 'remaining': self.remaining, 'reset': self.reset,
+                    'blocked_until': self.blocked_until if self.blocked_until > time.time() else None,
+                    'deferred': self.deferred}
+
+
+# One budget per token, shared by every session and client using it
+_rate_limits = {}
+_rate_limits_lock = threading.Lock()
+
+
+def rate_limit_for(token):
+    with _rate_limits_lock:
+        return _rate_limits.setdefault(token, RateLimit())
+
+
+class _Slots:
+    """At most ``size`` requests in flight; a waiting request goes before any of lower priority"""
+
+    def __init__(self, size):
+        self.free = size
+        self.waiting = [0, 0, 0]
+        self.condition = threading.Condition()
+
+    def acquire(self, priority):
+        with self.condition:
+            self.waiting[priority] += 1
+            self.condition.wait_for(lambda: self.free > 0 and not any(self.waiting[:priority]))
+            self.waiting[priority] -= 1
+            self.free -= 1
+
+    def release(self):
+        with self.condition:
+            self.free += 1
+            self.condition.notify_all()
+
+
+class GitHubClient:
+    """Pooled, timed-out access to one repository's contents"""
+
+    def __init__(self, token=None, owner=None, repo=None, base_url=API_URL, max_concurrency=MAX_CONCURRENCY):
+        self.token = token
+        self.owner = owner
+        self.repo = repo
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit_for(token)
+        self._slots = _Slots(max_concurrency)
+        self._etags = OrderedDict()
+        self._session = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                # Idempotent reads are retried once on a dropped connection or a 502/503/504
+                retry = Retry(total=1, read=0, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                              allowed_methods=frozenset({'GET'}), raise_on_status=False)
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_concurrency, max_retries=retry)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers['Accept'] = "application/vnd.github.v3+json"
+                self._session = session
+            return self._session
+
+    def request(self, method, url, accept=None, priority=None, headers=None, **kwargs):
+        """Send a request; returns the response or raises :class:`GitHubError`
+
+        ``url`` is a full URL or a path under the API (``/repos/...``).
+        ``priority`` defaults to :data:`READ` for GET and :data:`WRITE`
+        otherwise.
+        """
+        import requests
+
+        if url.startswith("/"):
+            url = self.base_url + url
+        if priority is None:
+            priority = READ if method == 'GET' else WRITE
+        headers = dict(headers or {})
+        if self.token and (urlparse(url).hostname in GITHUB_HOSTS or url.startswith(self.base_url)):
+            headers['Authorization'] = f"token {self.token}"
+        if accept:
+            headers['Accept'] = accept
+
+        # Only API calls spend the budget (raw content links do not)
+        metered = url.startswith(self.base_url)
+        self._slots.acquire(priority)
+        try:
+            if metered:
+                self._wait_for_budget(priority, url)
+            try:
+                response = self.session.request(method, url, headers=headers, timeout=TIMEOUT, **kwargs)
+            except requests.Timeout:
+                raise GitHubError("Timed out", path=url) from None
+            except requests.RequestException as e:
+                raise GitHubError(f"Connection failed: {e.__class__.__name__}", path=url) from None
+        finally:
+            self._slots.release()
+
+        if metered:
+            self.rate_limit.update(response.status_code, response.headers)
+        if response.status_code >= 400:
+            try:
+                message = response.json().get('message', response.reason)
+            except ValueError:
+                message = response.reason
+            retry_at = None
+            if response.status_code in (403, 429) and self.rate_limit.blocked_until > time.time():
+                retry_at = self.rate_limit.blocked_until
+            raise GitHubError(message, response.status_code, url, retry_at)
+        return response
+
+    def _wait_for_budget(self, priority, url):
+        retry_at = self.rate_limit.take(priority)
+        if not retry_at:
+            return
+        wait = retry_at - time.time()
+        if priority == BACKGROUND or wait > MAX_RATE_LIMIT_WAIT:
+            if priority == BACKGROUND:
+                with self.rate_limit.lock:
+                    self.rate_limit.deferred += 1
+            until = time.strftime('%H:%M:%S', time.localtime(retry_at))
+            raise GitHubError(f"Rate limited until {until}", path=url, retry_at=retry_at)
+        time.sleep(max(wait, 0))
+        # The window reopened (or the hold expired): count this request against it
+        self.rate_limit.take(WRITE)
+
+    def _contents_path(self, path):
+        return f"/repos/{self.owner}/{self.repo}/contents/{path}"
+
+    def repository(self):
+        """The repository's metadata; raises if the token cannot see it"""
+        return self.request('GET', f"/repos/{self.owner}/{self.repo}").json()
+
+    def get_contents(self, path, priority=READ):
+        """``(bytes, sha)`` of a file, ``(None, None)`` if it does not exist
+
+        Asks with the ETag of the last read of the file; an unchanged file
+        answers ``304`` and its kept bytes are returned.
+        """
+        with self._lock:
+            cached = self._etags.get(path)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        try:
+            response = self.request('GET', self._contents_path(path), priority=priority, headers=headers)
+        except GitHubError as e:
+            if e.not_found:
+                self._forget(path)
+                return None, None
+            raise
+        if response.status_code == 304 and cached:
+            return cached[1], cached[2]
+
+        content = response.json()
+        if content.get('encoding') == 'base64':
+            raw = base64.b64decode(content['content'])
+        else:
+            # Files over 1 MB come without content; their bytes are fetched as the raw media type
+            raw = self.request('GET', self._contents_path(path), accept="application/vnd.github.raw",
+                               priority=priority).content
+        self._remember(path, response.headers.get('ETag'), raw, content['sha'])
+        return raw, content['sha']
+
+    def has_etag(self, path):
+        """Whether :meth:`get_contents` can ask for ``path`` conditionally"""
+        with self._lock:
+            return path in self._etags
+
+    def _remember(self, path, etag, raw, sha):
+        if not etag:
+            return
+        with self._lock:
+            self._etags[path] = (etag, raw, sha)
+            self._etags.move_to_end(path)
+            while len(self._etags) > ETAG_CACHE_SIZE:
+                self._etags.popitem(last=False)
+
+    def _forget(self, path):
+        with self._lock:
+            self._etags.pop(path, None)
+
+    def put_contents(self, path, raw, message, sha=None):
+        """Create or replace a file; returns its new SHA
+
+        ``sha`` must be the file's current SHA when it exists, otherwise
+        GitHub answers with a conflict (see :attr:`GitHubError.conflict`).
+        """
+        body = {'message': message, 'content': base64.b64encode(raw).decode()}
+        if sha:
+            body['sha'] = sha
+        self._forget(path)
+        return self.request('PUT', self._contents_path(path), json=body).json()['content']['sha']
+
+    def list_directory(self, path="", priority=READ):
+        """``{path: sha}`` of the files directly in a directory, without their contents"""
+        try:
+            listing = self.request('GET', self._contents_path(path), priority=priority).json()
+        except GitHubError as e:
+            if e.not_found:
+                return {}
+            raise
+        return {item['path']: item['sha'] for item in listing if item['type'] == 'file'}
+
+    def tree(self, ref="HEAD", priority=READ):
+        """``{path: sha}`` of every file in the repository at ``ref``, in one request"""
+        tree = self.request('GET', f"/repos/{self.owner}/{self.repo}/git/trees/{ref}", params={'recursive': 1},
+                            priority=priority).json()
+        return {item['path']: item['sha'] for item in tree.get('tree', []) if item['type'] == 'blob'}
+
+    def get_url(self, url, priority=READ):
+        """Bytes at a URL (e.g. a raw screenshot link) over the pooled session"""
+        return self.request('GET', url, accept="*/*", priority=priority).content
+
+    def gather(self, fn, items):
+        """``[fn(item) for item in items]`` run concurrently, in order
+
+        A call that raises :class:`GitHubError` gives the error in its place
+        so one missing file does not lose the others.
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [_call(fn, item) for item in items]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="journal-github")
+            executor = self._executor
+        return list(executor.map(lambda item: _call(fn, item), items))
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+def _call(fn, item):
+    try:
+        return fn(item)
+    except GitHubError as e:
+        return e
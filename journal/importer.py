@@ -0,0 +1,160 @@
+"""Bulk import of broker trade logs into the journal.
+
+The Trade Day page imports one log into the selected day. These helpers do
+the same for any number of logs: :func:`read_trade_log` turns a file into
+trades with the page's own :func:`journal.trade_log.parse_trade_log` and
+:func:`journal.trade_log.group_fills_into_trades`, and :func:`merge_trades`
+files each trade under its exchange session date (see
+:mod:`journal.sessions`), recognising fills the journal
+already has (see :func:`journal.trade_log.fill_key`), without saving --
+the caller writes the journal once.
+"""
+
+from journal.entries import create_day_entry
+from journal.reconcile import reconcile_days
+from journal.risk import RiskEngine, evaluate_from, record_trade
+from journal.schema import iter_days
+from journal.sessions import SessionCalendar, sortable_timestamp
+from journal.trade_log import create_trade_summary_from_fills, fill_key, group_fills_into_trades, parse_trade_log
+
+# Summary fields derived from raw_fills; description, tags, outcome and the
+# screenshot can be edited on the Trade Day page and are left alone
+DERIVED_FIELDS = ('timestamp', 'symbol', 'direction', 'quantity', 'entry_price', 'exit_price', 'pnl')
+
+
+def read_trade_log(path):
+    """Parse and group one log file; returns (path, trades, error)
+
+    A module-level function so it can run in a process pool.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+    except OSError as e:
+        return path, [], f"Could not read file: {e}"
+
+    fills, error = parse_trade_log(content)
+    if error:
+        return path, [], error
+    return path, group_fills_into_trades(fills), None
+
+
+def session_date_key(trade, calendar):
+    """Journal date a trade belongs to: the exchange session of its first fill"""
+    return calendar.session_date_key(trade.get('timestamp', ''))
+
+
+def sessions_in(trades, calendar):
+    """Number of trades per session date key, in date order"""
+    counts = {}
+    for trade in trades:
+        date_key = session_date_key(trade, calendar)
+        counts[date_key] = counts.get(date_key, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def build_fill_index(data):
+    """Map every stored fill's key to the trade holding it, as (date_key, trade)
+
+    Built in one pass over the journal; duplicate checks are then a dict
+    lookup per fill instead of a scan of every trade.
+    """
+    index = {}
+    for date_key, entry in iter_days(data):
+        for trade in entry['trade_day']['trades']:
+            for fill in trade.get('raw_fills') or []:
+                index[fill_key(fill)] = (date_key, trade)
+    return index
+
+
+def merge_trades(data, trades, date_key=None, calendar=None, fallback_date_key=None):
+    """Add imported trades to the journal, merging any it already has
+
+    Trades go to their session date under ``calendar`` (the journal's
+    session settings by default), or all to ``date_key`` when given.
+    Trades whose timestamp cannot be read go to ``fallback_date_key``;
+    without one they are not imported and counted in ``skipped`` under
+    the empty key.
+    Each trade's fills are looked up in the fill index:
+
+    - no fill known: the trade is added;
+    - all fills already belong to one trade: it is skipped;
+    - some fills belong to one trade (an overlapping log saw more of it):
+      the new fills are merged into that trade, which keeps its id, tags,
+      screenshot and notes;
+    - fills spread over several stored trades: skipped rather than guessed.
+
+    The derived P&L of every day that changed is rebuilt and the risk rules
+    are checked (trade by trade when the trades only append to their days,
+    see :mod:`journal.risk`). Returns
+    ``(added, updated, skipped)`` counts per date key. Nothing is saved;
+    the caller writes the journal once.
+    """
+    added, updated, skipped = {}, {}, {}
+    new_trades = []
+    index = build_fill_index(data)
+    calendar = calendar or SessionCalendar.from_settings(data)
+
+    for trade in sorted(trades, key=lambda trade: sortable_timestamp(trade.get('timestamp', ''))):
+        target = date_key or session_date_key(trade, calendar) or fallback_date_key
+        if not target:
+            skipped[""] = skipped.get("", 0) + 1
+            continue
+        keys = [fill_key(fill) for fill in trade.get('raw_fills') or []]
+        matches = {id(index[key][1]): index[key] for key in keys if key in index}
+
+        if not matches:
+            if target not in data:
+                data[target] = create_day_entry()
+            data[target]['trade_day']['trades'].append(trade)
+            new_trades.append((target, trade))
+            for key in keys:
+                index[key] = (target, trade)
+            added[target] = added.get(target, 0) + 1
+            continue
+
+        if len(matches) > 1:
+            skipped[target] = skipped.get(target, 0) + 1
+            continue
+
+        (stored_date, stored), = matches.values()
+        new_fills = [fill for key, fill in zip(keys, trade['raw_fills']) if key not in index]
+        if not new_fills:
+            skipped[stored_date] = skipped.get(stored_date, 0) + 1
+            continue
+
+        stored['raw_fills'] = sorted(stored['raw_fills'] + new_fills, key=lambda fill: sortable_timestamp(fill.get('DateTime', '')))
+        recompute_trade(stored)
+        for fill in new_fills:
+            index[fill_key(fill)] = (stored_date, stored)
+        updated[stored_date] = updated.get(stored_date, 0) + 1
+
+    reconcile_days(data, set(added) | set(updated))
+    engine = RiskEngine.for_journal(data)
+    if updated:
+        evaluate_from(data, min(set(added) | set(updated)), engine)
+    else:
+        for target, trade in new_trades:
+            record_trade(data, target, trade, engine)
+    return added, updated, skipped
+
+
+def recompute_trade(trade):
+    """Re-derive an imported trade's prices, size and P&L from its raw fills
+
+    Keeps the id, tags, screenshot and any planned stop. Returns True if
+    anything changed; trades without raw fills are left alone.
+    """
+    fills = trade.get('raw_fills')
+    if not fills:
+        return False
+    summary = create_trade_summary_from_fills(fills, fills[0].get('Symbol', trade.get('symbol', 'Unknown')))
+    if not summary:
+        return False
+
+    changed = False
+    for field in DERIVED_FIELDS:
+        if trade.get(field) != summary[field]:
+            trade[field] = summary[field]
+            changed = True
+    return changed
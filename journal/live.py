@@ -0,0 +1,126 @@
+"""Live intraday P&L from the fills the log tailer reads.
+
+:class:`LiveSession` is fed by :class:`journal.tailer.LogTailer` as it
+reads fills: each fill updates its symbol's position and average price and
+books realized P&L when it reduces a position, and each closed trade
+updates the trade count and streak -- constant work per fill. The last
+:data:`LIVE_FILL_BUFFER` fills are kept in a ring buffer for display.
+
+:meth:`LiveSession.snapshot` reads that state without touching the journal,
+so the Trade Day page's live panel can refresh every second for the cost of
+a few additions. The numbers (not the fill buffer) are saved with the
+tailer's state. Unrealized P&L marks open positions at the symbol's last
+fill price, the only price the log has. Numbers reset when a fill belongs
+to a new exchange session (see :class:`journal.sessions.SessionCalendar`);
+open positions carry over.
+"""
+
+from collections import deque
+from itertools import islice
+
+from journal.trade_log import get_point_value
+
+# Fills kept for the live panel
+LIVE_FILL_BUFFER = 1024
+
+
+class LiveSession:
+    def __init__(self):
+        self.session = None
+        self.realized = 0.0
+        self.trades = 0
+        self.contracts = 0.0
+        self.streak = 0
+        self.positions = {}
+        self.last_prices = {}
+        self.fills = deque(maxlen=LIVE_FILL_BUFFER)
+
+    def _start_session(self, session):
+        self.session = session
+        self.realized = 0.0
+        self.trades = 0
+        self.contracts = 0.0
+        self.streak = 0
+
+    def add_fill(self, fill, session):
+        """Book one fill of the session ``session`` (a date key)"""
+        if session != self.session:
+            self._start_session(session)
+        symbol = fill.get('Symbol', 'Unknown')
+        try:
+            quantity = float(fill.get('Quantity') or 0)
+            price = float(fill.get('FillPrice') or 0)
+        except ValueError:
+            return
+        if not quantity or not price:
+            return
+        signed = quantity if fill.get('BuySell') == 'Buy' else -quantity
+
+        position, average = self.positions.get(symbol, (0.0, 0.0))
+        if position == 0 or (position > 0) == (signed > 0):
+            average = (average * abs(position) + price * quantity) / (abs(position) + quantity)
+        else:
+            closed = min(abs(position), quantity)
+            self.realized += (price - average) * closed * (1 if position > 0 else -1) * get_point_value(symbol)
+            if quantity > abs(position):
+                # Reversed through flat: the remainder opens at this price
+                average = price
+        position += signed
+
+        if position:
+            self.positions[symbol] = (position, average)
+        else:
+            self.positions.pop(symbol, None)
+        self.last_prices[symbol] = price
+        self.fills.append((fill.get('DateTime', ''), symbol, fill.get('BuySell', ''), quantity, price))
+
+    def add_trade(self, trade):
+        """Count a closed trade (see :func:`journal.trade_log.group_fills_into_trades`)"""
+        self.trades += 1
+        self.contracts += float(trade.get('quantity') or 0)
+        pnl = trade.get('pnl') or 0
+        if pnl > 0:
+            self.streak = self.streak + 1 if self.streak > 0 else 1
+        elif pnl < 0:
+            self.streak = self.streak - 1 if self.streak < 0 else -1
+
+    def snapshot(self, commission=0.0, daily_loss_limit=0.0, recent_fills=10):
+        """Current numbers; realized P&L is net of the round-turn ``commission`` per contract"""
+        unrealized = sum((self.last_prices[symbol] - average) * position * get_point_value(symbol)
+                         for symbol, (position, average) in self.positions.items())
+        realized = self.realized - self.contracts * commission
+        total = realized + unrealized
+        return {
+            'session': self.session,
+            'realized': realized,
+            'unrealized': unrealized,
+            'total': total,
+            'trades': self.trades,
+            'streak': self.streak,
+            'positions': {symbol: position for symbol, (position, _) in self.positions.items()},
+            'loss_limit_left': daily_loss_limit + total if daily_loss_limit else None,
+            'recent_fills': list(islice(reversed(self.fills), recent_fills)),
+        }
+
+    def to_dict(self):
+        return {
+            'session': self.session,
+            'realized': self.realized,
+            'trades': self.trades,
+            'contracts': self.contracts,
+            'streak': self.streak,
+            'positions': {symbol: list(value) for symbol, value in self.positions.items()},
+            'last_prices': self.last_prices,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        live = cls()
+        live.session = state.get('session')
+        live.realized = state.get('realized', 0.0)
+        live.trades = state.get('trades', 0)
+        live.contracts = state.get('contracts', 0.0)
+        live.streak = state.get('streak', 0)
+        live.positions = {symbol: tuple(value) for symbol, value in state.get('positions', {}).items()}
+        live.last_prices = state.get('last_prices', {})
+        return live
@@ -0,0 +1,249 @@
+"""Local OHLCV store and maximum adverse/favourable excursion of trades.
+
+A trade log only has fill prices, so it cannot say how far a trade went
+against you (MAE) or in your favour (MFE) while it was open. With the
+market's bars for the session that can be computed: import bar or tick
+exports (e.g. Sierra Chart's "Export Bar Data" or a tick export, CSV or
+tab-separated) into a :class:`BarStore` and :func:`trade_excursions` measures
+every trade against them.
+
+The store keeps one LZ4-compressed Arrow IPC file per symbol and month::
+
+    market_data/F.US.MNQU25/2025-09.arrow   (time, open, high, low, close, volume)
+
+sorted by ``time``. Reads memory-map the files, so only the months a query
+touches are paged in and decompressed. Bar times must be on the same clock
+as the trade log (both are naive local timestamps); a bar is stamped with
+its start time.
+
+:func:`trade_excursions` works on a whole trade frame at once: per symbol,
+the bars for the trades' date range are loaded once, each trade's entry and
+exit time is located with one ``searchsorted`` and the highs and lows in
+between are reduced with ``np.maximum.reduceat``/``np.minimum.reduceat``,
+so thousands of trades cost a few array operations rather than a loop.
+"""
+
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from journal.perf import traced
+from journal.trade_log import get_point_value
+
+MARKET_DATA_DIR = "market_data"
+BAR_COLUMNS = ('time', 'open', 'high', 'low', 'close', 'volume')
+COMPRESSION = 'lz4'
+
+# Header names used by common exports -> store column
+COLUMN_ALIASES = {
+    'datetime': 'time', 'date time': 'time', 'timestamp': 'time',
+    'open': 'open', 'high': 'high', 'low': 'low',
+    'close': 'close', 'last': 'close', 'price': 'close',
+    'volume': 'volume', 'vol': 'volume', 'size': 'volume', 'quantity': 'volume',
+}
+
+SCHEMA = pa.schema([('time', pa.timestamp('ns'))] + [(name, pa.float64()) for name in BAR_COLUMNS[1:]])
+
+
+@traced()
+def read_bar_file(source):
+    """Parse a bar or tick export into a frame with :data:`BAR_COLUMNS`
+
+    ``source`` is a path or a file object. The header decides the layout:
+    ``Date`` and ``Time`` columns (or one ``DateTime``), then ``Open``,
+    ``High``, ``Low``, ``Close``/``Last`` and ``Volume``. A tick export with
+    only a price column becomes one-tick bars.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            raw = f.read()
+    else:
+        raw = source.read()
+    text = raw.decode('utf-8-sig') if isinstance(raw, bytes) else raw
+    header = text.split('\n', 1)[0]
+    frame = pd.read_csv(io.StringIO(text), sep='\t' if '\t' in header else ',', skipinitialspace=True)
+    frame.columns = [str(column).strip().lower() for column in frame.columns]
+
+    if 'date' in frame.columns and 'time' in frame.columns:
+        stamps = frame['date'].astype(str).str.strip() + ' ' + frame['time'].astype(str).str.strip()
+        frame = frame.drop(columns=['date', 'time'])
+    elif 'date' in frame.columns:
+        stamps = frame.pop('date').astype(str)
+    else:
+        stamps = None
+    frame = frame.rename(columns={column: COLUMN_ALIASES[column] for column in frame.columns if column in COLUMN_ALIASES})
+    if stamps is not None:
+        frame['time'] = stamps
+    if 'time' not in frame.columns or 'close' not in frame.columns:
+        raise ValueError("Expected Date/Time (or DateTime) and Close/Last/Price columns")
+
+    for column in ('open', 'high', 'low'):
+        if column not in frame.columns:
+            frame[column] = frame['close']
+    if 'volume' not in frame.columns:
+        frame['volume'] = 0.0
+
+    stamps = frame['time'].astype(str).str.split().str.join(' ')
+    times = pd.to_datetime(stamps, errors='coerce')
+    # The format is inferred from the first row; rows that differ (e.g. without fractional seconds) parse one by one
+    unparsed = times.isna()
+    if unparsed.any():
+        times[unparsed] = pd.to_datetime(stamps[unparsed], format='mixed', errors='coerce')
+    bars = pd.DataFrame({'time': times})
+    for column in BAR_COLUMNS[1:]:
+        bars[column] = pd.to_numeric(frame[column], errors='coerce').astype(float)
+    return bars.dropna(subset=['time', 'high', 'low']).sort_values('time', kind='stable').reset_index(drop=True)
+
+
+class BarStore:
+    """Bars per symbol, one compressed Arrow file per month"""
+
+    def __init__(self, root=MARKET_DATA_DIR):
+        self.root = root
+
+    def _path(self, symbol, month):
+        return os.path.join(self.root, symbol.replace('/', '_'), f"{month}.arrow")
+
+    def symbols(self):
+        """Symbols with stored bars"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def months(self, symbol):
+        directory = os.path.join(self.root, symbol.replace('/', '_'))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-len('.arrow')] for name in os.listdir(directory) if name.endswith('.arrow'))
+
+    def revision(self):
+        """Changes whenever a month file is written; cache key for derived data"""
+        stamps = []
+        for symbol in self.symbols():
+            for month in self.months(symbol):
+                stat = os.stat(self._path(symbol, month))
+                stamps.append(f"{symbol}/{month}:{stat.st_mtime_ns}:{stat.st_size}")
+        return hashlib.sha1("\n".join(stamps).encode()).hexdigest() if stamps else "empty"
+
+    def _read_month(self, symbol, month):
+        with pa.memory_map(self._path(symbol, month), 'r') as source:
+            return ipc.open_file(source).read_all()
+
+    @traced("bars.ingest")
+    def ingest(self, symbol, bars):
+        """Add bars for a symbol, replacing stored bars with the same time; returns rows written"""
+        if bars.empty:
+            return 0
+        months = bars['time'].to_numpy().astype('datetime64[M]')
+        written = 0
+        for month, new in bars.groupby(months, sort=True):
+            month = str(np.datetime64(month, 'M'))
+            path = self._path(symbol, month)
+            table = pa.Table.from_pandas(new[list(BAR_COLUMNS)], schema=SCHEMA, preserve_index=False)
+            if os.path.exists(path):
+                table = pa.concat_tables([self._read_month(symbol, month), table])
+                # Keep the last bar for each time: re-imported exports win
+                frame = table.to_pandas().drop_duplicates('time', keep='last').sort_values('time', kind='stable')
+                table = pa.Table.from_pandas(frame, schema=SCHEMA, preserve_index=False)
+            else:
+                table = table.sort_by('time')
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with ipc.new_file(tmp, SCHEMA, options=ipc.IpcWriteOptions(compression=COMPRESSION)) as writer:
+                writer.write_table(table)
+            os.replace(tmp, path)
+            written += len(new)
+        return written
+
+    def bars(self, symbol, start, end):
+        """Bars of a symbol with ``start <= time <= end`` as numpy arrays keyed by column
+
+        ``time`` is int64 nanoseconds; the others are float64.
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        wanted = [month for month in self.months(symbol) if start.strftime("%Y-%m") <= month <= end.strftime("%Y-%m")]
+        tables = [self._read_month(symbol, month) for month in wanted]
+        if not tables:
+            return {column: np.empty(0, dtype=np.int64 if column == 'time' else float) for column in BAR_COLUMNS}
+        table = pa.concat_tables(tables)
+        times = table.column('time').to_numpy().astype('datetime64[ns]').view(np.int64)
+        lo = np.searchsorted(times, start.value, side='left')
+        hi = np.searchsorted(times, end.value, side='right')
+        columns = {'time': times[lo:hi]}
+        for column in BAR_COLUMNS[1:]:
+            columns[column] = table.column(column).to_numpy()[lo:hi]
+        return columns
+
+
+def _range_extremes(values, starts, stops, reduce):
+    """``reduce`` over ``values[start:stop]`` for every pair, NaN for empty ranges"""
+    padded = np.append(values, values[-1] if len(values) else np.nan)
+    result = reduce.reduceat(padded, np.column_stack([starts, stops]).ravel())[::2]
+    return np.where(stops > starts, result, np.nan)
+
+
+@traced()
+def trade_excursions(trades, store):
+    """MAE, MFE, time in trade and efficiency for every trade with stored bars
+
+    ``trades`` needs ``symbol``, ``direction``, ``quantity``,
+    ``entry_price``, ``exit_price``, ``entry_time`` and ``exit_time``
+    columns (see :func:`journal.analytics.trade_frame`). Returns a frame on
+    the same index with:
+
+    - ``mae`` / ``mfe``: worst and best open price move in points, from the
+      entry price (both >= 0);
+    - ``mae_usd`` / ``mfe_usd``: the same in dollars for the trade's size;
+    - ``time_in_trade``: exit time minus entry time;
+    - ``efficiency``: realized points / MFE, the share of the best move
+      that was kept (NaN when the trade never went in your favour);
+    - ``bars``: number of bars the trade spanned (0 = no data, all NaN).
+    """
+    result = pd.DataFrame(index=trades.index, columns=['mae', 'mfe', 'mae_usd', 'mfe_usd', 'time_in_trade',
+                                                      'efficiency', 'bars'], dtype=float)
+    result['time_in_trade'] = trades['exit_time'] - trades['entry_time']
+    result['bars'] = 0
+    valid = trades['entry_time'].notna() & trades['exit_time'].notna() & trades['entry_price'].notna()
+    stored = set(store.symbols())
+
+    for symbol, group in trades[valid].groupby('symbol'):
+        if symbol not in stored:
+            continue
+        bars = store.bars(symbol, group['entry_time'].min().floor('D'), group['exit_time'].max())
+        if not len(bars['time']):
+            continue
+        entry_ns = group['entry_time'].to_numpy().astype('datetime64[ns]').view(np.int64)
+        exit_ns = group['exit_time'].to_numpy().astype('datetime64[ns]').view(np.int64)
+        # The bar the entry falls in through the bar the exit falls in
+        starts = np.maximum(np.searchsorted(bars['time'], entry_ns, side='right') - 1, 0)
+        stops = np.searchsorted(bars['time'], exit_ns, side='right')
+        high = _range_extremes(bars['high'], starts, stops, np.maximum)
+        low = _range_extremes(bars['low'], starts, stops, np.minimum)
+
+        entry = group['entry_price'].to_numpy(dtype=float)
+        exit_ = group['exit_price'].to_numpy(dtype=float)
+        long = (group['direction'] == "Long").to_numpy()
+        # Fills are part of the path too (a fill can print outside a coarse bar's range)
+        high = np.fmax(high, np.fmax(entry, exit_))
+        low = np.fmin(low, np.fmin(entry, exit_))
+        mae = np.where(long, entry - low, high - entry)
+        mfe = np.where(long, high - entry, entry - low)
+        realized = np.where(long, exit_ - entry, entry - exit_)
+        has_bars = stops > starts
+        size = group['quantity'].to_numpy(dtype=float) * group['symbol'].map(get_point_value).to_numpy(dtype=float)
+
+        result.loc[group.index, 'mae'] = np.where(has_bars, mae, np.nan)
+        result.loc[group.index, 'mfe'] = np.where(has_bars, mfe, np.nan)
+        result.loc[group.index, 'mae_usd'] = np.where(has_bars, mae * size, np.nan)
+        result.loc[group.index, 'mfe_usd'] = np.where(has_bars, mfe * size, np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result.loc[group.index, 'efficiency'] = np.where(has_bars & (mfe > 0), realized / mfe, np.nan)
+        result.loc[group.index, 'bars'] = stops - starts
+    result['bars'] = result['bars'].astype(int)
+    return result
@@ -0,0 +1,55 @@
+"""Journal pages.
+
+Each page lives in its own module exposing ``render(ctx)`` where ``ctx`` is
+a :class:`PageContext`. Modules are imported the first time their page is
+opened, so pandas and plotly are only loaded once a page that draws tables
+or charts is visited.
+
+Inside a page, regions that can change independently (an editor, an upload
+box, a chart with its own date range) are ``st.fragment`` functions: using
+their widgets reruns only that region, not the sidebar or the rest of the
+page. Anything that saves calls ``st.rerun()``, which reruns the whole app
+so the sidebar balance and stats pick up the change.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+
+from journal.perf import span, timed_import
+
+PAGES = {
+    "📊 Calendar View": "calendar_view",
+    "🌅 Morning Prep": "morning_prep",
+    "📈 Trade Day": "trade_day",
+    "📈 Trading Review": "trading_review",
+    "🌙 Evening Recap": "evening_recap",
+    "📚 Historical Analysis": "historical_analysis",
+    "🧠 Psychology": "psychology_dashboard",
+    "📄 Reports": "reports",
+    "💰 Balance & Ledger": "balance_ledger",
+    "🏷️ Tag Management": "tag_management",
+}
+
+
+@dataclass
+class PageContext:
+    """The journal and the day a page is rendering
+
+    ``revision`` identifies the loaded journal (GitHub blob SHA or local
+    file mtime/size) and is what cached analytics are keyed on.
+    """
+    data: dict
+    selected_date: date
+    date_key: str
+    current_entry: dict
+    revision: str = ""
+
+
+def render_page(page, ctx):
+    """Import the page module on first use and render it"""
+    module_name = PAGES.get(page)
+    if module_name is None:
+        return
+    module = timed_import(f"{__name__}.{module_name}")
+    with span("page.render", page=module_name):
+        module.render(ctx)
@@ -0,0 +1,291 @@
+"""Balance & Ledger page: transaction ledger and balance history chart."""
+
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from journal.account import (
+    add_transaction,
+    calculate_running_balance,
+    calculate_total_deposits,
+    calculate_total_withdrawals,
+    delete_transaction,
+    get_account_settings,
+    get_all_transactions,
+    get_transactions_for_date,
+)
+from journal.entries import get_date_key
+from journal.figures import balance_figure
+from journal.reconcile import day_pnl
+from journal.risk import evaluate_from
+from journal.storage import save_local_data
+
+
+def render(ctx):
+    """Render the page for the selected date"""
+    data = ctx.data
+    st.markdown('<div class="section-header">💰 Account Balance & Transaction Ledger</div>', unsafe_allow_html=True)
+
+    account_settings = get_account_settings(data)
+
+    if not account_settings.get('starting_balance') or not account_settings.get('start_date'):
+        st.warning("⚠️ Please set up your account balance tracking in the sidebar first.")
+        st.info("Go to the sidebar and expand '⚙️ Setup Account Tracking' to get started.")
+    else:
+        starting_balance = account_settings['starting_balance']
+        start_date_str = account_settings['start_date']
+        start_date_obj = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+
+        _transaction_ledger(ctx)
+        _balance_history(ctx, starting_balance, start_date_obj)
+
+
+@st.fragment
+def _transaction_ledger(ctx):
+    """Quick-add form and the most recent transactions"""
+    data = ctx.data
+
+    # Add Transaction Ledger at the top
+    st.subheader("💳 Transaction Ledger")
+
+    # Quick add transaction form
+    col1, col2, col3, col4, col5 = st.columns([1.5, 1, 1, 2, 1])
+
+    with col1:
+        ledger_transaction_type = st.selectbox(
+            "Type",
+            ["deposit", "withdrawal"],
+            format_func=lambda x: "💰 Deposit" if x == "deposit" else "💸 Withdrawal",
+            key="ledger_type"
+        )
+
+    with col2:
+        ledger_transaction_amount = st.number_input(
+            "Amount ($)",
+            min_value=0.01,
+            step=50.0,
+            format="%.2f",
+            key="ledger_amount"
+        )
+
+    with col3:
+        ledger_transaction_date = st.date_input(
+            "Date",
+            value=date.today(),
+            max_value=date.today(),
+            key="ledger_date"
+        )
+
+    with col4:
+        ledger_transaction_description = st.text_input(
+            "Description",
+            placeholder="e.g., Monthly deposit, Profit withdrawal...",
+            key="ledger_description"
+        )
+
+    with col5:
+        st.markdown("<br>", unsafe_allow_html=True)  # Add space for alignment
+        if st.button("💾 Add", type="primary", key="ledger_add"):
+            if ledger_transaction_amount > 0:
+                data = add_transaction(data, ledger_transaction_date, ledger_transaction_type, ledger_transaction_amount, ledger_transaction_description)
+                # The balance moved: trailing drawdown and loss limits from that day on
+                evaluate_from(data, get_date_key(ledger_transaction_date))
+
+                # Save to storage
+                save_local_data(data)
+
+                transaction_verb = "deposited" if ledger_transaction_type == "deposit" else "withdrawn"
+                st.success(f"${ledger_transaction_amount:.2f} {transaction_verb}! Balance updated.")
+                st.rerun()
+            else:
+                st.error("Amount must be greater than 0")
+
+    # Recent transactions summary
+    all_transactions = get_all_transactions(data)
+    if all_transactions:
+        st.markdown("---")
+        st.subheader("📋 Recent Transactions")
+
+        # Show last 5 transactions
+        recent_transactions = list(reversed(all_transactions[-5:]))
+
+        for transaction in recent_transactions:
+            type_icon = "💰" if transaction['type'] == 'deposit' else "💸"
+            type_color = "green" if transaction['type'] == 'deposit' else "red"
+            amount_display = f"+${transaction['amount']:,.2f}" if transaction['type'] == 'deposit' else f"-${transaction['amount']:,.2f}"
+            desc = f" - {transaction['description']}" if transaction.get('description') else ""
+
+            st.markdown(f"""
+            <div style="background: rgba(0,20,40,0.3); padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px; border-left: 3px solid {type_color};">
+                <strong>{transaction['date']}</strong> | {type_icon} <span style="color: {type_color};">{amount_display}</span>{desc}
+            </div>
+            """, unsafe_allow_html=True)
+
+        if len(all_transactions) > 5:
+            st.info(f"Showing 5 most recent transactions. Total: {len(all_transactions)} transactions.")
+
+
+@st.fragment
+def _balance_history(ctx, starting_balance, start_date_obj):
+    """Balance chart, transaction table and CSV export for a chosen date range"""
+    data = ctx.data
+    all_transactions = get_all_transactions(data)
+
+    st.markdown("---")
+
+    # Date range for analysis
+    st.subheader("📊 Balance History Analysis")
+    col1, col2 = st.columns(2)
+    with col1:
+        analysis_start = st.date_input(
+            "Start Date",
+            value=start_date_obj,
+            min_value=start_date_obj,
+            max_value=date.today()
+        )
+    with col2:
+        analysis_end = st.date_input(
+            "End Date",
+            value=date.today(),
+            min_value=start_date_obj,
+            max_value=date.today()
+        )
+
+    # Calculate daily balances including transactions
+    balance_data = []
+    current_date = analysis_start
+    running_balance = calculate_running_balance(data, analysis_start, starting_balance, start_date_obj)
+
+    while current_date <= analysis_end:
+        date_key = get_date_key(current_date)
+        daily_pnl = 0
+        daily_deposits = 0
+        daily_withdrawals = 0
+
+        # Get trading P&L
+        if date_key in data:
+            daily_pnl = day_pnl(data[date_key])
+
+        # Get transactions for this date
+        day_transactions = get_transactions_for_date(data, current_date)
+        for transaction in day_transactions:
+            if transaction['type'] == 'deposit':
+                daily_deposits += transaction['amount']
+            else:
+                daily_withdrawals += transaction['amount']
+
+        balance_data.append({
+            'date': current_date,
+            'date_str': current_date.strftime("%Y-%m-%d"),
+            'balance': running_balance,
+            'daily_pnl': daily_pnl,
+            'daily_deposits': daily_deposits,
+            'daily_withdrawals': daily_withdrawals,
+            'net_transactions': daily_deposits - daily_withdrawals,
+            'cumulative_pnl': running_balance - starting_balance - calculate_total_deposits(data, current_date) + calculate_total_withdrawals(data, current_date)
+        })
+
+        # Update running balance for next day
+        running_balance += daily_pnl + daily_deposits - daily_withdrawals
+        current_date += timedelta(days=1)
+
+    # Display summary metrics
+    if balance_data:
+        latest_balance = balance_data[-1]['balance']
+        total_deposits = calculate_total_deposits(data, analysis_end)
+        total_withdrawals = calculate_total_withdrawals(data, analysis_end)
+        total_pnl = latest_balance - starting_balance - total_deposits + total_withdrawals
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Current Balance", f"${latest_balance:,.2f}")
+        with col2:
+            st.metric("Trading P&L", f"${total_pnl:,.2f}", delta=f"{(total_pnl/starting_balance)*100:.2f}%")
+        with col3:
+            st.metric("Total Deposits", f"${total_deposits:,.2f}")
+        with col4:
+            st.metric("Total Withdrawals", f"${total_withdrawals:,.2f}")
+
+        # Enhanced balance chart with transactions
+        st.plotly_chart(balance_figure(balance_data, starting_balance), use_container_width=True)
+
+        # Transaction management section
+        if all_transactions:
+            st.markdown("---")
+            st.subheader("🛠️ Manage All Transactions")
+
+            # Create DataFrame for display
+            df_transactions = []
+            for i, transaction in enumerate(reversed(all_transactions)):
+                df_transactions.append({
+                    'Date': transaction['date'],
+                    'Type': "💰 Deposit" if transaction['type'] == 'deposit' else "💸 Withdrawal",
+                    'Amount': f"${transaction['amount']:,.2f}",
+                    'Description': transaction.get('description', ''),
+                    'Index': len(all_transactions) - 1 - i
+                })
+
+            # Display transaction table
+            st.dataframe(
+                pd.DataFrame(df_transactions)[['Date', 'Type', 'Amount', 'Description']], 
+                use_container_width=True, 
+                hide_index=True
+            )
+
+            # Delete transaction functionality
+            with st.expander("🗑️ Delete Transaction"):
+                transaction_options = []
+                for i, transaction in enumerate(all_transactions):
+                    type_icon = "💰" if transaction['type'] == 'deposit' else "💸"
+                    desc = f" - {transaction['description']}" if transaction.get('description') else ""
+                    option = f"{transaction['date']} | {type_icon} ${transaction['amount']:,.2f}{desc}"
+                    transaction_options.append(option)
+
+                if transaction_options:
+                    selected_transaction = st.selectbox(
+                        "Select transaction to delete:",
+                        range(len(transaction_options)),
+                        format_func=lambda x: transaction_options[x]
+                    )
+
+                    col1, col2 = st.columns([1, 3])
+                    with col1:
+                        if st.button("🗑️ Delete Selected", key="delete_transaction_balance"):
+                            deleted_date = all_transactions[selected_transaction]['date']
+                            data = delete_transaction(data, selected_transaction)
+                            evaluate_from(data, deleted_date)
+
+                            # Save to storage
+                            save_local_data(data)
+
+                            st.success("Transaction deleted! Balance will update.")
+                            st.rerun()
+
+                    with col2:
+                        st.warning("⚠️ Deleting a transaction will affect your balance calculations.")
+
+            # Export functionality
+            st.markdown("---")
+            if st.button("📤 Export Complete Ledger as CSV"):
+                # Create comprehensive export with balance data
+                export_data = []
+                for day in balance_data:
+                    export_data.append({
+                        'Date': day['date_str'],
+                        'Balance': day['balance'],
+                        'Trading_PnL': day['daily_pnl'],
+                        'Deposits': day['daily_deposits'],
+                        'Withdrawals': day['daily_withdrawals'],
+                        'Net_Transactions': day['net_transactions']
+                    })
+
+                df_export = pd.DataFrame(export_data)
+                csv = df_export.to_csv(index=False)
+                st.download_button(
+                    label="Download Balance Ledger CSV",
+                    data=csv,
+                    file_name=f"balance_ledger_{date.today().strftime('%Y%m%d')}.csv",
+                    mime="text/csv"
+                )
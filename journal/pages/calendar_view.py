@@ -0,0 +1,136 @@
+"""Calendar View page: monthly P&L calendar with weekly totals."""
+
+import calendar
+from datetime import date, timedelta
+
+import streamlit as st
+
+from journal.entries import get_date_key
+from journal.reconcile import day_pnl, pnl_mismatch
+from journal.rules import compliance_rate
+
+
+def render(ctx):
+    """Render the page for the selected date"""
+    st.markdown('<div class="section-header">📊 Monthly Calendar</div>', unsafe_allow_html=True)
+
+    _month_grid(ctx)
+
+
+@st.fragment
+def _month_grid(ctx):
+    """Month selector and grid; changing the month only reruns this region"""
+    data, selected_date = ctx.data, ctx.selected_date
+
+    # Month selector
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        selected_month = st.date_input(
+            "Select Month",
+            value=selected_date.replace(day=1),
+            key="calendar_month"
+        )
+
+    # Get the first day of the month and number of days
+    first_day = selected_month.replace(day=1)
+    last_day = (first_day + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+    # Create calendar with Sunday as first day of week
+    calendar.setfirstweekday(calendar.SUNDAY)
+    cal = calendar.monthcalendar(first_day.year, first_day.month)
+
+    st.subheader(f"{calendar.month_name[first_day.month]} {first_day.year}")
+
+    # Calendar with weekly totals - Header
+    days = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Weekly P&L']
+    header_cols = st.columns(8)
+    for i, day in enumerate(days):
+        header_cols[i].markdown(f"**{day}**")
+
+    # Calendar body with weekly totals - ALL SAME HEIGHT
+    for week in cal:
+        week_cols = st.columns(8)
+        week_pnl = 0
+
+        for i, day in enumerate(week):
+            if day == 0:
+                # Empty day - same height as others
+                week_cols[i].markdown(
+                    '<div style="border: 2px solid #333; padding: 10px; height: 80px; background: rgba(0,0,0,0.2); border-radius: 5px;">&nbsp;</div>', 
+                    unsafe_allow_html=True
+                )
+            else:
+                day_date = date(first_day.year, first_day.month, day)
+                day_key = get_date_key(day_date)
+
+                # Check if we have data for this day
+                if day_key in data:
+                    entry = data[day_key]
+                    pnl = day_pnl(entry)
+                    week_pnl += pnl
+                    # The review's manual P&L disagrees with the day's trades
+                    mismatch_flag = " ⚠️" if pnl_mismatch(entry) is not None else ""
+
+                    # Check rule compliance
+                    day_compliance = compliance_rate(entry['trading'])
+                    if day_compliance is not None:
+                        compliance_color = "🟢" if day_compliance >= 0.8 else "🔴"
+                    else:
+                        compliance_color = "⚪"
+
+                    # Display day with P&L and compliance - clickable with same height
+                    pnl_color = "green" if pnl > 0 else "red" if pnl < 0 else "gray"
+
+                    # Create clickable day button with fixed height
+                    button_key = f"cal_day_{day_key}"
+                    week_cols[i].markdown(f'''
+                    <div style="border: 2px solid #333; padding: 10px; height: 80px; background: rgba(0,20,40,0.3); 
+                                border-radius: 5px; text-align: center; display: flex; flex-direction: column; justify-content: center;">
+                        <strong>{day} {compliance_color}</strong><br>
+                        <span style="color: {pnl_color};">${pnl:.2f}{mismatch_flag}</span>
+                    </div>
+                    ''', unsafe_allow_html=True)
+
+                    if week_cols[i].button("View", key=button_key, help=f"Click to view {day_date.strftime('%B %d, %Y')}"):
+                        st.session_state.current_date = day_date
+                        st.session_state.page = "📈 Trading Review"
+                        st.rerun()
+                else:
+                    # Empty day - still clickable with same height
+                    empty_button_key = f"cal_empty_{day}_{first_day.month}_{first_day.year}"
+                    week_cols[i].markdown(f'''
+                    <div style="border: 2px solid #333; padding: 10px; height: 80px; background: rgba(0,0,0,0.2); 
+                                border-radius: 5px; text-align: center; display: flex; flex-direction: column; justify-content: center;">
+                        <strong>{day}</strong><br>
+                        <span style="color: gray;">---</span>
+                    </div>
+                    ''', unsafe_allow_html=True)
+
+                    if week_cols[i].button("Add", key=empty_button_key, help=f"Click to add entry for {day_date.strftime('%B %d, %Y')}"):
+                        st.session_state.current_date = day_date
+                        st.session_state.page = "📈 Trading Review"
+                        st.rerun()
+
+        # Weekly total column - SAME HEIGHT as calendar days
+        week_color = "green" if week_pnl > 0 else "red" if week_pnl < 0 else "gray"
+        week_cols[7].markdown(f'''
+        <div style="border: 2px solid {week_color}; padding: 10px; height: 80px; 
+                    background: rgba({'0,255,0' if week_pnl > 0 else '255,0,0' if week_pnl < 0 else '128,128,128'}, 0.1);
+                    text-align: center; display: flex; flex-direction: column; justify-content: center; border-radius: 5px;">
+            <strong style="color: {week_color};">Week Total</strong><br>
+            <span style="color: {week_color}; font-size: 1.2em;">${week_pnl:.2f}</span>
+        </div>
+        ''', unsafe_allow_html=True)
+
+    # Legend
+    st.markdown("---")
+    st.markdown("**Legend:**")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown("🟢 Good Process (80%+ rule compliance)")
+    with col2:
+        st.markdown("🔴 Poor Process (<80% rule compliance)")
+    with col3:
+        st.markdown("⚪ No trading data")
+    with col4:
+        st.markdown("💡 **Click View/Add to edit entries**")
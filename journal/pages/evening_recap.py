@@ -0,0 +1,76 @@
+"""Evening Recap page: personal reflection outside of trading."""
+
+import streamlit as st
+
+from journal.risk import evaluate_from
+from journal.storage import save_local_data
+
+
+def render(ctx):
+    """Render the page for the selected date"""
+    data, selected_date, date_key = ctx.data, ctx.selected_date, ctx.date_key
+    st.markdown('<div class="section-header">🌙 Evening Life Recap</div>', unsafe_allow_html=True)
+
+    # Show current date and delete option
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.markdown(f"### 📅 {selected_date.strftime('%A, %B %d, %Y')}")
+    with col2:
+        if st.button("🗑️ Delete Entry", key="delete_evening", help="Delete all data for this date"):
+            if date_key in data:
+                del data[date_key]
+                evaluate_from(data, date_key)
+                save_local_data(data)
+                st.success("Entry deleted!")
+                st.rerun()
+
+    _recap_form(ctx)
+
+
+@st.fragment
+def _recap_form(ctx):
+    data, current_entry = ctx.data, ctx.current_entry
+
+    st.subheader("Personal Reflection")
+    st.write("Reflect on your day as a person, father, and husband")
+
+    personal_recap = st.text_area(
+        "How was your day outside of trading?",
+        value=current_entry['evening'].get('personal_recap', ""),
+        height=200,
+        help="Reflect on family time, personal goals, relationships, and overall well-being"
+    )
+
+    family_highlights = st.text_area(
+        "Family Highlights",
+        value=current_entry['evening'].get('family_highlights', ""),
+        height=150,
+        help="Special moments with family, conversations with spouse/children"
+    )
+
+    personal_wins = st.text_area(
+        "Personal Wins & Growth",
+        value=current_entry['evening'].get('personal_wins', ""),
+        height=150,
+        help="Non-trading accomplishments, personal development, habits"
+    )
+
+    tomorrow_intentions = st.text_area(
+        "Intentions for Tomorrow",
+        value=current_entry['evening'].get('tomorrow_intentions', ""),
+        height=150,
+        help="How do you want to show up as a person, father, and husband tomorrow?"
+    )
+
+    # Save evening data
+    if st.button("💾 Save Evening Recap", type="primary"):
+        current_entry['evening'] = {
+            'personal_recap': personal_recap,
+            'family_highlights': family_highlights,
+            'personal_wins': personal_wins,
+            'tomorrow_intentions': tomorrow_intentions
+        }
+
+        # Save to GitHub and local
+        save_local_data(data)
+        st.success("✅ Evening recap saved!")
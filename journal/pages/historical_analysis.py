@@ -0,0 +1,373 @@
+"""Historical Analysis page: period metrics and detailed entries."""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from journal.entries import get_date_key
+from journal.figures import daily_pnl_figure, equity_drawdown_figure, excursion_figure
+from journal.perf import timed_import
+from journal.reconcile import day_pnl, has_day_pnl
+from journal.rules import compliance_rate
+from journal.ui import display_image_full_size
+
+
+def render(ctx):
+    """Render the page for the selected date"""
+    st.markdown('<div class="section-header">📚 Historical Analysis</div>', unsafe_allow_html=True)
+
+    _analysis(ctx)
+    _bar_import()
+
+
+@st.fragment
+def _analysis(ctx):
+    """Date range, period metrics and entries; re-analysing only reruns this region"""
+    data = ctx.data
+
+    # Date range selector
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input(
+            "Start Date",
+            value=date.today() - timedelta(days=30),
+            max_value=date.today()
+        )
+    with col2:
+        end_date = st.date_input(
+            "End Date",
+            value=date.today(),
+            max_value=date.today()
+        )
+
+    if st.button("📊 Analyze Period"):
+        # Filter data for date range
+        filtered_data = {}
+        current_date = start_date
+        while current_date <= end_date:
+            date_key = get_date_key(current_date)
+            if date_key in data:
+                filtered_data[date_key] = data[date_key]
+            current_date += timedelta(days=1)
+
+        if filtered_data:
+            # Calculate statistics
+            total_pnl = 0
+            process_compliance_days = 0
+            total_trading_days = 0
+            profitable_days = 0
+            daily_pnls = []
+
+            for date_key, entry in filtered_data.items():
+                if has_day_pnl(entry):
+                    pnl = day_pnl(entry)
+                    total_pnl += pnl
+                    daily_pnls.append(pnl)
+                    total_trading_days += 1
+
+                    if pnl > 0:
+                        profitable_days += 1
+
+                    # Check process compliance
+                    day_compliance = compliance_rate(entry['trading'])
+                    if day_compliance is not None and day_compliance >= 0.8:
+                        process_compliance_days += 1
+
+            # Display metrics
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                st.metric("Total P&L", f"${total_pnl:.2f}")
+
+            with col2:
+                avg_pnl = total_pnl / total_trading_days if total_trading_days > 0 else 0
+                st.metric("Average Daily P&L", f"${avg_pnl:.2f}")
+
+            with col3:
+                process_rate = (process_compliance_days / total_trading_days * 100) if total_trading_days > 0 else 0
+                st.metric("Process Success Rate", f"{process_rate:.1f}%")
+
+            with col4:
+                win_rate = (profitable_days / total_trading_days * 100) if total_trading_days > 0 else 0
+                st.metric("Win Rate", f"{win_rate:.1f}%")
+
+            # P&L Chart
+            if daily_pnls:
+                dates = list(filtered_data.keys())
+                pnls = [day_pnl(filtered_data[d]) for d in dates]
+
+                st.plotly_chart(daily_pnl_figure(dates, pnls), use_container_width=True)
+
+            _performance_analytics(ctx, start_date, end_date)
+            _excursions(ctx, start_date, end_date)
+            _rule_adherence(ctx, start_date, end_date)
+
+            # Detailed entries
+            st.subheader("Detailed Entries")
+
+            for date_key in sorted(filtered_data.keys(), reverse=True):
+                entry = filtered_data[date_key]
+
+                with st.expander(f"📅 {date_key}"):
+                    # Morning Section
+                    if entry['morning']:
+                        st.markdown("### 🌅 Morning Preparation")
+                        morning = entry['morning']
+
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            if 'sleep_quality' in morning:
+                                st.write(f"**Sleep Quality:** {morning['sleep_quality']}/10")
+                            if 'emotional_state' in morning:
+                                st.write(f"**Emotional State:** {morning['emotional_state']}")
+                            if 'market_news' in morning and morning['market_news']:
+                                st.write(f"**Market News:** {morning['market_news']}")
+
+                        with col2:
+                            if 'daily_goal' in morning and morning['daily_goal']:
+                                st.write(f"**Daily Goal:** {morning['daily_goal']}")
+                            if 'trading_process' in morning and morning['trading_process']:
+                                st.write(f"**Trading Process:** {morning['trading_process']}")
+
+                        # Morning Screenshots
+                        morning_screenshots = morning.get('morning_screenshots', [])
+                        if morning_screenshots:
+                            st.write("**Morning Screenshots:**")
+                            for j, screenshot_data in enumerate(morning_screenshots):
+                                screenshot_caption = screenshot_data['caption'] or f"Morning Screenshot {j+1}"
+                                st.write(f"*{screenshot_caption}:*")
+                                display_image_full_size(screenshot_data['url'], screenshot_caption)
+
+                    # Trade Day Section
+                    trade_day = entry['trade_day']
+                    if trade_day['market_observations'] or trade_day['trades']:
+                        st.markdown("### 📈 Trade Day")
+
+                        if trade_day['market_observations']:
+                            st.write(f"**Market Observations:** {trade_day['market_observations']}")
+
+                        # Display trades
+                        trades = trade_day['trades']
+                        if trades:
+                            st.write(f"**Trades ({len(trades)}):**")
+                            for k, trade in enumerate(trades):
+                                outcome = trade['outcome']
+                                outcome_colors = {
+                                    'win': 'green',
+                                    'loss': 'red',
+                                    'break-even': 'orange',
+                                    'pending': 'gray'
+                                }
+                                outcome_icons = {
+                                    'win': '✅',
+                                    'loss': '❌',
+                                    'break-even': '➖',
+                                    'pending': '⏳'
+                                }
+
+                                color = outcome_colors.get(outcome, 'gray')
+                                icon = outcome_icons.get(outcome, '❓')
+
+                                # Create tags display
+                                tags_html = ""
+                                for tag in trade['tags']:
+                                    tags_html += f'<span class="tag-chip">{tag}</span>'
+
+                                st.markdown(f"""
+                                <div class="trade-card">
+                                    <strong>Trade {k+1} - {trade.get('timestamp', 'Unknown Time').split(' ')[1]}</strong>
+                                    <span style="color: {color}; float: right;">{icon} {outcome.upper()}</span>
+                                    <br>
+                                    <strong>Description:</strong> {trade.get('description', 'No description')[:100]}{'...' if len(trade.get('description', '')) > 100 else ''}
+                                    <br>
+                                    <strong>Tags:</strong> {tags_html}
+                                </div>
+                                """, unsafe_allow_html=True)
+
+                                # Display trade screenshot if exists
+                                if trade['screenshot']:
+                                    st.write(f"*{trade['screenshot']['caption']}:*")
+                                    display_image_full_size(trade['screenshot']['url'], trade['screenshot']['caption'])
+
+                    # Trading Section
+                    if entry['trading']:
+                        st.markdown("### 📈 Trading Review")
+                        trading = entry['trading']
+
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            if 'pnl' in trading:
+                                pnl = trading['pnl']
+                                pnl_color = "green" if pnl > 0 else "red" if pnl < 0 else "gray"
+                                st.markdown(f"**P&L:** <span style='color: {pnl_color}'>${pnl:.2f}</span>", unsafe_allow_html=True)
+                            if 'process_grade' in trading:
+                                st.write(f"**Process Grade:** {trading['process_grade']}")
+
+                        with col2:
+                            if 'grade_reasoning' in trading and trading['grade_reasoning']:
+                                st.write(f"**Grade Reasoning:** {trading['grade_reasoning']}")
+                            if 'general_comments' in trading and trading['general_comments']:
+                                st.write(f"**General Comments:** {trading['general_comments']}")
+
+                        # Trading Screenshots
+                        trading_screenshots = trading.get('trading_screenshots', [])
+                        if trading_screenshots:
+                            st.write("**Trading Screenshots:**")
+                            for j, screenshot_data in enumerate(trading_screenshots):
+                                screenshot_caption = screenshot_data['caption'] or f"Trading Screenshot {j+1}"
+                                st.write(f"*{screenshot_caption}:*")
+                                display_image_full_size(screenshot_data['url'], screenshot_caption)
+
+                    # Evening Section
+                    if entry['evening']:
+                        st.markdown("### 🌙 Evening Recap")
+                        evening = entry['evening']
+
+                        if 'personal_recap' in evening and evening['personal_recap']:
+                            st.write(f"**Personal Recap:** {evening['personal_recap']}")
+                        if 'family_highlights' in evening and evening['family_highlights']:
+                            st.write(f"**Family Highlights:** {evening['family_highlights']}")
+        else:
+            st.info("No trading data found for the selected date range.")
+
+
+def _format_ratio(value):
+    return "—" if value != value else "∞" if value == float('inf') else f"{value:.2f}"
+
+
+def _performance_analytics(ctx, start_date, end_date):
+    """Drawdown, expectancy, profit factor, R-multiples, Sharpe/Sortino and streaks"""
+    analytics = timed_import("journal.analytics")
+    stats = analytics.period_analytics(ctx.data, ctx.revision, start_date, end_date)
+
+    st.subheader("📐 Performance Analytics")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Max Drawdown", f"${stats['max_drawdown']:,.2f}", delta=f"{stats['max_drawdown_pct']:.1f}%" if stats['max_drawdown_pct'] else None)
+    with col2:
+        st.metric("Drawdown Duration", f"{stats['max_drawdown_days']} days")
+    with col3:
+        st.metric("Expectancy / Trade", f"${stats['expectancy']:,.2f}")
+    with col4:
+        st.metric("Profit Factor", _format_ratio(stats['profit_factor']))
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Avg Win", f"${stats['avg_win']:,.2f}")
+    with col2:
+        st.metric("Avg Loss", f"${stats['avg_loss']:,.2f}")
+    with col3:
+        st.metric("Avg R-Multiple", _format_ratio(stats['avg_r']), help=f"{stats['trades_with_r']} trades with a planned stop")
+    with col4:
+        st.metric("Sharpe / Sortino", f"{_format_ratio(stats['sharpe'])} / {_format_ratio(stats['sortino'])}", help="Annualized, from daily returns on the account balance")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Longest Win Streak", stats['longest_win_streak'])
+    with col2:
+        st.metric("Longest Loss Streak", stats['longest_loss_streak'])
+    with col3:
+        current = stats['current_streak']
+        st.metric("Current Streak", f"{abs(current)}{'W' if current > 0 else 'L'}" if current else "0")
+    with col4:
+        st.metric("Trades with P&L", f"{stats['trades_with_pnl']} / {stats['trades']}")
+
+    equity = stats['equity']
+    if len(equity) > 1:
+        st.plotly_chart(equity_drawdown_figure(equity, stats['drawdown']), use_container_width=True)
+
+
+def _excursions(ctx, start_date, end_date):
+    """MAE/MFE of imported trades that have market data in the local bar store"""
+    analytics = timed_import("journal.analytics")
+    market_data = timed_import("journal.market_data")
+    trades = analytics.excursion_frame(ctx.data, ctx.revision, market_data.BarStore().revision())
+    trades = trades[(trades['date'] >= pd.Timestamp(start_date)) & (trades['date'] <= pd.Timestamp(end_date))]
+
+    st.subheader("📐 MAE / MFE")
+    if trades.empty:
+        st.caption("No imported trades in this period have market data. Import bar or tick exports for their "
+                   "symbols under *Market Data* below to see how far each trade went against and for you.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Avg MAE", f"${trades['mae_usd'].mean():,.2f}", help=f"{trades['mae'].mean():.2f} points")
+    with col2:
+        st.metric("Avg MFE", f"${trades['mfe_usd'].mean():,.2f}", help=f"{trades['mfe'].mean():.2f} points")
+    with col3:
+        efficiency = trades['efficiency'].mean()
+        st.metric("Avg Efficiency", "—" if efficiency != efficiency else f"{efficiency:.0%}",
+                  help="Realized points / MFE: the share of the best open move that was kept")
+    with col4:
+        minutes = trades['time_in_trade'].mean().total_seconds() / 60
+        st.metric("Avg Time in Trade", f"{minutes:.1f} min")
+
+    st.plotly_chart(excursion_figure(trades), use_container_width=True)
+    st.caption(f"{len(trades)} trades with market data.")
+
+
+@st.fragment
+def _bar_import():
+    """Import bar or tick exports into the local market data store"""
+    market_data = timed_import("journal.market_data")
+    store = market_data.BarStore()
+
+    with st.expander("📈 Market Data"):
+        symbols = store.symbols()
+        if symbols:
+            st.caption("Stored: " + ", ".join(f"{symbol} ({len(store.months(symbol))} months)" for symbol in symbols))
+        files = st.file_uploader(
+            "Bar or tick exports (CSV/TSV)",
+            type=['txt', 'csv', 'tsv'],
+            accept_multiple_files=True,
+            help="Date/Time (or DateTime), Open, High, Low, Close/Last and Volume columns, times on the trade log's clock",
+            key="bar_import"
+        )
+        symbol = st.text_input("Symbol", help="As in the trade log, e.g. F.US.MNQU25", key="bar_import_symbol")
+
+        if files and symbol and st.button("📥 Import Market Data"):
+            rows = 0
+            for bar_file in files:
+                try:
+                    rows += store.ingest(symbol.strip(), market_data.read_bar_file(bar_file))
+                except ValueError as e:
+                    st.error(f"❌ {bar_file.name}: {e}")
+            if rows:
+                st.success(f"✅ Imported {rows:,} bars for {symbol.strip()}")
+
+
+def _rule_adherence(ctx, start_date, end_date):
+    """Per-rule adherence and the P&L difference between following and breaking it"""
+    analytics = timed_import("journal.analytics")
+    report = analytics.rule_adherence(ctx.data, ctx.revision, start_date, end_date)
+
+    st.subheader("📏 Rule Adherence")
+    if report.empty:
+        st.info("No rule compliance recorded in this period.")
+        return
+
+    st.dataframe(
+        report.rename(columns={
+            'rule': 'Rule',
+            'days': 'Days',
+            'followed': 'Followed',
+            'broken': 'Broken',
+            'adherence': 'Adherence',
+            'pnl_followed': 'Avg P&L Followed',
+            'pnl_broken': 'Avg P&L Broken',
+            'pnl_impact': 'P&L Impact',
+            'pnl_on_broken_days': 'P&L on Broken Days',
+        }).style.format({
+            'Adherence': "{:.0%}",
+            'Avg P&L Followed': "${:,.2f}",
+            'Avg P&L Broken': "${:,.2f}",
+            'P&L Impact': "${:,.2f}",
+            'P&L on Broken Days': "${:,.2f}",
+        }, na_rep="—"),
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption("P&L Impact is the average daily P&L on days a rule was followed minus days it was broken.")
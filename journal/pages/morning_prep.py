@@ -0,0 +1,327 @@
+"""Morning Prep page: personal check-in, screenshots, goals and rules."""
+
+from datetime import datetime
+
+import streamlit as st
+
+from journal.risk import evaluate_from
+from journal.rules import add_rule, find_rule, get_rule_registry, get_rule_text, update_rule_text
+from journal.storage import save_local_data, save_uploaded_file_local
+from journal.ui import display_image_full_size
+
+# What "Add Rule" used to register before the rule had any text
+PLACEHOLDER_RULE = "New rule - click to edit"
+
+
+def render(ctx):
+    """Render the page for the selected date"""
+    data, selected_date, date_key = ctx.data, ctx.selected_date, ctx.date_key
+    st.markdown('<div class="section-header">🌅 Morning Preparation</div>', unsafe_allow_html=True)
+
+    # Show current date and delete option
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.markdown(f"### 📅 {selected_date.strftime('%A, %B %d, %Y')}")
+    with col2:
+        if st.button("🗑️ Delete Entry", key="delete_morning", help="Delete all data for this date"):
+            if date_key in data:
+                del data[date_key]
+                evaluate_from(data, date_key)
+                save_local_data(data)
+                st.success("Entry deleted!")
+                st.rerun()
+
+    _prep_form(ctx)
+
+
+@st.fragment
+def _prep_form(ctx):
+    """Check-in, goals and rules; edits only rerun this form"""
+    data, current_entry = ctx.data, ctx.current_entry
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Personal Check-in")
+
+        sleep_quality = st.slider(
+            "Sleep Quality (1-10)",
+            1, 10,
+            value=current_entry['morning'].get('sleep_quality', 7),
+            key="sleep_quality"
+        )
+
+        emotional_state = st.selectbox(
+            "Emotional State",
+            ["Calm & Focused", "Excited", "Anxious", "Stressed", "Tired", "Confident", "Uncertain"],
+            index=["Calm & Focused", "Excited", "Anxious", "Stressed", "Tired", "Confident", "Uncertain"].index(
+                current_entry['morning'].get('emotional_state', "Calm & Focused")
+            )
+        )
+
+        post_night_shift = st.checkbox(
+            "Post Night Shift?",
+            value=current_entry['morning'].get('post_night_shift', False)
+        )
+
+        checked_news = st.checkbox(
+            "Checked News & Market Events?",
+            value=current_entry['morning'].get('checked_news', False)
+        )
+
+        # Market News text box
+        market_news = st.text_area(
+            "Market News & Events for Today",
+            value=current_entry['morning'].get('market_news', ""),
+            height=100,
+            placeholder="Add any relevant news, economic data, or market events..."
+        )
+
+        triggers_present = st.text_area(
+            "Any triggers/reasons why you shouldn't trade today?",
+            value=current_entry['morning'].get('triggers_present', ""),
+            height=100
+        )
+
+        grateful_for = st.text_area(
+            "What are you grateful for today?",
+            value=current_entry['morning'].get('grateful_for', ""),
+            height=100
+        )
+
+        _morning_screenshots(ctx)
+
+    with col2:
+        st.subheader("Trading Goals & Rules")
+
+        daily_goal = st.text_area(
+            "Daily Trading Goal",
+            value=current_entry['morning'].get('daily_goal', ""),
+            height=100
+        )
+
+        trading_process = st.text_area(
+            "Trading Process Focus",
+            value=current_entry['morning'].get('trading_process', ""),
+            height=200
+        )
+
+        _rules_editor(ctx)
+
+    # Save morning data
+    if st.button("💾 Save Morning Prep", type="primary"):
+        current_entry['morning'] = {
+            'sleep_quality': sleep_quality,
+            'emotional_state': emotional_state,
+            'post_night_shift': post_night_shift,
+            'checked_news': checked_news,
+            'market_news': market_news,
+            'triggers_present': triggers_present,
+            'grateful_for': grateful_for,
+            'daily_goal': daily_goal,
+            'trading_process': trading_process,
+            'morning_screenshots': current_entry['morning'].get('morning_screenshots', [])
+        }
+
+        # Save to GitHub and local
+        save_local_data(data)
+        st.success("✅ Morning prep saved!")
+
+
+@st.fragment
+def _morning_screenshots(ctx):
+    data, date_key, current_entry = ctx.data, ctx.date_key, ctx.current_entry
+
+    # Screenshot upload for morning prep WITH CAPTIONS
+    st.subheader("📸 Morning Screenshots")
+
+    # Ensure screenshots array exists
+    current_entry['morning'].setdefault('morning_screenshots', [])
+
+    # Use a unique key based on the number of existing screenshots to avoid conflicts
+    existing_morning_count = len(current_entry['morning'].get('morning_screenshots', []))
+    morning_upload_key = f"morning_screenshot_{date_key}_{existing_morning_count}"
+
+    morning_screenshot = st.file_uploader(
+        "Upload market analysis, news, or prep screenshots",
+        type=['png', 'jpg', 'jpeg'],
+        key=morning_upload_key,
+        help="Select an image file to upload"
+    )
+
+    # Handle immediate upload when file is selected
+    if morning_screenshot is not None:
+        # Use a unique caption key as well
+        morning_caption_key = f"morning_caption_{date_key}_{existing_morning_count}"
+
+        # Caption input
+        morning_caption = st.text_input(
+            "Screenshot Caption",
+            placeholder="Describe this screenshot...",
+            key=morning_caption_key
+        )
+
+        # Upload button with unique key
+        morning_upload_btn_key = f"upload_morning_btn_{date_key}_{existing_morning_count}"
+
+        if st.button("📤 Upload Screenshot", key=morning_upload_btn_key):
+            if not morning_caption.strip():
+                st.warning("⚠️ Please add a caption for your screenshot!")
+            else:
+                # Get existing screenshots
+                morning_screenshots = current_entry['morning'].get('morning_screenshots', [])
+
+                success = False
+                if st.session_state.get('github_connected', False):
+                    # Upload to GitHub
+                    try:
+                        file_data = morning_screenshot.getvalue()
+                        timestamp = int(datetime.now().timestamp())
+                        filename = f"morning_{timestamp}_{morning_screenshot.name}"
+                        screenshot_url = st.session_state.github_storage.upload_screenshot(
+                            file_data, filename, date_key
+                        )
+                        if screenshot_url:
+                            # Save as dict with URL and caption
+                            morning_screenshots.append({
+                                'url': screenshot_url,
+                                'caption': morning_caption
+                            })
+                            success = True
+                            st.success(f"✅ Screenshot '{morning_caption}' uploaded to GitHub!")
+                        else:
+                            st.error("❌ Failed to upload screenshot to GitHub")
+                    except Exception as e:
+                        st.error(f"❌ GitHub upload error: {str(e)}")
+                else:
+                    # Save locally
+                    try:
+                        screenshot_path = save_uploaded_file_local(morning_screenshot, date_key, "morning")
+                        if screenshot_path:
+                            morning_screenshots.append({
+                                'url': screenshot_path,
+                                'caption': morning_caption
+                            })
+                            success = True
+                            st.success(f"✅ Screenshot '{morning_caption}' saved locally!")
+                        else:
+                            st.error("❌ Failed to save screenshot locally")
+                    except Exception as e:
+                        st.error(f"❌ Local save error: {str(e)}")
+
+                if success:
+                    # Update the entry
+                    current_entry['morning']['morning_screenshots'] = morning_screenshots
+
+                    # Save immediately
+                    try:
+                        save_local_data(data)
+                        st.success("📝 Entry updated successfully!")
+                    except Exception as e:
+                        st.error(f"❌ Save error: {str(e)}")
+
+                    # Force rerun to refresh the page and clear the upload
+                    st.rerun()
+
+    # Display existing morning screenshots
+    existing_morning_screenshots = current_entry['morning'].get('morning_screenshots', [])
+    if existing_morning_screenshots:
+        st.markdown("**Uploaded Screenshots:**")
+
+        for i, screenshot_data in enumerate(existing_morning_screenshots):
+            screenshot_link = screenshot_data['url']
+            screenshot_caption = screenshot_data['caption'] or f"Morning Screenshot {i+1}"
+            col_img, col_delete = st.columns([4, 1])
+            with col_img:
+                st.markdown(f"**{screenshot_caption}:**")
+                display_image_full_size(screenshot_link, screenshot_caption)
+            with col_delete:
+                delete_morning_key = f"delete_morning_img_{date_key}_{i}"
+                if st.button("🗑️", key=delete_morning_key, help="Delete this screenshot"):
+                    # Remove screenshot
+                    current_entry['morning']['morning_screenshots'].pop(i)
+
+                    # Save immediately
+                    try:
+                        save_local_data(data)
+                        st.success("Screenshot deleted!")
+                    except Exception as e:
+                        st.error(f"Error deleting screenshot: {str(e)}")
+                    st.rerun()
+
+
+@st.fragment
+def _rules_editor(ctx):
+    data, date_key, current_entry = ctx.data, ctx.date_key, ctx.current_entry
+
+    st.subheader("Trading Rules")
+
+    # Display existing rules
+    # Keep track of rules to delete
+    rules_to_delete = []
+
+    for i, rule_id in enumerate(current_entry['rules']):
+        col_rule, col_delete = st.columns([4, 1])
+        with col_rule:
+            new_rule_value = st.text_input(
+                f"Rule {i+1}",
+                value=get_rule_text(data, rule_id),
+                key=f"rule_{rule_id}",
+                placeholder="Enter your trading rule here...",
+                help="Rewording a rule changes it on every day that uses it"
+            )
+            # Update the rule in real-time
+            if new_rule_value.strip() and new_rule_value.strip() != get_rule_text(data, rule_id):
+                update_rule_text(data, rule_id, new_rule_value)
+        with col_delete:
+            if st.button("❌", key=f"delete_rule_{rule_id}"):
+                rules_to_delete.append(i)
+
+    # Remove deleted rules (in reverse order to maintain indices)
+    for i in reversed(rules_to_delete):
+        current_entry['rules'].pop(i)
+        # Save immediately
+        save_local_data(data)
+        st.rerun()
+
+    # Rules from other days, so the same rule keeps one identity across the journal
+    # (older versions registered a placeholder on every "Add Rule" click: those are left out)
+    saved_rules = [rule for rule in get_rule_registry(data)
+                   if rule['id'] not in current_entry['rules'] and rule['text'] != PLACEHOLDER_RULE]
+    if saved_rules:
+        col_saved, col_add_saved = st.columns([4, 1])
+        with col_saved:
+            saved_rule = st.selectbox(
+                "Saved rules",
+                saved_rules,
+                format_func=lambda rule: rule['text'],
+                index=None,
+                placeholder="Reuse a rule from another day..."
+            )
+        with col_add_saved:
+            st.write("")
+            if st.button("➕ Add", key="add_saved_rule", disabled=saved_rule is None):
+                current_entry['rules'].append(saved_rule['id'])
+                # Save immediately
+                save_local_data(data)
+                st.rerun()
+
+    # A rule is registered once it has text; the same text as a saved rule reuses it
+    col_new, col_add_new = st.columns([4, 1])
+    with col_new:
+        new_rule = st.text_input("New rule", key="new_rule_text", placeholder="Enter your trading rule here...")
+    with col_add_new:
+        st.write("")
+        if st.button("➕ Add Rule"):
+            if not new_rule.strip():
+                st.warning("Enter the rule first")
+                return
+            rule_id = find_rule(data, new_rule)
+            if rule_id is None:
+                rule_id = add_rule(data, new_rule, created=date_key)
+            if rule_id not in current_entry['rules']:
+                current_entry['rules'].append(rule_id)
+            # Save immediately
+            save_local_data(data)
+            del st.session_state.new_rule_text
+            st.rerun()
@@ -0,0 +1,89 @@
+"""Psychology page: how sleep, emotion, night shifts and news relate to results."""
+
+import streamlit as st
+
+from journal.figures import factor_pnl_figure
+from journal.perf import timed_import
+
+
+def render(ctx):
+    """Render the page for the selected date"""
+    st.markdown('<div class="section-header">🧠 Psychology & Performance</div>', unsafe_allow_html=True)
+
+    _dashboard(ctx)
+
+
+@st.fragment
+def _dashboard(ctx):
+    """Grouped stats with bootstrap CIs and regression coefficients"""
+    psychology = timed_import("journal.psychology")
+    frame = psychology.psychology_frame(ctx.data, ctx.revision)
+
+    if frame.empty:
+        st.info("No reviewed trading days yet. Fill in Morning Prep and Trading Review to see how your state relates to your results.")
+        return
+
+    report = psychology.psychology_report(frame)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Reviewed Days", len(frame))
+    with col2:
+        st.metric("With Morning Check-in", int(frame['emotional_state'].notna().sum()))
+    with col3:
+        st.metric("Avg Compliance", f"{frame['compliance'].mean():.0%}" if frame['compliance'].notna().any() else "—")
+    with col4:
+        st.metric("Avg Process Grade", f"{frame['grade_score'].mean():.2f}" if frame['grade_score'].notna().any() else "—")
+
+    factor = st.selectbox("Group by", list(psychology.FACTORS), format_func=psychology.FACTORS.get)
+    groups = report['groups'][factor]
+
+    if groups.empty:
+        st.info(f"No days with {psychology.FACTORS[factor].lower()} recorded.")
+    else:
+        st.plotly_chart(factor_pnl_figure(groups, psychology.FACTORS[factor]), use_container_width=True)
+
+        table = groups.rename(columns={
+            'days': 'Days',
+            'total_pnl': 'Total P&L',
+            'mean_pnl': 'Mean P&L',
+            'median_pnl': 'Median P&L',
+            'win_day_rate': 'Green Days',
+            'compliance': 'Compliance',
+            'grade_score': 'Grade',
+            'ci_low': 'CI Low',
+            'ci_high': 'CI High',
+        })
+        st.dataframe(
+            table.style.format({
+                'Total P&L': "${:,.2f}",
+                'Mean P&L': "${:,.2f}",
+                'Median P&L': "${:,.2f}",
+                'CI Low': "${:,.2f}",
+                'CI High': "${:,.2f}",
+                'Green Days': "{:.0%}",
+                'Compliance': "{:.0%}",
+                'Grade': "{:.2f}",
+            }, na_rep="—"),
+            use_container_width=True
+        )
+        if groups['days'].min() < 5:
+            st.caption("Groups with fewer than 5 days have wide or missing intervals; treat them as anecdotes.")
+
+    st.subheader("📉 Regression")
+    outcome = st.radio("Outcome", list(psychology.OUTCOMES), format_func=psychology.OUTCOMES.get, horizontal=True)
+    coefficients, r_squared, observations = report['regressions'][outcome]
+
+    if coefficients.empty:
+        st.info("Need at least 3 days with a complete morning check-in to fit a regression.")
+        return
+
+    st.caption(f"OLS on {observations} days, R² = {r_squared:.2f}. Emotional states are compared against the most common one.")
+    st.dataframe(
+        coefficients.rename(columns={'coefficient': 'Coefficient', 'std_error': 'Std Error', 't': 't'})
+        .style.format("{:,.3f}", na_rep="—"),
+        use_container_width=True
+    )
+
+    with st.expander("Joined data"):
+        st.dataframe(frame, use_container_width=True, hide_index=True)
@@ -0,0 +1,67 @@
+"""Reports page: weekly and monthly HTML/PDF reports to download."""
+
+import streamlit as st
+
+from journal.perf import timed_import
+from journal.ui import rerun_fragment
+
+
+def render(ctx):
+    """Render the page for the selected date"""
+    st.markdown('<div class="section-header">📄 Reports</div>', unsafe_allow_html=True)
+
+    _report_builder(ctx)
+
+
+@st.fragment
+def _report_builder(ctx):
+    """Period and format pickers; reports build in the background while the app stays usable"""
+    reports = timed_import("journal.reports")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        kind = st.radio("Period", list(reports.PERIODS), format_func=reports.PERIODS.get, horizontal=True,
+                        key="report_kind")
+    with col2:
+        static_images = reports.static_images_available()
+        fmt = st.radio("Format", reports.FORMATS, format_func=str.upper, horizontal=True, key="report_format",
+                       disabled=not static_images)
+        if not static_images:
+            fmt = 'html'
+            st.caption("PDF reports and static charts need the kaleido package (`pip install kaleido`).")
+
+    periods = reports.recent_periods(ctx.data, kind)
+    current = reports.default_period_start(kind, ctx.selected_date)
+    if current not in periods:
+        periods = sorted(periods + [current], reverse=True)
+    start = st.selectbox("Report for", periods, index=periods.index(current),
+                         format_func=lambda start: reports.period_label(kind, start), key=f"report_period_{kind}")
+
+    future = reports.cached_report(ctx.revision, kind, start, fmt)
+    if future is None:
+        if st.button("📄 Build Report", key="build_report"):
+            reports.request_report(ctx.data, ctx.revision, kind, start, fmt)
+            rerun_fragment()
+        return
+
+    if not future.done():
+        _wait_for_report(future)
+    elif future.exception() is not None:
+        st.error(f"❌ Could not build the report: {future.exception()}")
+    else:
+        st.download_button(
+            f"⬇️ Download {reports.period_label(kind, start)} ({fmt.upper()})",
+            data=future.result(),
+            file_name=reports.report_filename(kind, start, fmt),
+            mime='application/pdf' if fmt == 'pdf' else 'text/html',
+            key="download_report"
+        )
+        st.caption("The report is reused until the journal changes.")
+
+
+@st.fragment(run_every=1)
+def _wait_for_report(future):
+    """Polls the background build and reruns the builder once the report is ready"""
+    if future.done():
+        st.rerun()
+    st.info("⏳ Building report…")
@@ -0,0 +1,199 @@
+"""Tag Management page: tag statistics and the global tag list."""
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from journal.entries import add_tag_to_system, get_all_tags, get_trade_statistics
+from journal.schema import iter_days
+from journal.storage import save_local_data
+
+
+def render(ctx):
+    """Render the page for the selected date"""
+    st.markdown('<div class="section-header">🏷️ Tag Management & Statistics</div>', unsafe_allow_html=True)
+
+    _tag_statistics(ctx.data)
+    _manage_tags(ctx)
+
+
+def _tag_statistics(data):
+    """Overall trade stats, per-tag performance and recent trades"""
+    # Get trade statistics
+    trade_stats = get_trade_statistics(data)
+
+    if trade_stats:
+        # Overall statistics
+        st.subheader("📊 Overall Trade Statistics")
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Trades", trade_stats['total_trades'])
+        with col2:
+            st.metric("Win Rate", f"{trade_stats['win_rate']:.1f}%")
+        with col3:
+            st.metric("Wins", trade_stats['win_trades'], delta=None)
+        with col4:
+            st.metric("Losses", trade_stats['loss_trades'], delta=None)
+
+        # Tag statistics table
+        st.subheader("🏷️ Tag Performance")
+
+        if trade_stats['tag_counts']:
+            # Create DataFrame for tag statistics
+            tag_data = []
+            for tag, counts in trade_stats['tag_counts'].items():
+                completed = counts['wins'] + counts['losses']
+                win_rate = (counts['wins'] / completed * 100) if completed > 0 else 0
+
+                tag_data.append({
+                    'Tag': tag,
+                    'Total Trades': counts['total'],
+                    'Wins': counts['wins'],
+                    'Losses': counts['losses'],
+                    'Pending': counts['total'] - completed,
+                    'Win Rate %': f"{win_rate:.1f}%"
+                })
+
+            # Sort by total trades
+            tag_df = pd.DataFrame(tag_data)
+            tag_df = tag_df.sort_values('Total Trades', ascending=False)
+
+            st.dataframe(tag_df, use_container_width=True, hide_index=True)
+
+            # Tag performance chart
+            if len(tag_data) > 0:
+                # Filter tags with at least one completed trade for the chart
+                chart_data = [t for t in tag_data if t['Wins'] + t['Losses'] > 0]
+
+                if chart_data:
+                    fig = go.Figure()
+
+                    tags = [t['Tag'] for t in chart_data]
+                    win_rates = [float(t['Win Rate %'].replace('%', '')) for t in chart_data]
+                    total_trades = [t['Total Trades'] for t in chart_data]
+
+                    # Color bars by win rate
+                    colors = ['green' if wr >= 60 else 'orange' if wr >= 40 else 'red' for wr in win_rates]
+
+                    fig.add_trace(go.Bar(
+                        x=tags,
+                        y=win_rates,
+                        marker_color=colors,
+                        text=[f"{wr:.1f}%<br>({tt} trades)" for wr, tt in zip(win_rates, total_trades)],
+                        textposition='auto',
+                        name="Win Rate"
+                    ))
+
+                    fig.update_layout(
+                        title="Tag Performance by Win Rate",
+                        xaxis_title="Tags",
+                        yaxis_title="Win Rate (%)",
+                        template="plotly_dark",
+                        showlegend=False
+                    )
+
+                    # Add horizontal line at 50%
+                    fig.add_hline(y=50, line_dash="dash", line_color="gray", 
+                                 annotation_text="Break-even line")
+
+                    st.plotly_chart(fig, use_container_width=True)
+
+        # Recent trades
+        st.subheader("📈 Recent Trades")
+        recent_trades = trade_stats.get('recent_trades', [])[:5]
+
+        for trade in recent_trades:
+            outcome_colors = {
+                'win': 'green',
+                'loss': 'red',
+                'pending': 'orange'
+            }
+            outcome_icons = {
+                'win': '✅',
+                'loss': '❌',
+                'pending': '⏳'
+            }
+
+            color = outcome_colors.get(trade.get('outcome', 'pending'), 'gray')
+            icon = outcome_icons.get(trade.get('outcome', 'pending'), '❓')
+
+            # Create tags display
+            tags_html = ""
+            for tag in trade.get('tags', []):
+                tags_html += f'<span class="tag-chip">{tag}</span>'
+
+            st.markdown(f"""
+            <div class="trade-card">
+                <strong>{trade.get('date', 'Unknown Date')} - {trade.get('timestamp', 'Unknown Time').split(' ')[1]}</strong>
+                <span style="color: {color}; float: right;">{icon} {trade.get('outcome', 'pending').upper()}</span>
+                <br>
+                <strong>Description:</strong> {trade.get('description', 'No description')[:100]}{'...' if len(trade.get('description', '')) > 100 else ''}
+                <br>
+                <strong>Tags:</strong> {tags_html}
+            </div>
+            """, unsafe_allow_html=True)
+
+
+@st.fragment
+def _manage_tags(ctx):
+    """Delete existing tags or add new ones to the global list"""
+    data = ctx.data
+
+    # Tag management
+    st.markdown("---")
+    st.subheader("🛠️ Manage Tags")
+
+    all_tags = get_all_tags(data)
+
+    if all_tags:
+        st.write(f"**Current tags ({len(all_tags)}):**")
+
+        # Display all tags with delete option
+        for tag in all_tags:
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.markdown(f'<span class="tag-chip">{tag}</span>', unsafe_allow_html=True)
+            with col2:
+                if st.button("🗑️", key=f"delete_tag_{tag}", help=f"Delete tag '{tag}'"):
+                    # Remove tag from system
+                    data['tags'].remove(tag)
+
+                    # Remove tag from all trades
+                    for _, entry in iter_days(data):
+                        for trade in entry['trade_day']['trades']:
+                            if tag in trade['tags']:
+                                trade['tags'].remove(tag)
+
+                    # Save changes
+                    save_local_data(data)
+                    st.success(f"Tag '{tag}' deleted from system!")
+                    st.rerun()
+    else:
+        st.info("No tags created yet. Add tags when creating trades.")
+
+    # Add new tags manually
+    st.subheader("➕ Add New Tags")
+    new_tags_manual = st.text_input(
+        "Add tags (comma-separated)",
+        placeholder="momentum, reversal, gap-up, earnings-play",
+        key="manual_tags_input"
+    )
+
+    if st.button("💾 Add Tags", key="add_manual_tags"):
+        if new_tags_manual.strip():
+            tags_to_add = [tag.strip() for tag in new_tags_manual.split(',') if tag.strip()]
+            added_count = 0
+
+            for tag in tags_to_add:
+                if tag not in get_all_tags(data):
+                    data = add_tag_to_system(data, tag)
+                    added_count += 1
+
+            if added_count > 0:
+                # Save changes
+                save_local_data(data)
+                st.success(f"Added {added_count} new tags!")
+                st.rerun()
+            else:
+                st.info("All tags already exist in the system.")
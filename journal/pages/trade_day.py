@@ -0,0 +1,850 @@
+"""Trade Day page: trade log import, market observations and per-trade entries."""
+
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from journal.entries import add_tag_to_system, create_day_entry, create_new_trade, get_all_tags
+from journal.importer import merge_trades, sessions_in
+from journal.perf import timed_import
+from journal.reconcile import get_commission_per_contract, reconcile_days
+from journal.risk import (RISK_RULES, day_breaches, evaluate_from, get_risk_settings, parse_news_times, record_trade,
+                          save_risk_settings)
+from journal.sessions import SessionCalendar, save_session_settings
+from journal.storage import save_local_data, save_uploaded_file_local
+from journal.tailer import live_tailer, read_state, start_live_capture, stop_live_capture
+from journal.trade_log import group_fills_into_trades, parse_trade_log
+from journal.ui import display_image_full_size, rerun_fragment
+
+
+SESSION_TIMEZONES = ["America/New_York", "America/Chicago", "America/Denver", "America/Los_Angeles",
+                     "Europe/London", "Europe/Berlin", "Asia/Tokyo", "Australia/Sydney", "UTC"]
+
+
+def render(ctx):
+    """Render the page for the selected date"""
+    data, selected_date, date_key, current_entry = ctx.data, ctx.selected_date, ctx.date_key, ctx.current_entry
+    st.markdown('<div class="section-header">📈 Live Trade Day</div>', unsafe_allow_html=True)
+
+    # Show current date and delete option
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.markdown(f"### 📅 {selected_date.strftime('%A, %B %d, %Y')}")
+    with col2:
+        if st.button("🗑️ Delete Entry", key="delete_trade_day", help="Delete all trade day data for this date"):
+            current_entry['trade_day'] = create_day_entry()['trade_day']
+            evaluate_from(data, date_key)
+            save_local_data(data)
+            st.success("Trade day entry deleted!")
+            st.rerun()
+
+    # Trades the live capture saved before this run are in ``data``; the live panel counts those after
+    tailer = live_tailer()
+    st.session_state.live_saved_seen = tailer.saved if tailer is not None else 0
+
+    _live_capture(ctx)
+    _risk_limits(ctx)
+    _trade_log_import(ctx)
+    _market_observations(ctx)
+    _add_trade(ctx)
+    _todays_trades(ctx)
+
+
+def _session_calendar_settings(data, date_key, current_entry, calendar):
+    """Time zone of the broker log and the exchange's session roll"""
+    with st.expander("🕔 Session Calendar"):
+        st.caption("Fills after the roll time (exchange clock) count toward the next trading day, "
+                   "e.g. CME Globex rolls at 17:00 Central.")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            log_timezone = st.selectbox(
+                "Log time zone",
+                SESSION_TIMEZONES,
+                index=SESSION_TIMEZONES.index(calendar.log_timezone) if calendar.log_timezone in SESSION_TIMEZONES else 0,
+                help="The time zone your trading platform writes timestamps in"
+            )
+        with col2:
+            exchange_timezone = st.selectbox(
+                "Exchange time zone",
+                SESSION_TIMEZONES,
+                index=SESSION_TIMEZONES.index(calendar.exchange_timezone) if calendar.exchange_timezone in SESSION_TIMEZONES else 0
+            )
+        with col3:
+            roll_time = st.time_input("Session roll time", value=datetime.strptime(calendar.roll_time, "%H:%M").time())
+
+        if st.button("💾 Save Session Calendar"):
+            save_session_settings(data, log_timezone, exchange_timezone, roll_time.strftime("%H:%M"))
+            save_local_data(data)
+            st.success("Session calendar saved!")
+
+
+@st.fragment
+def _trade_log_import(ctx):
+    """Broker log upload and review of the parsed trades"""
+    data, date_key, current_entry = ctx.data, ctx.date_key, ctx.current_entry
+
+    # NEW: Trade Log Import Section
+    st.subheader("📁 Import Trades from Log")
+
+    calendar = SessionCalendar.from_settings(data)
+    _session_calendar_settings(data, date_key, current_entry, calendar)
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        trade_log_file = st.file_uploader(
+            "Upload trade log file (CSV/TSV)",
+            type=['txt', 'csv', 'tsv'],
+            help="Upload your broker's trade log to automatically create trade entries",
+            key="trade_log_import"
+        )
+
+        if trade_log_file:
+            st.info("💡 This will parse your trade log and create individual trade entries that you can enhance with tags and screenshots.")
+
+    with col2:
+        if trade_log_file and st.button("🔄 Parse & Import Trades", type="primary"):
+            file_content = trade_log_file.read().decode('utf-8')
+            fills_data, error = parse_trade_log(file_content)
+
+            if error:
+                st.error(f"Error parsing file: {error}")
+            else:
+                # Group fills into individual trades
+                individual_trades = group_fills_into_trades(fills_data)
+
+                if individual_trades:
+                    # Add to session state for bulk editing
+                    st.session_state.imported_trades = individual_trades
+                    st.success(f"✅ Parsed {len(fills_data)} fills into {len(individual_trades)} individual trades!")
+                    st.info("👇 Review and enhance your trades below, then save all at once.")
+                    rerun_fragment()
+                else:
+                    st.warning("No complete trades found in the log file.")
+
+    # NEW: Bulk Edit Imported Trades
+    if st.session_state.get('imported_trades'):
+        st.markdown("---")
+        st.subheader("✏️ Review & Enhance Imported Trades")
+
+        imported_trades = st.session_state.imported_trades
+
+        # Show summary
+        total_pnl = sum(trade.get('pnl', 0) for trade in imported_trades)
+        winners = len([t for t in imported_trades if t.get('pnl', 0) > 0])
+        losers = len([t for t in imported_trades if t.get('pnl', 0) < 0])
+
+        st.markdown(f"""
+        <div class="import-summary">
+            <h4>📊 Import Summary</h4>
+            <strong>Total Trades:</strong> {len(imported_trades)} | 
+            <strong>Total P&L:</strong> ${total_pnl:.2f} | 
+            <strong>Winners:</strong> {winners} | 
+            <strong>Losers:</strong> {losers}
+        </div>
+        """, unsafe_allow_html=True)
+
+        # Bulk actions
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            # Bulk tag application
+            all_tags = get_all_tags(data)
+            bulk_tags = st.multiselect(
+                "Apply tags to all trades",
+                options=all_tags,
+                key="bulk_tags_select"
+            )
+
+            bulk_new_tags = st.text_input(
+                "New tags for all (comma-separated)",
+                placeholder="session-tag, market-condition",
+                key="bulk_new_tags"
+            )
+
+        with col2:
+            if st.button("🏷️ Apply Bulk Tags"):
+                new_tags = []
+                if bulk_new_tags.strip():
+                    new_tags = [tag.strip() for tag in bulk_new_tags.split(',') if tag.strip()]
+
+                combined_tags = bulk_tags + new_tags
+
+                for trade in imported_trades:
+                    existing_tags = trade.get('tags', [])
+                    trade['tags'] = list(set(existing_tags + combined_tags))
+
+                # Add new tags to system
+                for tag in new_tags:
+                    data = add_tag_to_system(data, tag)
+
+                st.success(f"Applied {len(combined_tags)} tags to all trades!")
+                rerun_fragment()
+
+        # A log can cover several sessions (overnight Globex, a week-long export)
+        sessions = sessions_in(imported_trades, calendar)
+        split_sessions = False
+        if list(sessions) != [date_key]:
+            st.info("📅 These trades belong to " + ", ".join(
+                f"**{key}** ({count})" if key else f"**{date_key}** ({count} with unreadable timestamps)"
+                for key, count in sessions.items()))
+            split_sessions = st.radio(
+                "Save trades to",
+                [True, False],
+                format_func=lambda split: "Each trade's session date" if split else f"All to {date_key}",
+                horizontal=True,
+                key="import_split_sessions"
+            )
+
+        with col3:
+            if st.button("💾 Save All Trades to Trade Day", type="primary"):
+                # Add imported trades to their days; trades already saved (same fills) are merged, not duplicated
+                added, updated, skipped = merge_trades(data, imported_trades,
+                                                       date_key=None if split_sessions else date_key,
+                                                       calendar=calendar, fallback_date_key=date_key)
+                summary = (f"{sum(added.values())} added, {sum(updated.values())} merged, "
+                           f"{sum(skipped.values())} already saved")
+
+                # Save
+                save_local_data(data)
+                st.success(f"✅ Trades saved! ({summary})")
+
+                # Clear imported trades
+                del st.session_state.imported_trades
+                st.rerun()
+
+        # Individual trade editing
+        st.markdown("### 📝 Individual Trade Details")
+
+        for i, trade in enumerate(imported_trades):
+            with st.expander(f"Trade {i+1}: {trade['description']}", expanded=False):
+                col1, col2 = st.columns([2, 1])
+
+                with col1:
+                    # Editable description
+                    new_description = st.text_area(
+                        "Description",
+                        value=trade['description'],
+                        height=80,
+                        key=f"import_desc_{i}"
+                    )
+                    trade['description'] = new_description
+
+                    # Screenshot upload
+                    screenshot_file = st.file_uploader(
+                        "Add screenshot",
+                        type=['png', 'jpg', 'jpeg'],
+                        key=f"import_screenshot_{i}"
+                    )
+
+                    if screenshot_file:
+                        screenshot_caption = st.text_input(
+                            "Screenshot caption",
+                            key=f"import_caption_{i}"
+                        )
+
+                        if st.button(f"📤 Upload", key=f"upload_import_{i}"):
+                            if screenshot_caption.strip():
+                                # Handle screenshot upload
+                                screenshot_data = None
+                                if st.session_state.get('github_connected', False):
+                                    file_data = screenshot_file.getvalue()
+                                    timestamp = int(datetime.now().timestamp())
+                                    filename = f"imported_trade_{timestamp}_{screenshot_file.name}"
+                                    screenshot_url = st.session_state.github_storage.upload_screenshot(
+                                        file_data, filename, date_key
+                                    )
+                                    if screenshot_url:
+                                        screenshot_data = {'url': screenshot_url, 'caption': screenshot_caption}
+                                else:
+                                    screenshot_path = save_uploaded_file_local(screenshot_file, date_key, "imported_trade")
+                                    if screenshot_path:
+                                        screenshot_data = {'url': screenshot_path, 'caption': screenshot_caption}
+
+                                if screenshot_data:
+                                    trade['screenshot'] = screenshot_data
+                                    st.success("Screenshot added!")
+                                    rerun_fragment()
+
+                with col2:
+                    # Tags for this specific trade
+                    trade_tags = st.multiselect(
+                        "Tags",
+                        options=all_tags,
+                        default=trade.get('tags', []),
+                        key=f"import_tags_{i}"
+                    )
+
+                    trade_new_tags = st.text_input(
+                        "New tags",
+                        placeholder="specific, setup-type",
+                        key=f"import_new_tags_{i}"
+                    )
+
+                    if trade_new_tags.strip():
+                        new_tags = [tag.strip() for tag in trade_new_tags.split(',') if tag.strip()]
+                        trade_tags.extend(new_tags)
+                        for tag in new_tags:
+                            data = add_tag_to_system(data, tag)
+
+                    trade['tags'] = list(set(trade_tags))
+
+                    # Outcome adjustment
+                    new_outcome = st.selectbox(
+                        "Outcome",
+                        options=["win", "loss", "pending"],
+                        index=["win", "loss", "pending"].index(trade.get('outcome', 'pending')),
+                        format_func=lambda x: {"win": "✅ Win", "loss": "❌ Loss", "pending": "⏳ Pending"}[x],
+                        key=f"import_outcome_{i}"
+                    )
+                    trade['outcome'] = new_outcome
+
+                    # Show trade details
+                    pnl_color = "green" if trade.get('pnl', 0) > 0 else "red" if trade.get('pnl', 0) < 0 else "gray"
+                    st.markdown(f"**P&L:** <span style='color: {pnl_color}; font-weight: bold;'>${trade.get('pnl', 0):.2f}</span>", unsafe_allow_html=True)
+                    st.markdown(f"**Symbol:** {trade.get('symbol', 'N/A')}")
+                    st.markdown(f"**Direction:** {trade.get('direction', 'N/A')}")
+
+        # Cancel import
+        if st.button("❌ Cancel Import"):
+            del st.session_state.imported_trades
+            rerun_fragment()
+
+
+@st.fragment
+def _live_capture(ctx):
+    """Follow the platform's trade log and add trades as they close"""
+    tailer = live_tailer()
+
+    with st.expander("📡 Live Capture", expanded=tailer is not None):
+        st.caption("Follow your platform's trade activity log (e.g. Sierra Chart's) during the session: "
+                   "each trade is added to its session day within a second of the closing fill.")
+        log_path = st.text_input(
+            "Trade log file",
+            value=tailer.path if tailer else read_state().get('path', ''),
+            placeholder="C:/SierraChart/SavedTradeActivity/TradeActivityLog.txt",
+            key="live_log_path"
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("▶️ Start", disabled=not log_path.strip() or (tailer is not None and tailer.path == log_path.strip())):
+                start_live_capture(log_path.strip(), SessionCalendar.from_settings(ctx.data))
+                st.rerun()
+        with col2:
+            if tailer is not None and st.button("⏹️ Stop"):
+                stop_live_capture()
+                st.rerun()
+
+    if tailer is not None:
+        _live_panel(ctx, tailer)
+
+
+@st.fragment
+def _risk_limits(ctx):
+    """The journal's risk rules, checked against every trade as it is added"""
+    data = ctx.data
+    risk_settings = get_risk_settings(data)
+
+    with st.expander("🛡️ Risk Limits"):
+        st.caption("Checked against each trade as it is added or imported; breaches are shown in the "
+                   "Trading Review next to your rule checkboxes. 0 = no limit.")
+        col1, col2 = st.columns(2)
+        with col1:
+            daily_loss_limit = st.number_input(
+                "Daily loss limit ($)",
+                min_value=0.0,
+                value=float(risk_settings['daily_loss_limit']),
+                step=50.0,
+                format="%.2f",
+                key="daily_loss_limit"
+            )
+            max_trades_per_day = st.number_input(
+                "Max trades per day",
+                min_value=0,
+                value=int(risk_settings['max_trades_per_day']),
+                step=1,
+                key="max_trades_per_day"
+            )
+            news_times = st.text_input(
+                "News times (HH:MM)",
+                value=", ".join(risk_settings['news_times']),
+                placeholder="08:30, 10:00",
+                help="On the trade log's clock",
+                key="news_times"
+            )
+        with col2:
+            trailing_drawdown = st.number_input(
+                "Trailing drawdown ($)",
+                min_value=0.0,
+                value=float(risk_settings['trailing_drawdown']),
+                step=100.0,
+                format="%.2f",
+                help="From the balance's high-water mark",
+                key="trailing_drawdown"
+            )
+            max_contracts = st.number_input(
+                "Max contracts per trade",
+                min_value=0,
+                value=int(risk_settings['max_contracts']),
+                step=1,
+                key="max_contracts"
+            )
+            news_window_minutes = st.number_input(
+                "Minutes around news",
+                min_value=0,
+                value=int(risk_settings['news_window_minutes']),
+                step=1,
+                key="news_window_minutes"
+            )
+
+        if st.button("💾 Save Risk Limits"):
+            try:
+                parsed_news_times = parse_news_times(news_times)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                return
+            save_risk_settings(data, daily_loss_limit, trailing_drawdown, max_trades_per_day, max_contracts,
+                               parsed_news_times, news_window_minutes)
+            # Breaches recorded under the old limits no longer apply
+            evaluate_from(data, "")
+            save_local_data(data)
+            st.success("Risk limits saved!")
+
+
+@st.fragment(run_every=0.5)
+def _live_panel(ctx, tailer):
+    """Live P&L from the tailer's in-memory session
+
+    Refreshes only itself: trades the tailer saved since the page's last run
+    are counted here and reach the trade list when the user asks for it.
+    """
+    live = tailer.live_snapshot(get_commission_per_contract(ctx.data), get_risk_settings(ctx.data)['daily_loss_limit'])
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Realized P&L", f"${live['realized']:,.2f}", help="Net of commission")
+    with col2:
+        st.metric("Unrealized P&L", f"${live['unrealized']:,.2f}", help="Open positions at their last fill price")
+    with col3:
+        st.metric("Trades", live['trades'])
+    with col4:
+        streak = live['streak']
+        st.metric("Streak", f"{abs(streak)}{'W' if streak > 0 else 'L'}" if streak else "0")
+    with col5:
+        left = live['loss_limit_left']
+        st.metric("Loss Limit Left", "—" if left is None else f"${left:,.2f}",
+                  delta="limit hit" if left is not None and left <= 0 else None, delta_color="inverse",
+                  help="Daily loss limit plus today's realized and unrealized P&L")
+
+    status = f"📡 Following `{os.path.basename(tailer.path)}`"
+    if live['session']:
+        status += f" · session {live['session']}"
+    if live['positions']:
+        status += " · open: " + ", ".join(f"{symbol} {quantity:+g}" for symbol, quantity in live['positions'].items())
+    st.caption(status)
+    session = live['session']
+    if session in tailer.breaches:
+        breaches = tailer.breaches[session]
+    else:
+        breaches = (day_breaches(ctx.data[session]) or []) if session in ctx.data else []
+    for breach in breaches:
+        st.error(f"🛡️ {RISK_RULES[breach['rule']]}: {breach['detail']} ({breach['time']})")
+
+    new_trades = tailer.saved - st.session_state.get('live_saved_seen', tailer.saved)
+    if new_trades > 0:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.info(f"📥 {new_trades} new trade{'s' if new_trades != 1 else ''} saved to the journal")
+        with col2:
+            if st.button("🔄 Show in trade list", key="live_show_trades"):
+                st.rerun()
+    if tailer.error:
+        st.warning(f"⚠️ {tailer.error}")
+    if live['recent_fills']:
+        st.dataframe(pd.DataFrame(live['recent_fills'], columns=['Time', 'Symbol', 'Side', 'Qty', 'Price']),
+                     use_container_width=True, hide_index=True, height=150)
+
+
+@st.fragment
+def _market_observations(ctx):
+    """Free-text market observations for the day"""
+    data, current_entry = ctx.data, ctx.current_entry
+
+    # Market Observations Section
+    if not st.session_state.get('imported_trades'):  # Only show if not importing
+        st.markdown("---")
+
+    st.subheader("🔍 Market Observations")
+    market_observations = st.text_area(
+        "What do you see in the markets today?",
+        value=current_entry['trade_day'].get('market_observations', ''),
+        height=150,
+        placeholder="Market conditions, trends, key levels, news impact, volume patterns, sector rotation, etc.",
+        key="market_observations"
+    )
+
+    # Save market observations
+    if st.button("💾 Save Market Observations", key="save_observations"):
+        current_entry['trade_day']['market_observations'] = market_observations
+
+        save_local_data(data)
+        st.success("✅ Market observations saved!")
+
+    st.markdown("---")
+
+
+@st.fragment
+def _add_trade(ctx):
+    """Manual trade entry form"""
+    data, date_key, current_entry = ctx.data, ctx.date_key, ctx.current_entry
+
+    # Add New Trade Section (Manual Entry)
+    st.subheader("➕ Add New Trade (Manual Entry)")
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        # Trade description
+        trade_description = st.text_area(
+            "Trade Description",
+            placeholder="Describe your trade setup, entry reasoning, target, stop loss, etc.",
+            height=100,
+            key="new_trade_description"
+        )
+
+        # Screenshot upload for trade
+        trade_screenshot = st.file_uploader(
+            "Trade Screenshot",
+            type=['png', 'jpg', 'jpeg'],
+            help="Upload entry chart, setup screenshot, or other relevant image",
+            key="new_trade_screenshot"
+        )
+
+        screenshot_caption = ""
+        if trade_screenshot:
+            screenshot_caption = st.text_input(
+                "Screenshot Caption",
+                placeholder="Describe this screenshot...",
+                key="new_trade_screenshot_caption"
+            )
+
+    with col2:
+        # Tags section
+        st.markdown("**Tags:**")
+
+        # Get existing tags
+        all_tags = get_all_tags(data)
+
+        # Multi-select for existing tags
+        selected_tags = st.multiselect(
+            "Select existing tags",
+            options=all_tags,
+            key="trade_tags_select"
+        )
+
+        # Add new tags
+        new_tags_input = st.text_input(
+            "Add new tags (comma-separated)",
+            placeholder="scalp, breakout, TSLA",
+            key="new_tags_input"
+        )
+
+        # Parse new tags
+        new_tags = []
+        if new_tags_input.strip():
+            new_tags = [tag.strip() for tag in new_tags_input.split(',') if tag.strip()]
+
+        # Combine all tags
+        all_trade_tags = selected_tags + new_tags
+
+        # Trade outcome
+        trade_outcome = st.selectbox(
+            "Trade Outcome",
+            options=["pending", "win", "loss"],
+            format_func=lambda x: {
+                "pending": "⏳ Pending", 
+                "win": "✅ Win", 
+                "loss": "❌ Loss"
+            }[x],
+            key="trade_outcome"
+        )
+
+    # Add trade button
+    if st.button("🚀 Add Trade", type="primary", key="add_trade"):
+        if not trade_description.strip():
+            st.warning("⚠️ Please add a trade description!")
+        else:
+            # Handle screenshot upload
+            screenshot_data = None
+            if trade_screenshot and screenshot_caption.strip():
+                if st.session_state.get('github_connected', False):
+                    # Upload to GitHub
+                    file_data = trade_screenshot.getvalue()
+                    timestamp = int(datetime.now().timestamp())
+                    filename = f"trade_{timestamp}_{trade_screenshot.name}"
+                    screenshot_url = st.session_state.github_storage.upload_screenshot(
+                        file_data, filename, date_key
+                    )
+                    if screenshot_url:
+                        screenshot_data = {'url': screenshot_url, 'caption': screenshot_caption}
+                else:
+                    # Save locally
+                    screenshot_path = save_uploaded_file_local(trade_screenshot, date_key, "trade")
+                    if screenshot_path:
+                        screenshot_data = {'url': screenshot_path, 'caption': screenshot_caption}
+
+            # Add new tags to system
+            for tag in new_tags:
+                data = add_tag_to_system(data, tag)
+
+            # Create trade
+            new_trade = create_new_trade(
+                trade_description, 
+                all_trade_tags, 
+                trade_outcome, 
+                screenshot_data
+            )
+
+            # Add trade to current entry
+            current_entry['trade_day']['trades'].append(new_trade)
+            reconcile_days(data, [date_key])
+            record_trade(data, date_key, new_trade)
+            current_entry['trade_day']['market_observations'] = st.session_state.get(
+                "market_observations", current_entry['trade_day'].get('market_observations', '')
+            )
+
+            # Save
+            save_local_data(data)
+            st.success("✅ Trade added and saved!")
+
+            # Clear the form by rerunning
+            st.rerun()
+
+    st.markdown("---")
+
+
+@st.fragment
+def _todays_trades(ctx):
+    """Trades recorded for the day, with inline edit"""
+    data, date_key, current_entry = ctx.data, ctx.date_key, ctx.current_entry
+
+    # Display Existing Trades for Today
+    existing_trades = current_entry['trade_day'].get('trades', [])
+
+    if existing_trades:
+        st.subheader(f"📋 Today's Trades ({len(existing_trades)})")
+
+        if any(trade.get('raw_fills') for trade in existing_trades):
+            replay = timed_import("journal.replay")
+            store = replay.BarStore()
+            bar_symbols = set(store.symbols())
+        else:
+            bar_symbols = set()
+
+        for i, trade in enumerate(existing_trades):
+            with st.expander(f"Trade {i+1}: {trade['description'][:50]}..." if len(trade['description']) > 50 else f"Trade {i+1}: {trade['description']}"):
+
+                # Check if this trade is being edited
+                edit_key = f"edit_trade_{trade['id']}"
+                is_editing = st.session_state.get(edit_key, False)
+
+                if not is_editing:
+                    # Display mode
+                    col1, col2 = st.columns([3, 1])
+
+                    with col1:
+                        st.markdown(f"**Time:** {trade['timestamp']}")
+                        st.markdown(f"**Description:** {trade['description']}")
+
+                        # Display tags
+                        if trade.get('tags'):
+                            tags_html = ""
+                            for tag in trade['tags']:
+                                tags_html += f'<span class="tag-chip">{tag}</span>'
+                            st.markdown(f"**Tags:** {tags_html}", unsafe_allow_html=True)
+                        else:
+                            st.markdown("**Tags:** None")
+
+                        # Display outcome with styling
+                        outcome = trade.get('outcome', 'pending')
+                        outcome_colors = {
+                            'win': ('#00ff00', '✅'),
+                            'loss': ('#ff0000', '❌'), 
+                            'pending': ('#ffff00', '⏳')
+                        }
+                        color, icon = outcome_colors.get(outcome, ('#ffffff', '❓'))
+                        st.markdown(f"**Outcome:** <span style='color: {color}; font-weight: bold;'>{icon} {outcome.upper()}</span>", unsafe_allow_html=True)
+
+                        # Display screenshot if exists
+                        if trade.get('screenshot'):
+                            st.markdown(f"**Screenshot:** {trade['screenshot']['caption']}")
+                            display_image_full_size(trade['screenshot']['url'], trade['screenshot']['caption'])
+
+                        if bar_symbols and replay.can_replay(trade, bar_symbols) and st.toggle("📈 Replay", key=f"replay_{trade['id']}"):
+                            fig = replay.replay_figure(trade, store.revision())
+                            if fig is None:
+                                st.caption("No stored bars around this trade's fills.")
+                            else:
+                                st.plotly_chart(fig, use_container_width=True, key=f"replay_chart_{trade['id']}")
+
+                    with col2:
+                        # Edit button
+                        if st.button(f"✏️ Edit", key=f"start_edit_{trade['id']}"):
+                            st.session_state[edit_key] = True
+                            rerun_fragment()
+
+                        # Quick outcome update (kept for convenience)
+                        new_outcome = st.selectbox(
+                            "Quick Update Outcome",
+                            options=["pending", "win", "loss"],
+                            index=["pending", "win", "loss"].index(outcome),
+                            format_func=lambda x: {"pending": "⏳ Pending", "win": "✅ Win", "loss": "❌ Loss"}[x],
+                            key=f"outcome_update_{trade['id']}"
+                        )
+
+                        if new_outcome != outcome:
+                            if st.button(f"💾 Update", key=f"update_outcome_{trade['id']}"):
+                                trade['outcome'] = new_outcome
+
+                                # Save updated trade
+                                save_local_data(data)
+                                st.success("Trade outcome updated!")
+                                st.rerun()
+
+                        # Delete trade button
+                        if st.button(f"🗑️ Delete", key=f"delete_trade_{trade['id']}"):
+                            current_entry['trade_day']['trades'].pop(i)
+                            reconcile_days(data, [date_key])
+                            evaluate_from(data, date_key)
+
+                            save_local_data(data)
+                            st.success("Trade deleted!")
+                            st.rerun()
+
+                else:
+                    # Edit mode
+                    st.markdown("### ✏️ **Edit Trade**")
+
+                    with st.form(key=f"edit_trade_form_{trade['id']}"):
+                        col1, col2 = st.columns([2, 1])
+
+                        with col1:
+                            # Editable description
+                            edit_description = st.text_area(
+                                "Trade Description",
+                                value=trade.get('description', ''),
+                                height=100,
+                                key=f"edit_desc_{trade['id']}"
+                            )
+
+                            # Screenshot caption editing (if screenshot exists)
+                            edit_screenshot_caption = ""
+                            if trade.get('screenshot'):
+                                edit_screenshot_caption = st.text_input(
+                                    "Screenshot Caption",
+                                    value=trade['screenshot'].get('caption', ''),
+                                    key=f"edit_caption_{trade['id']}"
+                                )
+
+                                # Show current screenshot
+                                st.markdown("**Current Screenshot:**")
+                                display_image_full_size(trade['screenshot']['url'], trade['screenshot']['caption'])
+
+                        with col2:
+                            # Get current tags for editing
+                            current_tags = trade.get('tags', [])
+                            all_tags = get_all_tags(data)
+
+                            # Multi-select for existing tags (pre-select current tags)
+                            edit_selected_tags = st.multiselect(
+                                "Select existing tags",
+                                options=all_tags,
+                                default=current_tags,
+                                key=f"edit_tags_select_{trade['id']}"
+                            )
+
+                            # Add new tags
+                            edit_new_tags_input = st.text_input(
+                                "Add new tags (comma-separated)",
+                                placeholder="scalp, breakout, TSLA",
+                                key=f"edit_new_tags_{trade['id']}"
+                            )
+
+                            # Parse new tags
+                            edit_new_tags = []
+                            if edit_new_tags_input.strip():
+                                edit_new_tags = [tag.strip() for tag in edit_new_tags_input.split(',') if tag.strip()]
+
+                            # Combine all tags
+                            edit_all_trade_tags = edit_selected_tags + edit_new_tags
+
+                            # Trade outcome
+                            edit_trade_outcome = st.selectbox(
+                                "Trade Outcome",
+                                options=["pending", "win", "loss"],
+                                index=["pending", "win", "loss"].index(trade.get('outcome', 'pending')),
+                                format_func=lambda x: {
+                                    "pending": "⏳ Pending", 
+                                    "win": "✅ Win", 
+                                    "loss": "❌ Loss"
+                                }[x],
+                                key=f"edit_outcome_{trade['id']}"
+                            )
+
+                            # Planned stop, used for R-multiples in Historical Analysis
+                            edit_stop_price = st.number_input(
+                                "Planned Stop Price",
+                                min_value=0.0,
+                                value=float(trade.get('stop_price') or 0.0),
+                                format="%.2f",
+                                help="Leave at 0 if no stop was planned",
+                                key=f"edit_stop_{trade['id']}"
+                            )
+
+                        # Form buttons
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            save_changes = st.form_submit_button("💾 Save Changes", type="primary")
+                        with col2:
+                            cancel_edit = st.form_submit_button("❌ Cancel")
+
+                        if save_changes:
+                            if not edit_description.strip():
+                                st.error("⚠️ Trade description cannot be empty!")
+                            else:
+                                # Add new tags to system
+                                for tag in edit_new_tags:
+                                    data = add_tag_to_system(data, tag)
+
+                                # Update the trade
+                                trade['description'] = edit_description
+                                trade['tags'] = edit_all_trade_tags
+                                trade['outcome'] = edit_trade_outcome
+                                trade['stop_price'] = edit_stop_price or None
+
+                                # Update screenshot caption if it exists
+                                if trade.get('screenshot') and edit_screenshot_caption.strip():
+                                    trade['screenshot']['caption'] = edit_screenshot_caption
+
+                                # Save changes
+                                try:
+                                    save_local_data(data)
+                                    st.success("✅ Trade updated and saved!")
+
+                                    # Exit edit mode
+                                    st.session_state[edit_key] = False
+                                    st.rerun()
+
+                                except Exception as e:
+                                    # Stay in edit mode so the changes can be saved again
+                                    st.error("❌ Error saving changes; the trade was not saved")
+                                    st.exception(e)
+
+                        if cancel_edit:
+                            # Exit edit mode without saving
+                            st.session_state[edit_key] = False
+                            rerun_fragment()
+    else:
+        st.info("No trades recorded for today. Add your first trade above or import from a trade log!")
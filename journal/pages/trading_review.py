@@ -0,0 +1,294 @@
+"""Trading Review page: daily P&L, process grade and rule compliance."""
+
+from datetime import datetime
+
+import streamlit as st
+
+from journal.reconcile import PNL_TOLERANCE, derived_totals
+from journal.risk import RISK_RULES, RiskEngine, day_breaches, evaluate_from
+from journal.rules import get_rule_text, is_followed, to_bits
+from journal.storage import save_local_data, save_uploaded_file_local
+from journal.ui import display_image_full_size
+
+
+def render(ctx):
+    """Render the page for the selected date"""
+    data, selected_date, date_key = ctx.data, ctx.selected_date, ctx.date_key
+    st.markdown('<div class="section-header">📈 Post-Trading Review</div>', unsafe_allow_html=True)
+
+    # Show current date and delete option
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.markdown(f"### 📅 {selected_date.strftime('%A, %B %d, %Y')}")
+    with col2:
+        if st.button("🗑️ Delete Entry", key="delete_trading", help="Delete all data for this date"):
+            if date_key in data:
+                del data[date_key]
+                evaluate_from(data, date_key)
+                save_local_data(data)
+                st.success("Entry deleted!")
+                st.rerun()
+
+    _review_form(ctx)
+
+
+@st.fragment
+def _review_form(ctx):
+    """P&L, grade, compliance and reflection; edits only rerun this form"""
+    data, date_key, current_entry = ctx.data, ctx.date_key, ctx.current_entry
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Performance Metrics")
+
+        # Days with imported trades get their P&L from the trades (see journal/reconcile.py)
+        totals = derived_totals(current_entry)
+        if totals:
+            st.metric("P&L from Trades", f"${totals['net_pnl']:,.2f}")
+            st.caption(f"Gross ${totals['gross_pnl']:,.2f} − fees ${totals['fees']:,.2f} "
+                       f"over {totals['priced_trades']} trades ({totals['contracts']:g} contracts)")
+
+        pnl = st.number_input(
+            "P&L for the Day ($)",
+            value=float(current_entry['trading'].get('pnl', totals['net_pnl'] if totals else 0.0)),
+            format="%.2f",
+            help="Balance and statistics use the P&L from the day's trades when it has imported trades; "
+                 "this figure is used on days without them"
+        )
+        if totals and abs(pnl - totals['net_pnl']) >= PNL_TOLERANCE:
+            difference = pnl - totals['net_pnl']
+            st.warning(f"⚠️ ${abs(difference):,.2f} {'above' if difference > 0 else 'below'} the P&L of the day's trades")
+
+        process_grade = st.selectbox(
+            "Grade Your Process (A-F)",
+            ["A", "B", "C", "D", "F"],
+            index=["A", "B", "C", "D", "F"].index(
+                current_entry['trading'].get('process_grade', "A")
+            )
+        )
+
+        grade_reasoning = st.text_area(
+            "Why did you grade yourself this way?",
+            value=current_entry['trading'].get('grade_reasoning', ""),
+            height=100
+        )
+
+        general_comments = st.text_area(
+            "General comments on the trading day",
+            value=current_entry['trading'].get('general_comments', ""),
+            height=100
+        )
+
+        screenshot_notes = st.text_area(
+            "Screenshot/Entry Notes",
+            value=current_entry['trading'].get('screenshot_notes', ""),
+            height=100,
+            help="Describe your entries, exits, and any screenshots you took"
+        )
+
+        _trading_screenshots(ctx)
+
+        # Add some spacing
+        st.markdown("---")
+
+    with col2:
+        st.subheader("Rule Compliance")
+
+        rules_in_force = []
+        rules_followed = []
+        if current_entry['rules']:
+            for rule_id in current_entry['rules']:
+                rule = get_rule_text(data, rule_id)
+                if rule.strip():  # Only show non-empty rules
+                    compliance = st.checkbox(
+                        f"✅ {rule}",
+                        value=is_followed(current_entry['trading'], rule_id),
+                        key=f"compliance_{rule_id}"
+                    )
+                    rules_in_force.append(rule_id)
+                    if compliance:
+                        rules_followed.append(rule_id)
+        else:
+            st.info("No rules set in morning prep. Go to Morning Prep to add rules.")
+
+        _risk_rules(data, current_entry)
+
+        st.subheader("Reflection")
+
+        what_could_improve = st.text_area(
+            "What could you have done better?",
+            value=current_entry['trading'].get('what_could_improve', ""),
+            height=100
+        )
+
+        tomorrow_focus = st.text_area(
+            "What do you want to do better tomorrow?",
+            value=current_entry['trading'].get('tomorrow_focus', ""),
+            height=100
+        )
+
+    # Calculate overall compliance
+    if rules_in_force:
+        compliance_rate = len(rules_followed) / len(rules_in_force) * 100
+        st.metric("Rule Compliance Rate", f"{compliance_rate:.1f}%")
+
+    # Save trading data
+    if st.button("💾 Save Trading Review", type="primary"):
+        current_entry['trading'] = {
+            'pnl': pnl,
+            'process_grade': process_grade,
+            'grade_reasoning': grade_reasoning,
+            'general_comments': general_comments,
+            'screenshot_notes': screenshot_notes,
+            'rule_mask': to_bits(rules_in_force),
+            'rule_bits': to_bits(rules_followed),
+            'what_could_improve': what_could_improve,
+            'tomorrow_focus': tomorrow_focus,
+            'trading_screenshots': current_entry['trading'].get('trading_screenshots', [])
+        }
+        # A manual P&L moves the balance the risk rules track, from this day on
+        evaluate_from(data, date_key)
+
+        save_local_data(data)
+        st.success("✅ Trading review saved!")
+
+
+def _risk_rules(data, current_entry):
+    """The risk limits as the day's trades show them, next to the rules the trader ticked"""
+    engine = RiskEngine.for_journal(data)
+    if not engine.active:
+        return
+    st.markdown("**🛡️ Risk Rules** (checked from trades)")
+    breaches = day_breaches(current_entry)
+    if breaches is None:
+        st.caption("No trades checked for this day.")
+        return
+    for rule in engine.enabled_rules():
+        broken = [breach for breach in breaches if breach['rule'] == rule]
+        if not broken:
+            st.markdown(f"✅ {RISK_RULES[rule]}")
+        for breach in broken:
+            st.markdown(f"❌ {RISK_RULES[rule]}: {breach['detail']} ({breach['time']})")
+
+
+@st.fragment
+def _trading_screenshots(ctx):
+    data, date_key, current_entry = ctx.data, ctx.date_key, ctx.current_entry
+
+    # Screenshot upload for trading WITH CAPTIONS
+    st.subheader("📸 Trading Screenshots")
+
+    # Ensure screenshots array exists
+    current_entry['trading'].setdefault('trading_screenshots', [])
+
+    # Use a unique key based on the number of existing screenshots to avoid conflicts
+    existing_screenshot_count = len(current_entry['trading'].get('trading_screenshots', []))
+    upload_key = f"trading_screenshot_{date_key}_{existing_screenshot_count}"
+
+    trading_screenshot = st.file_uploader(
+        "Upload entry/exit screenshots, charts, or P&L",
+        type=['png', 'jpg', 'jpeg'],
+        key=upload_key,
+        help="Select an image file to upload"
+    )
+
+    # Handle immediate upload when file is selected
+    if trading_screenshot is not None:
+        # Use a unique caption key as well
+        caption_key = f"trading_caption_{date_key}_{existing_screenshot_count}"
+
+        # Caption input
+        trading_caption = st.text_input(
+            "Screenshot Caption",
+            placeholder="Describe this screenshot...",
+            key=caption_key
+        )
+
+        # Upload button with unique key
+        upload_btn_key = f"upload_trading_btn_{date_key}_{existing_screenshot_count}"
+
+        if st.button("📤 Upload Screenshot", key=upload_btn_key):
+            if not trading_caption.strip():
+                st.warning("⚠️ Please add a caption for your screenshot!")
+            else:
+                # Get existing screenshots
+                trading_screenshots = current_entry['trading'].get('trading_screenshots', [])
+
+                success = False
+                if st.session_state.get('github_connected', False):
+                    # Upload to GitHub
+                    try:
+                        file_data = trading_screenshot.getvalue()
+                        timestamp = int(datetime.now().timestamp())
+                        filename = f"trading_{timestamp}_{trading_screenshot.name}"
+                        screenshot_url = st.session_state.github_storage.upload_screenshot(
+                            file_data, filename, date_key
+                        )
+                        if screenshot_url:
+                            # Save as dict with URL and caption
+                            trading_screenshots.append({
+                                'url': screenshot_url,
+                                'caption': trading_caption
+                            })
+                            success = True
+                            st.success(f"✅ Screenshot '{trading_caption}' uploaded to GitHub!")
+                        else:
+                            st.error("❌ Failed to upload screenshot to GitHub")
+                    except Exception as e:
+                        st.error(f"❌ GitHub upload error: {str(e)}")
+                else:
+                    # Save locally
+                    try:
+                        screenshot_path = save_uploaded_file_local(trading_screenshot, date_key, "trading")
+                        if screenshot_path:
+                            trading_screenshots.append({
+                                'url': screenshot_path,
+                                'caption': trading_caption
+                            })
+                            success = True
+                            st.success(f"✅ Screenshot '{trading_caption}' saved locally!")
+                        else:
+                            st.error("❌ Failed to save screenshot locally")
+                    except Exception as e:
+                        st.error(f"❌ Local save error: {str(e)}")
+
+                if success:
+                    # Update the entry
+                    current_entry['trading']['trading_screenshots'] = trading_screenshots
+
+                    # Save immediately
+                    try:
+                        save_local_data(data)
+                        st.success("📝 Entry updated successfully!")
+                    except Exception as e:
+                        st.error(f"❌ Save error: {str(e)}")
+
+                    # Force rerun to refresh the page and clear the upload
+                    st.rerun()
+
+    # Display existing trading screenshots
+    existing_screenshots = current_entry['trading'].get('trading_screenshots', [])
+    if existing_screenshots:
+        st.markdown("**Uploaded Screenshots:**")
+
+        for i, screenshot_data in enumerate(existing_screenshots):
+            screenshot_link = screenshot_data['url']
+            screenshot_caption = screenshot_data['caption'] or f"Trading Screenshot {i+1}"
+            col_img, col_delete = st.columns([4, 1])
+            with col_img:
+                st.markdown(f"**{screenshot_caption}:**")
+                display_image_full_size(screenshot_link, screenshot_caption)
+            with col_delete:
+                delete_key = f"delete_trading_img_{date_key}_{i}"
+                if st.button("🗑️", key=delete_key, help="Delete this screenshot"):
+                    # Remove screenshot
+                    current_entry['trading']['trading_screenshots'].pop(i)
+
+                    # Save immediately
+                    try:
+                        save_local_data(data)
+                        st.success("Screenshot deleted!")
+                    except Exception as e:
+                        st.error(f"Error deleting screenshot: {str(e)}")
+                    st.rerun()
@@ -0,0 +1,255 @@
+"""Startup profiling and span tracing.
+
+The main script records ``time.perf_counter()`` before anything else and
+hands it to :data:`startup`. Because this module stays in ``sys.modules``
+across reruns, the profile describes the first run served by the process:
+how long the imports took, how long each lazily imported page module took,
+and when the first full script run (first paint) completed.
+
+The profile is written once to the ``journal.perf`` logger.
+
+:data:`tracer` records spans for every script run: storage calls,
+analytics, the sidebar sections and each page render are wrapped in
+:func:`span` or decorated with :func:`traced`. Spans nest (a page render
+contains the analytics it calls), keep per-name call counts and timings,
+and the most recent ones are held in a ring buffer that can be exported as
+JSON lines or as an OpenTelemetry (OTLP/JSON) trace file. Set
+``JOURNAL_TRACE_FILE`` to append each run's spans to a JSON lines file, and
+``JOURNAL_PROFILE=1`` to also log a per-run summary.
+"""
+
+import functools
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    def __init__(self):
+        self.t0 = None
+        self.marks = []
+        self.imports = {}
+        self.finished = False
+
+    def start(self, t0):
+        """Anchor the profile at the first script run's start time"""
+        if self.t0 is None:
+            self.t0 = t0
+
+    def mark(self, label):
+        """Record the elapsed time for a startup phase"""
+        if self.t0 is not None and not self.finished:
+            self.marks.append((label, time.perf_counter() - self.t0))
+
+    def record_import(self, module_name, seconds):
+        """Record how long a lazily imported module took to load"""
+        self.imports.setdefault(module_name, seconds)
+
+    def finish(self):
+        """Mark first paint and log the profile once per process"""
+        if self.t0 is None or self.finished:
+            return
+        self.mark("first_paint")
+        self.finished = True
+        phases = ", ".join(f"{label}={elapsed * 1000:.1f}ms" for label, elapsed in self.marks)
+        logger.info("startup profile: %s", phases)
+        for module_name, seconds in self.imports.items():
+            logger.info("lazy import %s: %.1fms", module_name, seconds * 1000)
+
+    def as_dict(self):
+        return {
+            'marks_ms': {label: round(elapsed * 1000, 2) for label, elapsed in self.marks},
+            'imports_ms': {name: round(seconds * 1000, 2) for name, seconds in self.imports.items()},
+        }
+
+
+startup = StartupProfile()
+
+
+def profiling_enabled():
+    return os.environ.get("JOURNAL_PROFILE", "") not in ("", "0")
+
+
+def timed_import(module_name):
+    """Import a module, recording its load time the first time it is needed"""
+    import importlib
+    import sys
+
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    t0 = time.perf_counter()
+    with span("import", module=module_name):
+        module = importlib.import_module(module_name)
+    startup.record_import(module_name, time.perf_counter() - t0)
+    return module
+
+
+# The span the current script run is inside of (each session runs in its own thread)
+_current_span = ContextVar('journal_span', default=None)
+
+
+class Tracer:
+    """Span recorder shared by every session served by the process"""
+
+    def __init__(self, max_spans=5000):
+        self.lock = threading.Lock()
+        self.spans = deque(maxlen=max_spans)
+        self.stats = {}
+        self.last_trace_id = None
+
+    def record(self, record):
+        with self.lock:
+            self.spans.append(record)
+            seconds = record['duration_ns'] / 1e9
+            stats = self.stats.setdefault(record['name'], {'calls': 0, 'total_s': 0.0, 'max_s': 0.0, 'last_s': 0.0})
+            stats['calls'] += 1
+            stats['total_s'] += seconds
+            stats['max_s'] = max(stats['max_s'], seconds)
+            stats['last_s'] = seconds
+
+    def begin_run(self, **attributes):
+        """Open the root span for a script run; everything traced until end_run nests under it"""
+        root = _new_span("script_run", None, attributes)
+        _current_span.set(root)
+        return root
+
+    def end_run(self, root):
+        """Close the run's root span and append the run to JOURNAL_TRACE_FILE if set"""
+        _close_span(root)
+        _current_span.set(None)
+        self.last_trace_id = root['trace_id']
+
+        run = self.run_spans(root['trace_id'])
+        if profiling_enabled():
+            logger.info("run %s: %s", root['trace_id'][:8],
+                        ", ".join(f"{item['name']}={item['duration_ns'] / 1e6:.1f}ms" for item in run))
+        path = os.environ.get("JOURNAL_TRACE_FILE")
+        if path:
+            with open(path, 'a') as f:
+                f.write(to_jsonl(run))
+
+    def run_spans(self, trace_id=None):
+        """Spans of one run (the last completed run by default), in start order"""
+        trace_id = trace_id or self.last_trace_id
+        with self.lock:
+            run = [record for record in self.spans if record['trace_id'] == trace_id]
+        return sorted(run, key=lambda record: record['start_ns'])
+
+    def all_spans(self):
+        """Every span still in the ring buffer, in start order"""
+        with self.lock:
+            return sorted(self.spans, key=lambda record: record['start_ns'])
+
+    def summary(self):
+        """Per-name call counts and timings since the process started (or reset)"""
+        with self.lock:
+            return {name: dict(stats) for name, stats in self.stats.items()}
+
+    def reset(self):
+        with self.lock:
+            self.spans.clear()
+            self.stats.clear()
+            self.last_trace_id = None
+
+
+tracer = Tracer()
+
+
+def _new_span(name, parent, attributes):
+    return {
+        'name': name,
+        'trace_id': parent['trace_id'] if parent else secrets.token_hex(16),
+        'span_id': secrets.token_hex(8),
+        'parent_id': parent['span_id'] if parent else None,
+        'start_ns': time.time_ns(),
+        'perf_ns': time.perf_counter_ns(),
+        'duration_ns': 0,
+        'attributes': {key: str(value) for key, value in attributes.items()},
+        'status': 'ok',
+    }
+
+
+def _close_span(record):
+    record['duration_ns'] = time.perf_counter_ns() - record.pop('perf_ns')
+    tracer.record(record)
+
+
+@contextmanager
+def span(name, **attributes):
+    """Time a block as a span nested under the current one"""
+    record = _new_span(name, _current_span.get(), attributes)
+    token = _current_span.set(record)
+    try:
+        yield record
+    except BaseException as exc:
+        # st.rerun()/st.stop() also unwind through here; note them rather than call them errors
+        record['status'] = type(exc).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        _close_span(record)
+
+
+def traced(name=None):
+    """Decorator form of :func:`span`; the span is named after the function by default"""
+    def decorate(fn):
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def to_jsonl(spans):
+    """Spans as JSON lines: one object per span with times in ms"""
+    lines = []
+    for record in spans:
+        lines.append(json.dumps({
+            'name': record['name'],
+            'trace_id': record['trace_id'],
+            'span_id': record['span_id'],
+            'parent_span_id': record['parent_id'],
+            'start_time_unix_nano': record['start_ns'],
+            'duration_ms': round(record['duration_ns'] / 1e6, 3),
+            'status': record['status'],
+            'attributes': record['attributes'],
+        }))
+    return "".join(line + "\n" for line in lines)
+
+
+def to_otlp_json(spans, service_name="trading-journal"):
+    """Spans as an OTLP/JSON trace export (loadable by Jaeger, Tempo, otel-collector)"""
+    def attributes(values):
+        return [{'key': key, 'value': {'stringValue': value}} for key, value in values.items()]
+
+    otlp_spans = []
+    for record in spans:
+        otlp_span = {
+            'traceId': record['trace_id'],
+            'spanId': record['span_id'],
+            'name': record['name'],
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(record['start_ns']),
+            'endTimeUnixNano': str(record['start_ns'] + record['duration_ns']),
+            'attributes': attributes(record['attributes']),
+            'status': {'code': 1} if record['status'] == 'ok' else {'code': 2, 'message': record['status']},
+        }
+        if record['parent_id']:
+            otlp_span['parentSpanId'] = record['parent_id']
+        otlp_spans.append(otlp_span)
+
+    return json.dumps({'resourceSpans': [{
+        'resource': {'attributes': attributes({'service.name': service_name})},
+        'scopeSpans': [{'scope': {'name': __name__}, 'spans': otlp_spans}],
+    }]})
@@ -0,0 +1,170 @@
+"""Psychology vs. performance: joins the morning check-in to the day's results.
+
+:func:`psychology_frame` builds one row per reviewed trading day with the
+morning fields (``sleep_quality``, ``emotional_state``, ``post_night_shift``,
+``checked_news``) next to P&L, rule compliance and process grade.
+:func:`psychology_report` then produces grouped statistics, bootstrap
+confidence intervals for each group's mean P&L and OLS regression
+coefficients. The frame is cached on the journal revision; the report is
+cached on the frame's contents, so edits that do not touch these columns
+(evening notes, screenshots, new trades on an unreviewed day) reuse the
+previous results and the batch only reruns when a reviewed day is added or
+changed.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from journal.perf import traced
+from journal.reconcile import day_pnl, has_day_pnl
+from journal.rules import compliance_rate
+from journal.schema import iter_days
+
+GRADE_SCORES = {"A": 4, "B": 3, "C": 2, "D": 1, "F": 0}
+
+SLEEP_BINS = [0, 4, 6, 8, 10]
+SLEEP_LABELS = ["1-4", "5-6", "7-8", "9-10"]
+
+FACTORS = {
+    'emotional_state': "Emotional State",
+    'sleep_band': "Sleep Quality",
+    'post_night_shift': "Post Night Shift",
+    'checked_news': "Checked News",
+}
+
+OUTCOMES = {
+    'pnl': "P&L ($)",
+    'compliance': "Rule Compliance",
+    'grade_score': "Process Grade (A=4 … F=0)",
+}
+
+BOOTSTRAP_SAMPLES = 2000
+
+
+@traced()
+@st.cache_data(show_spinner=False, max_entries=4)
+def psychology_frame(_data, revision):
+    """One row per day that has a trading review, with its morning check-in"""
+    rows = []
+    for date_key, entry in iter_days(_data):
+        if not has_day_pnl(entry):
+            continue
+        trading = entry['trading']
+        morning = entry['morning']
+        compliance = compliance_rate(trading)
+        trades = entry['trade_day']['trades']
+        rows.append({
+            'date': date_key,
+            'sleep_quality': morning.get('sleep_quality'),
+            'emotional_state': morning.get('emotional_state'),
+            'post_night_shift': morning.get('post_night_shift'),
+            'checked_news': morning.get('checked_news'),
+            'pnl': day_pnl(entry),
+            'compliance': np.nan if compliance is None else compliance,
+            'grade_score': GRADE_SCORES.get(trading.get('process_grade'), np.nan),
+            'trade_count': len(trades),
+        })
+
+    frame = pd.DataFrame(rows, columns=['date', 'sleep_quality', 'emotional_state', 'post_night_shift',
+                                        'checked_news', 'pnl', 'compliance', 'grade_score', 'trade_count'])
+    frame['date'] = pd.to_datetime(frame['date'])
+    frame['sleep_quality'] = pd.to_numeric(frame['sleep_quality'], errors='coerce')
+    frame['pnl'] = pd.to_numeric(frame['pnl'], errors='coerce').fillna(0.0)
+    frame['compliance'] = frame['compliance'].astype(float)
+    frame['grade_score'] = frame['grade_score'].astype(float)
+    frame['sleep_band'] = pd.cut(frame['sleep_quality'], bins=SLEEP_BINS, labels=SLEEP_LABELS)
+    frame['win_day'] = frame['pnl'] > 0
+    return frame.sort_values('date').reset_index(drop=True)
+
+
+def bootstrap_mean_ci(values, samples=BOOTSTRAP_SAMPLES, level=0.95, seed=0):
+    """Percentile bootstrap interval for the mean, resampled in one matrix"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) < 2:
+        return np.nan, np.nan
+    rng = np.random.default_rng(seed)
+    means = values[rng.integers(0, len(values), size=(samples, len(values)))].mean(axis=1)
+    tail = (1 - level) / 2 * 100
+    low, high = np.percentile(means, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def grouped_stats(frame, factor):
+    """Per-level day count, P&L, win-day rate, compliance and grade for a factor"""
+    valid = frame[frame[factor].notna()]
+    if valid.empty:
+        return pd.DataFrame()
+
+    grouped = valid.groupby(factor, observed=True)
+    stats = grouped.agg(
+        days=('pnl', 'size'),
+        total_pnl=('pnl', 'sum'),
+        mean_pnl=('pnl', 'mean'),
+        median_pnl=('pnl', 'median'),
+        win_day_rate=('win_day', 'mean'),
+        compliance=('compliance', 'mean'),
+        grade_score=('grade_score', 'mean'),
+    )
+    ci = grouped['pnl'].apply(lambda pnl: pd.Series(bootstrap_mean_ci(pnl.values), index=['ci_low', 'ci_high']))
+    return stats.join(ci.unstack())
+
+
+def regression(frame, outcome):
+    """OLS of an outcome on sleep, night shift, news check and emotional state
+
+    Emotional states are one-hot encoded against the most common state.
+    Returns a coefficient table (estimate, standard error, t) and R².
+    """
+    columns = ['sleep_quality', 'post_night_shift', 'checked_news', 'emotional_state', outcome]
+    valid = frame[columns].dropna()
+    if len(valid) < 3:
+        return pd.DataFrame(), np.nan, len(valid)
+
+    baseline = valid['emotional_state'].mode().iloc[0]
+    emotions = pd.get_dummies(valid['emotional_state'], prefix='emotion', dtype=float)
+    emotions = emotions.drop(columns=f"emotion_{baseline}")
+
+    X = pd.concat([
+        pd.Series(1.0, index=valid.index, name='intercept'),
+        valid['sleep_quality'].astype(float),
+        valid['post_night_shift'].astype(float),
+        valid['checked_news'].astype(float),
+        emotions,
+    ], axis=1)
+    # Drop columns that never vary (e.g. news always checked) to keep X full rank
+    X = X.loc[:, (X.nunique() > 1) | (X.columns == 'intercept')]
+    y = valid[outcome].astype(float).values
+
+    beta, _, rank, _ = np.linalg.lstsq(X.values, y, rcond=None)
+    residuals = y - X.values @ beta
+    dof = len(y) - rank
+    ss_res = float(residuals @ residuals)
+    ss_tot = float(((y - y.mean()) ** 2).sum())
+    r_squared = 1 - ss_res / ss_tot if ss_tot > 0 else np.nan
+
+    if dof > 0:
+        sigma2 = ss_res / dof
+        std_err = np.sqrt(np.diag(sigma2 * np.linalg.pinv(X.values.T @ X.values)))
+    else:
+        std_err = np.full(len(beta), np.nan)
+
+    table = pd.DataFrame({'coefficient': beta, 'std_error': std_err}, index=X.columns)
+    table['t'] = table['coefficient'] / table['std_error'].where(table['std_error'] > 0)
+    return table, r_squared, len(valid)
+
+
+@traced()
+@st.cache_data(show_spinner=False, max_entries=4)
+def psychology_report(frame):
+    """Grouped stats, bootstrap CIs and regressions for every factor/outcome
+
+    ``frame`` comes from :func:`psychology_frame`; Streamlit hashes it by
+    value, so this is keyed on the joined rows rather than the revision.
+    """
+    return {
+        'frame': frame,
+        'groups': {factor: grouped_stats(frame, factor) for factor in FACTORS},
+        'regressions': {outcome: regression(frame, outcome) for outcome in OUTCOMES},
+    }
@@ -0,0 +1,124 @@
+"""Daily P&L derived from the Trade Day trades.
+
+Imported trades carry their own ``pnl``, so a day's result does not have to
+be typed into the Trading Review. Each day keeps the sum of its trades in
+``trade_day['totals']``:
+
+    {'gross_pnl', 'fees', 'net_pnl', 'contracts', 'priced_trades',
+     'trade_count', 'commission'}
+
+:func:`reconcile_day` rebuilds that record from the day's own trades and is
+called wherever trades are added, merged, recomputed or deleted, so the
+cost of a change is the size of one day and aggregates read a single number
+per day instead of summing trades at render time. :func:`day_pnl` is the
+figure the balance, calendar, statistics and analytics use: the derived net
+P&L when the day has priced trades, else the manual ``trading.pnl``.
+
+Fees are the round-turn commission per contract from the account settings.
+The manual figure is kept; :func:`pnl_mismatch` reports days where it and
+the derived net disagree.
+"""
+
+from journal.schema import iter_days
+
+# Differences below a cent are rounding, not a disagreement
+PNL_TOLERANCE = 0.005
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_commission_per_contract(data):
+    """Round-turn commission per contract from the account settings"""
+    return float(data.get('account_settings', {}).get('commission_per_contract', 0.0) or 0.0)
+
+
+def reconcile_day(entry, commission=0.0):
+    """Rebuild a day's derived totals from its trades; returns the totals (or None)"""
+    trade_day = entry['trade_day']
+    trades = trade_day['trades']
+    if not trades:
+        trade_day.pop('totals', None)
+        return None
+
+    gross, contracts, priced = 0.0, 0.0, 0
+    for trade in trades:
+        pnl = _as_float(trade.get('pnl'))
+        if pnl is None:
+            continue  # manual trades only record an outcome
+        gross += pnl
+        contracts += _as_float(trade.get('quantity')) or 0.0
+        priced += 1
+
+    fees = round(contracts * commission, 2)
+    trade_day['totals'] = {
+        'gross_pnl': round(gross, 2),
+        'fees': fees,
+        'net_pnl': round(gross - fees, 2),
+        'contracts': contracts,
+        'priced_trades': priced,
+        'trade_count': len(trades),
+        'commission': commission,
+    }
+    return trade_day['totals']
+
+
+def reconcile_days(data, date_keys):
+    """Rebuild the totals of the given days, e.g. the ones an import touched"""
+    commission = get_commission_per_contract(data)
+    for date_key in date_keys:
+        if date_key in data:
+            reconcile_day(data[date_key], commission)
+
+
+def reconcile_journal(data, force=False):
+    """Bring every day's totals up to date; returns the date keys rebuilt
+
+    Without ``force`` only days whose totals are missing or stale (trade
+    count or commission changed since) are rebuilt, so on an up-to-date
+    journal this is one dict lookup per day.
+    """
+    commission = get_commission_per_contract(data)
+    rebuilt = []
+    for date_key, entry in iter_days(data):
+        trade_day = entry['trade_day']
+        trades = trade_day['trades']
+        totals = trade_day.get('totals')
+        if (force or (totals is None) != (not trades)
+                or (totals and (totals['trade_count'] != len(trades) or totals['commission'] != commission))):
+            reconcile_day(entry, commission)
+            rebuilt.append(date_key)
+    return rebuilt
+
+
+def derived_totals(entry):
+    """The day's derived totals if it has priced trades, else None"""
+    totals = entry['trade_day'].get('totals')
+    return totals if totals and totals['priced_trades'] else None
+
+
+def has_day_pnl(entry):
+    """True if the day has a P&L, derived from trades or entered by hand"""
+    return derived_totals(entry) is not None or 'pnl' in entry['trading']
+
+
+def day_pnl(entry):
+    """The day's P&L for aggregates: derived net P&L, falling back to the manual figure"""
+    totals = derived_totals(entry)
+    if totals is not None:
+        return totals['net_pnl']
+    return entry['trading'].get('pnl', 0)
+
+
+def pnl_mismatch(entry):
+    """Manual minus derived P&L when both exist and disagree, else None"""
+    totals = derived_totals(entry)
+    manual = _as_float(entry['trading'].get('pnl'))
+    if totals is None or manual is None:
+        return None
+    difference = manual - totals['net_pnl']
+    return difference if abs(difference) >= PNL_TOLERANCE else None
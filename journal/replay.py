@@ -0,0 +1,117 @@
+"""Trade replay: the market around a trade with its fills on top.
+
+The price series comes from the local bar store (:mod:`journal.market_data`)
+for a window around the trade and is downsampled on the server with
+Largest-Triangle-Three-Buckets (:func:`lttb`) before it is sent to the
+browser: a session of one-second bars is ~23k points, the chart needs a few
+thousand at most to look the same. LTTB keeps the points that shape the
+line (spikes and turns) rather than every n-th one, so the trade's extremes
+stay visible. The entry and exit fills from ``raw_fills`` are drawn at their
+exact time and price.
+
+Figures are WebGL (``Scattergl``) and cached per trade (its id, fills and
+stop) and bar store revision, so opening a replay again is a cache hit.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from journal.figures import trade_replay_figure
+from journal.market_data import BarStore
+from journal.perf import traced
+from journal.trade_log import trade_id_from_fills
+
+# Points sent to the browser for the price line
+REPLAY_POINTS = 2000
+
+# Market shown before the entry and after the exit, at least
+REPLAY_PADDING = pd.Timedelta(minutes=5)
+
+
+def lttb(x, y, threshold):
+    """Indices of the ``threshold`` points of ``(x, y)`` that Largest-Triangle-Three-Buckets keeps
+
+    The first and last points are always kept; the points in between are
+    split into ``threshold - 2`` buckets and from each bucket the point
+    forming the largest triangle with the previously kept point and the
+    next bucket's average is kept. Returns every index when there are
+    ``threshold`` points or fewer.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bucket i covers [edges[i], edges[i + 1]); the last point is its own bucket
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(x, edges) / counts
+    avg_y = np.add.reduceat(y, edges) / counts
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Twice the triangle area (a, candidate, next bucket average), up to sign
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def trade_fills(trade):
+    """The trade's fills as a frame: time, price, side, quantity, open/close"""
+    fills = trade.get('raw_fills') or []
+    return pd.DataFrame({
+        'time': pd.to_datetime([' '.join(fill.get('DateTime', '').split()) for fill in fills], errors='coerce'),
+        'price': pd.to_numeric([fill.get('FillPrice') for fill in fills], errors='coerce'),
+        'side': [fill.get('BuySell', '') for fill in fills],
+        'quantity': pd.to_numeric([fill.get('Quantity') for fill in fills], errors='coerce'),
+        'open_close': [fill.get('OpenClose', '') for fill in fills],
+    }).dropna(subset=['time', 'price'])
+
+
+def can_replay(trade, symbols):
+    """True for an imported trade whose symbol has stored bars"""
+    return bool(trade.get('raw_fills')) and trade.get('symbol') in symbols
+
+
+@traced()
+def replay_figure(trade, bars_revision, points=REPLAY_POINTS):
+    """Replay chart of a trade, or None without bars for its window"""
+    return _replay_figure(trade['id'], trade_id_from_fills(trade.get('raw_fills') or []), trade.get('stop_price'),
+                          trade, bars_revision, points)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _replay_figure(trade_id, fills_id, stop_price, _trade, bars_revision, points):
+    """:func:`replay_figure`, cached on what the figure shows
+
+    The trade keeps its id when a re-import merges more fills into it or its
+    stop is edited, so ``fills_id`` (the id of its current fills) and
+    ``stop_price`` are part of the key along with the bar store revision.
+    """
+    fills = trade_fills(_trade)
+    if fills.empty:
+        return None
+    entry_time, exit_time = fills['time'].min(), fills['time'].max()
+    padding = max(REPLAY_PADDING, (exit_time - entry_time) / 2)
+    bars = BarStore().bars(_trade['symbol'], entry_time - padding, exit_time + padding)
+    if not len(bars['time']):
+        return None
+
+    keep = lttb(bars['time'] - bars['time'][0], bars['close'], points)
+    return trade_replay_figure(
+        bars['time'][keep].view('datetime64[ns]'),
+        bars['close'][keep],
+        fills,
+        entry_time,
+        exit_time,
+        stop_price=_trade.get('stop_price'),
+        title=f"{_trade['symbol']} · {_trade.get('direction', '')} {_trade.get('quantity', '')}".strip(),
+    )
@@ -0,0 +1,398 @@
+"""Weekly and monthly reports as HTML or PDF.
+
+A report covers one calendar week (Monday to Sunday) or month and holds the
+period's headline numbers, the equity curve, a P&L calendar heatmap, P&L by
+tag, rule adherence, the psychology breakdowns and thumbnails of the
+period's screenshots. Charts come from :mod:`journal.figures`, the same
+builders the Historical Analysis, Balance & Ledger and Psychology pages
+use.
+
+Building happens in two steps. :func:`gather_report` runs in the script
+thread and only slices the cached per-revision frames from
+:mod:`journal.analytics` and :mod:`journal.psychology`. :func:`build_report`
+does the slow part -- figures, image rendering, thumbnails -- on a
+background worker thread. :func:`request_report` keeps the finished
+reports keyed by ``(period, start, journal revision, format)``, so asking
+again for a period of an unchanged journal returns the same result at once.
+
+HTML reports embed interactive charts; with the optional ``kaleido``
+package installed they embed static PNGs instead and PDF reports become
+available (Plotly needs kaleido to draw figures to images).
+"""
+
+import base64
+import calendar
+import html
+import importlib.util
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import plotly.graph_objects as go
+from PIL import Image
+
+from journal.analytics import day_frame, period_analytics, rule_adherence
+from journal.figures import (
+    balance_figure,
+    calendar_heatmap_figure,
+    equity_drawdown_figure,
+    factor_pnl_figure,
+    rule_adherence_figure,
+    tag_performance_figure,
+)
+from journal.github_client import BACKGROUND, GitHubClient, GitHubError
+from journal.perf import span, traced
+from journal.psychology import FACTORS, OUTCOMES, grouped_stats, psychology_frame
+from journal.reconcile import has_day_pnl
+from journal.schema import iter_days
+
+PERIODS = {'week': "Weekly", 'month': "Monthly"}
+FORMATS = ('html', 'pdf')
+
+MAX_THUMBNAILS = 8
+THUMBNAIL_SIZE = (320, 240)
+IMAGE_WIDTH = 1000
+MAX_CACHED_REPORTS = 16
+
+# Psychology breakdowns shown in reports (the page offers every factor)
+REPORT_FACTORS = ('emotional_state', 'sleep_band')
+
+
+def period_bounds(kind, day):
+    """First and last date of the week (Monday-Sunday) or month containing ``day``"""
+    if kind == 'week':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    start = day.replace(day=1)
+    return start, start.replace(day=calendar.monthrange(start.year, start.month)[1])
+
+
+def period_label(kind, start):
+    if kind == 'week':
+        return f"Week of {start.strftime('%B %d, %Y')}"
+    return start.strftime("%B %Y")
+
+
+def recent_periods(data, kind, limit=24):
+    """Starts of the most recent periods that have a P&L, newest first"""
+    starts = set()
+    for date_key, entry in iter_days(data):
+        if has_day_pnl(entry):
+            starts.add(period_bounds(kind, datetime.strptime(date_key, "%Y-%m-%d").date())[0])
+    return sorted(starts, reverse=True)[:limit]
+
+
+def static_images_available():
+    """Whether Plotly can draw figures to images (needs the kaleido package)"""
+    return importlib.util.find_spec('kaleido') is not None
+
+
+def _screenshots(entry):
+    """(url, caption) of a day's screenshots, trade and review shots first"""
+    shots = [trade['screenshot'] for trade in entry['trade_day']['trades'] if trade['screenshot']]
+    shots += entry['trading'].get('trading_screenshots', [])
+    shots += entry['morning'].get('morning_screenshots', [])
+    return [(shot['url'], shot['caption']) for shot in shots]
+
+
+def _tag_table(data, start, end):
+    """P&L, trade count and win rate per tag for trades in the period"""
+    rows = []
+    day = start
+    while day <= end:
+        entry = data.get(day.strftime("%Y-%m-%d"))
+        if entry is not None:
+            for trade in entry['trade_day']['trades']:
+                pnl = trade.get('pnl')
+                for tag in trade['tags']:
+                    rows.append({'tag': tag, 'pnl': pnl if isinstance(pnl, (int, float)) else 0.0,
+                                 'win': trade['outcome'] == 'win'})
+        day += timedelta(days=1)
+    if not rows:
+        return pd.DataFrame(columns=['pnl', 'trades', 'win_rate'])
+    return pd.DataFrame(rows).groupby('tag').agg(pnl=('pnl', 'sum'), trades=('pnl', 'size'), win_rate=('win', 'mean'))
+
+
+@traced()
+def gather_report(data, revision, kind, start):
+    """Everything a report needs for one period, taken from the cached analytics
+
+    Runs in the script thread; the result holds no references into
+    ``data``, so the worker can build from it while the journal changes.
+    """
+    start, end = period_bounds(kind, start)
+    days = day_frame(data, revision)
+    days = days.loc[(days.index >= pd.Timestamp(start)) & (days.index <= pd.Timestamp(end))] if len(days) else days
+    psychology = psychology_frame(data, revision)
+    psychology = psychology[(psychology['date'] >= pd.Timestamp(start)) & (psychology['date'] <= pd.Timestamp(end))]
+
+    screenshots = []
+    day = start
+    while day <= end and len(screenshots) < MAX_THUMBNAILS:
+        entry = data.get(day.strftime("%Y-%m-%d"))
+        if entry is not None:
+            screenshots.extend((day, url, caption) for url, caption in _screenshots(entry))
+        day += timedelta(days=1)
+
+    return {
+        'kind': kind,
+        'start': start,
+        'end': end,
+        'label': period_label(kind, start),
+        'revision': revision,
+        'stats': period_analytics(data, revision, start, end),
+        'days': days,
+        'rules': rule_adherence(data, revision, start, end),
+        'psychology': psychology,
+        'tags': _tag_table(data, start, end),
+        'screenshots': screenshots[:MAX_THUMBNAILS],
+        'starting_balance': data.get('account_settings', {}).get('starting_balance'),
+    }
+
+
+def _money(value):
+    return f"${value:,.2f}"
+
+
+def _ratio(value):
+    return "—" if value != value else "∞" if value == float('inf') else f"{value:.2f}"
+
+
+def summary_rows(inputs):
+    """Headline numbers as (label, value) pairs"""
+    stats, days = inputs['stats'], inputs['days']
+    traded = days[days['traded']] if len(days) else days
+    compliance = inputs['psychology']['compliance']
+    return [
+        ("Net P&L", _money(float(traded['pnl'].sum()) if len(traded) else 0.0)),
+        ("Trading Days", f"{len(traded)} ({int((traded['pnl'] > 0).sum()) if len(traded) else 0} green)"),
+        ("Trades", f"{stats['trades_with_pnl']} with P&L of {stats['trades']}"),
+        ("Expectancy / Trade", _money(stats['expectancy'])),
+        ("Profit Factor", _ratio(stats['profit_factor'])),
+        ("Avg Win / Avg Loss", f"{_money(stats['avg_win'])} / {_money(stats['avg_loss'])}"),
+        ("Max Drawdown", f"{_money(stats['max_drawdown'])} ({stats['max_drawdown_pct']:.1f}%)"),
+        ("Longest Win / Loss Streak", f"{stats['longest_win_streak']} / {stats['longest_loss_streak']}"),
+        ("Avg Rule Compliance", f"{compliance.mean():.0%}" if compliance.notna().any() else "—"),
+    ]
+
+
+def psychology_correlations(frame):
+    """Correlation of sleep, night shifts and news checks with each outcome"""
+    factors = ['sleep_quality', 'post_night_shift', 'checked_news']
+    numeric = frame[factors + list(OUTCOMES)].apply(pd.to_numeric, errors='coerce').astype(float)
+    if len(numeric.dropna(how='all')) < 3:
+        return pd.DataFrame()
+    return numeric.corr().loc[factors, list(OUTCOMES)].rename(
+        index={'sleep_quality': "Sleep quality", 'post_night_shift': "Post night shift", 'checked_news': "Checked news"},
+        columns=OUTCOMES)
+
+
+def report_figures(inputs):
+    """The report's charts as (section title, figure), skipping empty sections"""
+    figures = []
+    days, stats = inputs['days'], inputs['stats']
+
+    if len(days) and 'balance' in days and inputs['starting_balance']:
+        balance_data = [{'date': day, 'balance': row['balance'], 'daily_deposits': row['deposits'],
+                         'daily_withdrawals': row['withdrawals']} for day, row in days.iterrows()]
+        figures.append(("Account Balance", balance_figure(balance_data, inputs['starting_balance'])))
+    if len(stats['equity']) > 1:
+        figures.append(("Equity and Drawdown", equity_drawdown_figure(stats['equity'], stats['drawdown'])))
+    if len(days) and days['traded'].any():
+        figures.append(("P&L Calendar", calendar_heatmap_figure(days['pnl'].where(days['traded']))))
+    if len(inputs['tags']):
+        figures.append(("Tag Performance", tag_performance_figure(inputs['tags'])))
+    if len(inputs['rules']):
+        figures.append(("Rule Compliance", rule_adherence_figure(inputs['rules'])))
+    for factor in REPORT_FACTORS:
+        groups = grouped_stats(inputs['psychology'], factor)
+        if len(groups):
+            figures.append((f"Psychology: {FACTORS[factor]}", factor_pnl_figure(groups, FACTORS[factor])))
+    return figures
+
+
+def _figure_png(fig, height=None):
+    return fig.to_image(format='png', width=IMAGE_WIDTH, height=height or fig.layout.height or 450)
+
+
+def _thumbnail(url, client):
+    """A screenshot scaled down to thumbnail size, or None if it cannot be loaded"""
+    try:
+        if url.startswith(('http://', 'https://')):
+            raw = client.get_url(url, priority=BACKGROUND)
+        else:
+            with open(url, 'rb') as f:
+                raw = f.read()
+        image = Image.open(io.BytesIO(raw))
+        image.thumbnail(THUMBNAIL_SIZE)
+        return image.convert('RGB')
+    except (OSError, GitHubError):
+        return None
+
+
+def _png_data_uri(png):
+    return "data:image/png;base64," + base64.b64encode(png).decode()
+
+
+def _table_html(rows, header=None):
+    head = "".join(f"<th>{html.escape(str(cell))}</th>" for cell in header) if header else ""
+    body = "".join("<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>" for row in rows)
+    return f"<table>{'<tr>' + head + '</tr>' if head else ''}{body}</table>"
+
+
+REPORT_CSS = """
+body { background: #0e1117; color: #fafafa; font-family: -apple-system, 'Segoe UI', sans-serif; margin: 2rem auto; max-width: 1040px; }
+h1 { color: #64ffda; } h2 { border-bottom: 1px solid #333; padding-bottom: .3rem; margin-top: 2rem; }
+table { border-collapse: collapse; margin: 1rem 0; } td, th { border: 1px solid #333; padding: .35rem .8rem; text-align: left; }
+.thumbs { display: flex; flex-wrap: wrap; gap: 1rem; } .thumbs figure { margin: 0; width: 320px; }
+figcaption { color: #aaa; font-size: .85rem; } .footer { color: #777; font-size: .8rem; margin-top: 3rem; }
+"""
+
+
+def render_html(inputs, figures, thumbnails, static_images):
+    """The report as a self-contained HTML page"""
+    parts = [f"<h1>📊 {html.escape(inputs['label'])}</h1>",
+             f"<p>{inputs['start']:%A, %B %d, %Y} – {inputs['end']:%A, %B %d, %Y}</p>",
+             "<h2>Summary</h2>", _table_html(summary_rows(inputs))]
+
+    plotly_js_included = False
+    for title, fig in figures:
+        parts.append(f"<h2>{html.escape(title)}</h2>")
+        if static_images:
+            parts.append(f'<img src="{_png_data_uri(_figure_png(fig))}" width="{IMAGE_WIDTH}" alt="{html.escape(title)}">')
+        else:
+            # plotly.js is embedded once, with the first chart
+            parts.append(fig.to_html(full_html=False, include_plotlyjs=not plotly_js_included))
+            plotly_js_included = True
+        if title == "Rule Compliance":
+            parts.append(_table_html(
+                [(row.rule, row.days, row.followed, f"{row.adherence:.0%}", _money(row.pnl_on_broken_days))
+                 for row in inputs['rules'].itertuples()],
+                header=("Rule", "Days", "Followed", "Adherence", "P&L on Broken Days")))
+
+    correlations = psychology_correlations(inputs['psychology'])
+    if not correlations.empty:
+        parts.append("<h2>Psychology Correlations</h2>")
+        parts.append(_table_html(
+            [(factor, *("—" if value != value else f"{value:+.2f}" for value in row)) for factor, row in correlations.iterrows()],
+            header=("", *correlations.columns)))
+
+    if thumbnails:
+        parts.append("<h2>Screenshots</h2><div class='thumbs'>")
+        for day, caption, image in thumbnails:
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG')
+            parts.append(f"<figure><img src='{_png_data_uri(buffer.getvalue())}'>"
+                         f"<figcaption>{day:%b %d} · {html.escape(caption)}</figcaption></figure>")
+        parts.append("</div>")
+
+    parts.append(f"<p class='footer'>Generated {datetime.now():%Y-%m-%d %H:%M} from journal revision "
+                 f"{html.escape(str(inputs['revision']))[:12]}</p>")
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(inputs['label'])}</title>"
+            f"<style>{REPORT_CSS}</style></head><body>{''.join(parts)}</body></html>").encode('utf-8')
+
+
+def _table_figure(title, header, rows, height):
+    fig = go.Figure(go.Table(
+        header=dict(values=list(header), fill_color='#1f2937', font=dict(color='white', size=14), align='left'),
+        cells=dict(values=[list(column) for column in zip(*rows)] if rows else [[] for _ in header],
+                   fill_color='#0e1117', font=dict(color='white', size=13), align='left', height=28)
+    ))
+    fig.update_layout(title=title, template="plotly_dark", height=height, margin=dict(t=80, l=40, r=40, b=20))
+    return fig
+
+
+def render_pdf(inputs, figures, thumbnails):
+    """The report as a PDF, one chart per page (needs kaleido)"""
+    summary = summary_rows(inputs)
+    pages = [_table_figure(f"{inputs['label']}: Summary", ("Metric", "Value"), summary, 150 + 32 * len(summary))]
+    pages.extend(fig.update_layout(title=title) for title, fig in figures)
+
+    correlations = psychology_correlations(inputs['psychology'])
+    if not correlations.empty:
+        rows = [(factor, *("—" if value != value else f"{value:+.2f}" for value in row)) for factor, row in correlations.iterrows()]
+        pages.append(_table_figure("Psychology Correlations", ("", *correlations.columns), rows, 300))
+
+    images = [Image.open(io.BytesIO(_figure_png(fig))).convert('RGB') for fig in pages]
+    if thumbnails:
+        columns = IMAGE_WIDTH // (THUMBNAIL_SIZE[0] + 10)
+        rows = -(-len(thumbnails) // columns)
+        sheet = Image.new('RGB', (IMAGE_WIDTH, rows * (THUMBNAIL_SIZE[1] + 10) + 10), '#0e1117')
+        for i, (_, _, image) in enumerate(thumbnails):
+            sheet.paste(image, (10 + (i % columns) * (THUMBNAIL_SIZE[0] + 10), 10 + (i // columns) * (THUMBNAIL_SIZE[1] + 10)))
+        images.append(sheet)
+
+    buffer = io.BytesIO()
+    images[0].save(buffer, format='PDF', save_all=True, append_images=images[1:], resolution=100)
+    return buffer.getvalue()
+
+
+def build_report(inputs, fmt):
+    """Render a gathered report to bytes; runs on the report worker"""
+    with span("report.build", period=inputs['label'], format=fmt):
+        static_images = static_images_available()
+        if fmt == 'pdf' and not static_images:
+            raise RuntimeError("PDF reports need the kaleido package (pip install kaleido)")
+        figures = report_figures(inputs)
+        # Screenshots are fetched concurrently over one pooled session
+        with GitHubClient() as client:
+            images = client.gather(lambda shot: _thumbnail(shot[1], client), inputs['screenshots'])
+        thumbnails = [(day, caption, image) for (day, _, caption), image in zip(inputs['screenshots'], images)
+                      if image is not None]
+        if fmt == 'pdf':
+            return render_pdf(inputs, figures, thumbnails)
+        try:
+            return render_html(inputs, figures, thumbnails, static_images)
+        except (RuntimeError, ValueError):
+            # kaleido is installed but cannot start (e.g. no Chrome): fall back to interactive charts
+            return render_html(inputs, figures, thumbnails, False)
+
+
+# Finished and in-progress reports shared by every session of the process
+_reports = OrderedDict()
+_reports_lock = threading.Lock()
+_executor = None
+
+
+def _report_key(revision, kind, start, fmt):
+    return (kind, period_bounds(kind, start)[0].isoformat(), revision, fmt)
+
+
+def cached_report(revision, kind, start, fmt):
+    """The report future for a period of this journal revision, if one was requested"""
+    with _reports_lock:
+        return _reports.get(_report_key(revision, kind, start, fmt))
+
+
+def request_report(data, revision, kind, start, fmt):
+    """Start building a report in the background (or reuse the cached one); returns a Future"""
+    global _executor
+    key = _report_key(revision, kind, start, fmt)
+    with _reports_lock:
+        if key in _reports:
+            _reports.move_to_end(key)
+            return _reports[key]
+
+    inputs = gather_report(data, revision, kind, start)
+    with _reports_lock:
+        if key not in _reports:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-report")
+            _reports[key] = _executor.submit(build_report, inputs, fmt)
+            # Forget the oldest finished reports
+            for old_key in [old_key for old_key, future in _reports.items() if future.done()][:-MAX_CACHED_REPORTS]:
+                del _reports[old_key]
+        return _reports[key]
+
+
+def report_filename(kind, start, fmt):
+    start = period_bounds(kind, start)[0]
+    period = f"{start:%Y}-W{start.isocalendar()[1]:02d}" if kind == 'week' else f"{start:%Y-%m}"
+    return f"trading_report_{period}.{fmt}"
+
+
+def default_period_start(kind, today=None):
+    return period_bounds(kind, today or date.today())[0]
@@ -0,0 +1,286 @@
+"""Risk rules checked against the trades themselves.
+
+The Trading Review's rule checkboxes are what the trader says they did.
+These rules are what the trades show, in the spirit of a prop firm's
+account rules:
+
+- ``daily_loss``: the day's net P&L reached ``-daily_loss_limit``;
+- ``trailing_drawdown``: the balance fell ``trailing_drawdown`` below its
+  high-water mark (carried from day to day);
+- ``max_trades``: more than ``max_trades_per_day`` trades;
+- ``max_contracts``: a trade larger than ``max_contracts``;
+- ``news``: a trade open within ``news_window_minutes`` of one of the
+  ``news_times`` (``HH:MM`` on the trade log's clock).
+
+The limits are configured per journal in ``data['risk_settings']``; a limit
+of 0 (or no news times) is off. Each day keeps its evaluation in
+``trade_day['risk']`` next to the P&L totals (see :mod:`journal.reconcile`)::
+
+    {'start_balance', 'high_water', 'pnl', 'trades', 'last_time',
+     'breaches': [{'rule', 'trade_id', 'time', 'detail'}, ...]}
+
+:meth:`RiskEngine.on_trade` updates that record for one more trade in
+constant time, so a trade arriving from live capture or an import that
+appends to the day is checked without looking at the rest of the day.
+:func:`evaluate_from` replays days from their trades when the history
+changed under them (a trade deleted or inserted earlier in the day, an
+import into the past, new limits); only the days from the first change on
+are replayed, with opening balances from one pass over the journal.
+"""
+
+from dataclasses import dataclass, field
+
+from journal.reconcile import day_pnl, get_commission_per_contract
+from journal.schema import iter_days
+from journal.sessions import parse_timestamp, sortable_timestamp
+
+DEFAULT_RISK_SETTINGS = {
+    'daily_loss_limit': 0.0,
+    'trailing_drawdown': 0.0,
+    'max_trades_per_day': 0,
+    'max_contracts': 0,
+    'news_times': [],
+    'news_window_minutes': 5,
+}
+
+RISK_RULES = {
+    'daily_loss': "Max daily loss",
+    'trailing_drawdown': "Trailing drawdown",
+    'max_trades': "Max trades per day",
+    'max_contracts': "Max contracts per trade",
+    'news': "No trading around news",
+}
+
+
+def get_risk_settings(data):
+    """The journal's risk limits, falling back to no limits"""
+    return {**DEFAULT_RISK_SETTINGS, **data.get('risk_settings', {})}
+
+
+def save_risk_settings(data, daily_loss_limit, trailing_drawdown=0.0, max_trades_per_day=0, max_contracts=0,
+                       news_times=(), news_window_minutes=5):
+    """Save the journal's risk limits"""
+    data['risk_settings'] = {
+        'daily_loss_limit': float(daily_loss_limit),
+        'trailing_drawdown': float(trailing_drawdown),
+        'max_trades_per_day': int(max_trades_per_day),
+        'max_contracts': int(max_contracts),
+        'news_times': sorted(news_times),
+        'news_window_minutes': int(news_window_minutes),
+    }
+    return data
+
+
+def parse_news_times(text):
+    """``"08:30, 10:00"`` -> ``['08:30', '10:00']``; raises ValueError on a bad time"""
+    times = []
+    for part in text.replace(';', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        hour, _, minute = part.partition(':')
+        if not (hour.isdigit() and minute.isdigit() and int(hour) < 24 and int(minute) < 60):
+            raise ValueError(f"'{part}' is not a time (HH:MM)")
+        times.append(f"{int(hour):02d}:{int(minute):02d}")
+    return times
+
+
+@dataclass(slots=True)
+class RiskState:
+    start_balance: float = 0.0
+    high_water: float = 0.0
+    pnl: float = 0.0
+    trades: int = 0
+    last_time: str = ""
+    breaches: list = field(default_factory=list)
+
+    @classmethod
+    def from_raw(cls, raw):
+        return cls(**raw)
+
+    def to_dict(self):
+        return {'start_balance': self.start_balance, 'high_water': self.high_water, 'pnl': self.pnl,
+                'trades': self.trades, 'last_time': self.last_time, 'breaches': self.breaches}
+
+    @property
+    def balance(self):
+        return self.start_balance + self.pnl
+
+
+def _trade_span(trade):
+    """Entry and exit time of a trade (exit = entry for manual trades)"""
+    entry = parse_timestamp(trade.get('timestamp') or "")
+    exits = [fill.get('DateTime', '') for fill in trade.get('raw_fills') or [] if fill.get('OpenClose') == 'Close']
+    exit_ = parse_timestamp(exits[-1]) if exits else None
+    return entry, exit_ or entry
+
+
+class RiskEngine:
+    """The journal's limits, applied to one trade at a time"""
+
+    def __init__(self, settings, commission=0.0):
+        self.settings = settings
+        self.commission = commission
+        window = int(settings['news_window_minutes'])
+        # News windows as (start, end) minutes of the day
+        self.news = [(int(t[:2]) * 60 + int(t[3:]) - window, int(t[:2]) * 60 + int(t[3:]) + window, t)
+                     for t in settings['news_times']]
+
+    @classmethod
+    def for_journal(cls, data):
+        return cls(get_risk_settings(data), get_commission_per_contract(data))
+
+    def enabled_rules(self):
+        """Keys of the rules with a limit set, in :data:`RISK_RULES` order"""
+        settings = self.settings
+        enabled = {
+            'daily_loss': settings['daily_loss_limit'],
+            'trailing_drawdown': settings['trailing_drawdown'],
+            'max_trades': settings['max_trades_per_day'],
+            'max_contracts': settings['max_contracts'],
+            'news': self.news,
+        }
+        return [rule for rule in RISK_RULES if enabled[rule]]
+
+    @property
+    def active(self):
+        return bool(self.enabled_rules())
+
+    def on_trade(self, state, trade):
+        """Add one trade to the day's state; returns the breaches it caused"""
+        settings = self.settings
+        quantity = float(trade.get('quantity') or 0)
+        pnl = trade.get('pnl')
+        state.trades += 1
+        if pnl is not None:
+            state.pnl += float(pnl) - quantity * self.commission
+        state.high_water = max(state.high_water, state.balance)
+        timestamp = sortable_timestamp(trade.get('timestamp') or "")
+        state.last_time = max(state.last_time, timestamp)
+
+        found = []
+        broken = {breach['rule'] for breach in state.breaches}
+
+        def breach(rule, detail):
+            # Seconds are enough to find the trade; logs pad the timestamp and add fractions
+            time = timestamp[:19]
+            found.append({'rule': rule, 'trade_id': trade['id'], 'time': time, 'detail': detail})
+
+        # Day-level limits are reported once, on the trade that crossed them
+        if settings['daily_loss_limit'] and 'daily_loss' not in broken and state.pnl <= -settings['daily_loss_limit']:
+            breach('daily_loss', f"Day P&L ${state.pnl:,.2f} (limit -${settings['daily_loss_limit']:,.2f})")
+        drawdown = state.high_water - state.balance
+        if (settings['trailing_drawdown'] and 'trailing_drawdown' not in broken
+                and drawdown >= settings['trailing_drawdown']):
+            breach('trailing_drawdown', f"${drawdown:,.2f} below the high-water mark ${state.high_water:,.2f}")
+        if (settings['max_trades_per_day'] and 'max_trades' not in broken
+                and state.trades > settings['max_trades_per_day']):
+            breach('max_trades', f"Trade {state.trades} of max {settings['max_trades_per_day']}")
+        if settings['max_contracts'] and quantity > settings['max_contracts']:
+            breach('max_contracts', f"{quantity:g} contracts (max {settings['max_contracts']})")
+        if self.news:
+            entry, exit_ = _trade_span(trade)
+            if entry is not None:
+                first, last = entry.hour * 60 + entry.minute, exit_.hour * 60 + exit_.minute
+                for start, end, news_time in self.news:
+                    if first <= end and last >= start:
+                        breach('news', f"Open around the {news_time} news")
+                        break
+
+        state.breaches.extend(found)
+        return found
+
+
+def opening_balances(data, date_keys):
+    """Balance at the start of each of the sorted ``date_keys``
+
+    Starting balance plus the P&L of earlier days and transfers dated
+    before the day, in one pass over the journal; the cumulative P&L when
+    account tracking is not set up.
+    """
+    account = data.get('account_settings', {})
+    start = account.get('start_date') or ""
+    balance = float(account.get('starting_balance') or 0.0)
+    days = sorted((key, entry) for key, entry in iter_days(data) if key >= start)
+    transfers = sorted((t['date'], t['amount'] if t['type'] == 'deposit' else -t['amount'])
+                       for t in data.get('transactions', []) if t['date'] >= start)
+
+    balances, day, transfer = {}, 0, 0
+    for date_key in date_keys:
+        while day < len(days) and days[day][0] < date_key:
+            balance += day_pnl(days[day][1])
+            day += 1
+        while transfer < len(transfers) and transfers[transfer][0] < date_key:
+            balance += transfers[transfer][1]
+            transfer += 1
+        balances[date_key] = balance
+    return balances
+
+
+def evaluate_from(data, first_date_key, engine=None):
+    """Re-evaluate every day with trades from ``first_date_key`` on; returns the keys evaluated
+
+    Days in the range without trades (any more) lose their evaluation.
+    Clears the evaluations when no limit is set.
+    """
+    engine = engine or RiskEngine.for_journal(data)
+    if not engine.active:
+        for key, entry in iter_days(data):
+            entry['trade_day'].pop('risk', None)
+        return []
+
+    days = []
+    for key, entry in iter_days(data):
+        if key >= first_date_key:
+            if entry['trade_day']['trades']:
+                days.append(key)
+            else:
+                entry['trade_day'].pop('risk', None)
+    days.sort()
+
+    # The high-water mark so far: the last evaluated day before the range
+    high_water = None
+    for key, entry in iter_days(data):
+        risk = entry['trade_day'].get('risk')
+        if risk and key < first_date_key and (high_water is None or key > high_water[0]):
+            high_water = (key, risk['high_water'])
+
+    balances = opening_balances(data, days)
+    previous = high_water[1] if high_water else None
+    for date_key in days:
+        opening = balances[date_key]
+        state = RiskState(start_balance=opening, high_water=opening if previous is None else max(previous, opening))
+        trades = data[date_key]['trade_day']['trades']
+        for trade in sorted(trades, key=lambda trade: sortable_timestamp(trade.get('timestamp') or "")):
+            engine.on_trade(state, trade)
+        data[date_key]['trade_day']['risk'] = state.to_dict()
+        previous = state.high_water
+    return days
+
+
+def record_trade(data, date_key, trade, engine=None):
+    """Check a trade just added to ``date_key``; returns the breaches it caused
+
+    Constant time when the day's evaluation is current and the trade is
+    its latest; otherwise the day (and later days) are replayed.
+    """
+    engine = engine or RiskEngine.for_journal(data)
+    if not engine.active:
+        return []
+    trade_day = data[date_key]['trade_day']
+    risk = trade_day.get('risk')
+    if (risk is None or risk['trades'] != len(trade_day['trades']) - 1
+            or sortable_timestamp(trade.get('timestamp') or "") < risk['last_time']):
+        evaluate_from(data, date_key, engine)
+        return [breach for breach in trade_day.get('risk', {}).get('breaches', []) if breach['trade_id'] == trade['id']]
+
+    state = RiskState.from_raw(risk)
+    found = engine.on_trade(state, trade)
+    trade_day['risk'] = state.to_dict()
+    return found
+
+
+def day_breaches(entry):
+    """The day's recorded breaches, or None if it was not evaluated"""
+    risk = entry['trade_day'].get('risk')
+    return None if risk is None else risk['breaches']
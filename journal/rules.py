@@ -0,0 +1,124 @@
+"""Trading rules: a global registry with stable ids and per-day compliance bitsets.
+
+Rules live once in ``data['rule_registry']`` as ``{'id', 'text', 'created'}``
+records; ids are assigned in order and never reused, so rewording or
+removing a rule from a day does not change what older reviews refer to.
+A day's ``rules`` is a list of rule ids, and its trading review stores
+compliance as two integers used as bitsets over those ids:
+``rule_mask`` (rules in force when the review was saved) and
+``rule_bits`` (rules followed).
+
+Journals written before the registry existed keep the rule texts in each
+day and compliance as ``rule_compliance['rule_{i}']`` keyed by list index;
+:func:`migrate_day_rules` converts them in place as part of the schema
+migration (:mod:`journal.schema`).
+"""
+
+from datetime import date
+
+
+def get_rule_registry(data):
+    """Get all registered rules, in id order"""
+    return data.get('rule_registry', [])
+
+def get_rule_text(data, rule_id):
+    """Get the text of a rule by id"""
+    registry = get_rule_registry(data)
+    if 0 <= rule_id < len(registry):
+        return registry[rule_id]['text']
+    return ""
+
+def add_rule(data, text, created=None):
+    """Register a new rule and return its id"""
+    if 'rule_registry' not in data:
+        data['rule_registry'] = []
+
+    rule_id = len(data['rule_registry'])
+    data['rule_registry'].append({
+        'id': rule_id,
+        'text': text.strip(),
+        'created': created or date.today().strftime("%Y-%m-%d")
+    })
+    return rule_id
+
+def update_rule_text(data, rule_id, text):
+    """Reword a rule everywhere it is used"""
+    data['rule_registry'][rule_id]['text'] = text.strip()
+    return data
+
+def find_rule(data, text):
+    """Get the id of a registered rule with the same text (case-insensitive), or None"""
+    normalized = text.strip().lower()
+    for rule in get_rule_registry(data):
+        if rule['text'].lower() == normalized:
+            return rule['id']
+    return None
+
+def to_bits(rule_ids):
+    """Pack rule ids into an integer bitset"""
+    bits = 0
+    for rule_id in rule_ids:
+        bits |= 1 << rule_id
+    return bits
+
+def from_bits(bits):
+    """Unpack an integer bitset into a list of rule ids"""
+    rule_ids = []
+    rule_id = 0
+    while bits:
+        if bits & 1:
+            rule_ids.append(rule_id)
+        bits >>= 1
+        rule_id += 1
+    return rule_ids
+
+def is_followed(trading, rule_id):
+    """Whether the review marked a rule as followed"""
+    return bool(trading.get('rule_bits', 0) >> rule_id & 1)
+
+def compliance_counts(trading):
+    """(rules followed, rules in force) for a day's trading review"""
+    mask = trading.get('rule_mask', 0)
+    return (trading.get('rule_bits', 0) & mask).bit_count(), mask.bit_count()
+
+def compliance_rate(trading):
+    """Fraction of the day's rules followed, or None if no rules were reviewed"""
+    followed, total = compliance_counts(trading)
+    return followed / total if total else None
+
+def migrate_day_rules(data, date_key, entry):
+    """Move a day's rule texts and index-keyed compliance onto the registry
+
+    Identical rule texts on different days (ignoring case and surrounding
+    whitespace) share an id. Returns True if the day was converted; days
+    already using ids are left alone. Run by
+    :func:`journal.schema.migrate_journal` for every day of an older journal.
+    """
+    trading = entry['trading']
+    if not any(isinstance(rule, str) for rule in entry['rules']) and 'rule_compliance' not in trading:
+        return False
+
+    # Position in the old list -> registry id (empty rules were never shown)
+    position_ids = {}
+    for i, rule in enumerate(entry['rules']):
+        if isinstance(rule, int):
+            position_ids[i] = rule
+        elif rule.strip():
+            rule_id = find_rule(data, rule)
+            position_ids[i] = rule_id if rule_id is not None else add_rule(data, rule, created=date_key)
+    entry['rules'] = list(dict.fromkeys(position_ids.values()))
+
+    legacy = trading.pop('rule_compliance', None) or {}
+    in_force, followed = [], []
+    for key, ok in legacy.items():
+        position = int(key[len('rule_'):])
+        if position not in position_ids:
+            # The rule was deleted after the review; keep the result under a placeholder
+            position_ids[position] = add_rule(data, f"Rule {position + 1} (removed)", created=date_key)
+        in_force.append(position_ids[position])
+        if ok:
+            followed.append(position_ids[position])
+    if legacy:
+        trading['rule_mask'] = to_bits(in_force)
+        trading['rule_bits'] = to_bits(followed)
+    return True
@@ -0,0 +1,326 @@
+"""Journal schema: versioned shapes and the migration that produces them.
+
+The journal is one JSON object. Date keys (``YYYY-MM-DD``) hold days and a
+few fixed keys hold journal-wide records (:data:`SETTINGS_KEYS`)::
+
+    {
+      "schema_version": 1,
+      "tags": ["breakout", ...],
+      "transactions": [{"date", "type", "amount", "description", "timestamp"}, ...],
+      "account_settings": {...}, "rule_registry": [...], "session_settings": {...},
+      "risk_settings": {...},
+      "2025-09-11": {
+        "morning": {..., "morning_screenshots": [{"url", "caption"}, ...]},
+        "trade_day": {"market_observations": "", "trades": [{...}, ...], "totals": {...}, "risk": {...}},
+        "trading": {..., "trading_screenshots": [{"url", "caption"}, ...]},
+        "evening": {...},
+        "rules": [0, 3]
+      }
+    }
+
+Older versions of the app wrote other shapes: screenshots as bare URL
+strings, days missing sections (or with ``trade_day`` deleted), trades
+without tags, transactions with string amounts, rule texts instead of
+registry ids. :func:`migrate_journal` rewrites all of that in one pass when
+the journal is loaded, so code reading a migrated journal can index
+``entry['trade_day']['trades']`` and ``screenshot['url']`` directly.
+
+:class:`Day`, :class:`Trade`, :class:`Screenshot` and :class:`Transaction`
+define the shapes. The journal itself stays plain dicts (that is what is
+saved, hashed for caching and edited in place by the pages); the classes
+parse a stored record, whatever its vintage, and write it back in the
+current shape.
+
+Journals are merged by unit (:func:`unit_revisions`): the sync engine
+merges the local journal with GitHub's, and a page's save merges with
+whatever was saved since the page loaded (see :mod:`journal.storage`).
+"""
+
+import hashlib
+import json
+import uuid
+from dataclasses import dataclass, field
+
+from journal.perf import traced
+from journal.rules import migrate_day_rules
+from journal.trade_log import trade_id_from_fills
+
+SCHEMA_VERSION = 1
+
+SETTINGS_KEYS = frozenset({'schema_version', 'tags', 'transactions', 'account_settings',
+                           'rule_registry', 'session_settings', 'risk_settings'})
+
+# Fields of an imported trade that manual trades do not have
+IMPORT_FIELDS = ('raw_fills', 'symbol', 'direction', 'quantity', 'entry_price', 'exit_price', 'stop_price', 'pnl')
+
+
+def is_date_key(key):
+    """True for ``YYYY-MM-DD`` keys, i.e. journal days"""
+    return len(key) == 10 and key[4] == '-' and key[7] == '-'
+
+
+def iter_days(data):
+    """``(date_key, entry)`` for every day of a migrated journal, in stored order"""
+    for date_key, entry in data.items():
+        if is_date_key(date_key):
+            yield date_key, entry
+
+
+# Units: what the journal is merged by -- a setting, or one section of one day (``2025-09-12/trade_day``)
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, separators=(',', ':'), default=str).encode()).hexdigest()
+
+
+def unit_revisions(data):
+    """``{unit: revision id}``: each day section and each other top-level key"""
+    revisions = {}
+    for key, value in data.items():
+        if is_date_key(key) and isinstance(value, dict):
+            for section, part in value.items():
+                revisions[f"{key}/{section}"] = _digest(part)
+        else:
+            revisions[key] = _digest(value)
+    return revisions
+
+
+def get_unit(data, unit):
+    key, _, section = unit.partition('/')
+    return data[key][section] if section else data[key]
+
+
+def set_unit(data, unit, value):
+    key, _, section = unit.partition('/')
+    if section:
+        data.setdefault(key, {})[section] = value
+    else:
+        data[key] = value
+
+
+def delete_unit(data, unit):
+    key, _, section = unit.partition('/')
+    if not section:
+        data.pop(key, None)
+        return
+    day = data.get(key)
+    if day is not None:
+        day.pop(section, None)
+        if not day:
+            del data[key]
+
+
+@dataclass(slots=True)
+class Screenshot:
+    url: str
+    caption: str = ""
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Parse a stored screenshot: a ``{'url', 'caption'}`` dict or a bare URL; None if empty"""
+        if isinstance(raw, dict):
+            url, caption = raw.get('url') or "", raw.get('caption') or ""
+        elif isinstance(raw, str):
+            url, caption = raw, ""
+        else:
+            return None
+        return cls(url, caption) if url else None
+
+    def to_dict(self):
+        return {'url': self.url, 'caption': self.caption}
+
+
+def _screenshots(raw):
+    shots = (Screenshot.from_raw(shot) for shot in raw or [])
+    return [shot.to_dict() for shot in shots if shot is not None]
+
+
+@dataclass(slots=True)
+class Trade:
+    id: str
+    timestamp: str = ""
+    description: str = ""
+    tags: list = field(default_factory=list)
+    outcome: str = "pending"
+    screenshot: Screenshot | None = None
+    # Imported trades only (see journal.trade_log.create_trade_summary_from_fills)
+    imported: dict = field(default_factory=dict)
+    # Fields this version does not know about, kept as they are
+    extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_raw(cls, raw):
+        raw = dict(raw)
+        # Older sidebars wrote the day onto every trade while computing stats
+        raw.pop('date', None)
+        timestamp = raw.pop('timestamp', None) or ""
+        description = raw.pop('description', None) or ""
+        trade_id = raw.pop('id', None)
+        if not trade_id:
+            # Derived from the trade itself, so migrating the same old trade twice gives one id
+            trade_id = (trade_id_from_fills(raw['raw_fills']) if raw.get('raw_fills')
+                        else str(uuid.uuid5(uuid.NAMESPACE_OID, f"{timestamp}|{description}")))
+        tags = raw.pop('tags', None)
+        return cls(
+            id=trade_id,
+            timestamp=timestamp,
+            description=description,
+            tags=[tag for tag in tags if tag] if isinstance(tags, list) else [],
+            outcome=raw.pop('outcome', None) or "pending",
+            screenshot=Screenshot.from_raw(raw.pop('screenshot', None)),
+            imported={name: raw.pop(name) for name in IMPORT_FIELDS if name in raw},
+            extra=raw,
+        )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'timestamp': self.timestamp,
+            'description': self.description,
+            'tags': self.tags,
+            'outcome': self.outcome,
+            'screenshot': self.screenshot.to_dict() if self.screenshot else None,
+            **self.imported,
+            **self.extra,
+        }
+
+
+DAY_FIELDS = ('morning', 'trade_day', 'trading', 'evening', 'rules')
+TRADE_DAY_FIELDS = ('market_observations', 'trades', 'totals', 'risk')
+
+
+@dataclass(slots=True)
+class Day:
+    morning: dict = field(default_factory=dict)
+    market_observations: str = ""
+    trades: list = field(default_factory=list)
+    totals: dict | None = None
+    risk: dict | None = None
+    trading: dict = field(default_factory=dict)
+    evening: dict = field(default_factory=dict)
+    rules: list = field(default_factory=list)
+    # Day and trade_day fields this version does not know about, kept as they are
+    extra: dict = field(default_factory=dict)
+    trade_day_extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Parse a stored day of any version (an empty day if it is not one)"""
+        if not isinstance(raw, dict):
+            return cls()
+        trade_day = raw.get('trade_day') if isinstance(raw.get('trade_day'), dict) else {}
+        extra = {key: value for key, value in raw.items() if key not in DAY_FIELDS}
+        trade_day_extra = {key: value for key, value in trade_day.items() if key not in TRADE_DAY_FIELDS}
+        morning = dict(raw.get('morning') or {})
+        trading = dict(raw.get('trading') or {})
+        if 'morning_screenshots' in morning:
+            morning['morning_screenshots'] = _screenshots(morning['morning_screenshots'])
+        if 'trading_screenshots' in trading:
+            trading['trading_screenshots'] = _screenshots(trading['trading_screenshots'])
+        return cls(
+            morning=morning,
+            market_observations=trade_day.get('market_observations') or "",
+            trades=[Trade.from_raw(trade) for trade in trade_day.get('trades') or [] if isinstance(trade, dict)],
+            totals=trade_day.get('totals'),
+            risk=trade_day.get('risk'),
+            trading=trading,
+            evening=dict(raw.get('evening') or {}),
+            rules=list(raw.get('rules') or []),
+            extra=extra,
+            trade_day_extra=trade_day_extra,
+        )
+
+    def to_dict(self):
+        trade_day = {'market_observations': self.market_observations,
+                     'trades': [trade.to_dict() for trade in self.trades]}
+        if self.totals:
+            trade_day['totals'] = self.totals
+        if self.risk:
+            trade_day['risk'] = self.risk
+        trade_day.update(self.trade_day_extra)
+        return {
+            'morning': self.morning,
+            'trade_day': trade_day,
+            'trading': self.trading,
+            'evening': self.evening,
+            'rules': self.rules,
+            **self.extra,
+        }
+
+
+@dataclass(slots=True)
+class Transaction:
+    date: str
+    type: str
+    amount: float
+    description: str = ""
+    timestamp: str = ""
+
+    @classmethod
+    def from_raw(cls, raw):
+        return cls(
+            date=str(raw['date'])[:10],
+            type=raw['type'],
+            amount=float(raw['amount']),
+            description=raw.get('description') or "",
+            timestamp=raw.get('timestamp') or "",
+        )
+
+    def to_dict(self):
+        return {'date': self.date, 'type': self.type, 'amount': self.amount,
+                'description': self.description, 'timestamp': self.timestamp}
+
+
+def normalize_day(raw):
+    """A stored day in the current shape (rule texts are left to the migration)"""
+    return Day.from_raw(raw).to_dict()
+
+
+def _settings_v1(data):
+    """Journal-wide records: tags and transactions as clean lists, settings as dicts"""
+    data['tags'] = [tag for tag in data.get('tags') or [] if isinstance(tag, str) and tag.strip()]
+    data['transactions'] = sorted(
+        (Transaction.from_raw(transaction).to_dict() for transaction in data.get('transactions') or []),
+        key=lambda transaction: transaction['date'])
+    for key in ('account_settings', 'session_settings', 'risk_settings'):
+        if key in data and not isinstance(data[key], dict):
+            del data[key]
+
+
+def _day_v1(data, date_key, entry):
+    entry = normalize_day(entry)
+    migrate_day_rules(data, date_key, entry)
+    return entry
+
+
+# (version, journal-wide step, per-day step): a journal at version v runs the
+# steps of every later version, with all day steps applied in the same pass
+MIGRATIONS = [
+    (1, _settings_v1, _day_v1),
+]
+
+
+@traced()
+def migrate_journal(data):
+    """Bring a loaded journal up to :data:`SCHEMA_VERSION` in place
+
+    Returns True if anything was migrated (the change is saved with the
+    next save). A journal already at the current version is left alone
+    without looking at its days.
+    """
+    version = data.get('schema_version', 0)
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Journal schema version {version} is newer than this app supports")
+    steps = [step for step in MIGRATIONS if step[0] > version]
+    if not steps:
+        return False
+
+    for _, settings_step, _ in steps:
+        settings_step(data)
+    # Days in date order, so legacy rules get registry ids in the order they first appeared
+    for date_key in sorted(key for key in data if is_date_key(key)):
+        entry = data[date_key]
+        for _, _, day_step in steps:
+            entry = day_step(data, date_key, entry)
+        data[date_key] = entry
+    data['schema_version'] = SCHEMA_VERSION
+    return True
@@ -0,0 +1,96 @@
+"""Exchange session calendar: which journal date a fill belongs to.
+
+Futures trade nearly around the clock. On CME Globex the trading day for a
+date starts at 17:00 Central the evening before, so a fill at 18:30 CT on
+Tuesday belongs to Wednesday's session and Sunday evening belongs to
+Monday. :class:`SessionCalendar` turns broker timestamps (written in the
+trading platform's time zone) into those session dates.
+
+The calendar is configured per journal in ``data['session_settings']``.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+DEFAULT_SESSION_SETTINGS = {
+    'log_timezone': "America/New_York",
+    'exchange_timezone': "America/Chicago",
+    'roll_time': "17:00",
+}
+
+TIMESTAMP_FORMATS = (
+    "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M",
+    # US locale exports (NinjaTrader, Tradovate): 9/12/2025 9:31:05 AM
+    "%m/%d/%Y %I:%M:%S %p", "%m/%d/%Y %I:%M %p", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M",
+)
+
+
+def parse_timestamp(timestamp):
+    """Parse a broker or journal timestamp (Sierra Chart puts two spaces after the date)"""
+    text = " ".join(timestamp.split())
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def sortable_timestamp(timestamp):
+    """``timestamp`` as text that sorts chronologically, whatever its format
+
+    ISO timestamps are already in order once their spacing is normalised; US
+    locale ones are rewritten as ISO. Anything unreadable is left as it is.
+    """
+    text = " ".join(timestamp.split())
+    if text[4:5] == '-':
+        return text
+    parsed = parse_timestamp(text)
+    return parsed.isoformat(sep=' ', timespec='microseconds') if parsed else text
+
+
+@dataclass(frozen=True)
+class SessionCalendar:
+    log_timezone: str = DEFAULT_SESSION_SETTINGS['log_timezone']
+    exchange_timezone: str = DEFAULT_SESSION_SETTINGS['exchange_timezone']
+    roll_time: str = DEFAULT_SESSION_SETTINGS['roll_time']
+
+    @classmethod
+    def from_settings(cls, data):
+        """The journal's calendar, falling back to CME defaults"""
+        settings = {**DEFAULT_SESSION_SETTINGS, **data.get('session_settings', {})}
+        return cls(settings['log_timezone'], settings['exchange_timezone'], settings['roll_time'])
+
+    def session_date(self, timestamp):
+        """Trading date for a timestamp string, or None if it cannot be parsed
+
+        Times at or after the roll time (exchange clock) count toward the
+        next day, and sessions that would land on a weekend move to Monday.
+        """
+        moment = parse_timestamp(timestamp)
+        if moment is None:
+            return None
+        exchange_time = moment.replace(tzinfo=ZoneInfo(self.log_timezone)).astimezone(ZoneInfo(self.exchange_timezone))
+
+        hour, minute = (int(part) for part in self.roll_time.split(':'))
+        session = exchange_time.date()
+        if exchange_time.time() >= time(hour, minute):
+            session += timedelta(days=1)
+        while session.weekday() >= 5:
+            session += timedelta(days=1)
+        return session
+
+    def session_date_key(self, timestamp):
+        session = self.session_date(timestamp)
+        return session.strftime("%Y-%m-%d") if session else ""
+
+
+def save_session_settings(data, log_timezone, exchange_timezone, roll_time):
+    """Save the journal's session calendar"""
+    data['session_settings'] = {
+        'log_timezone': log_timezone,
+        'exchange_timezone': exchange_timezone,
+        'roll_time': roll_time,
+    }
+    return data
@@ -0,0 +1,535 @@
+"""Sidebar sections: account balance, date selection, navigation and stats.
+
+Sections that hold their own widgets are ``st.fragment`` s, so editing the
+balance settings or attaching an import file only reruns that section. They
+are called inside ``with st.sidebar:`` and therefore write with ``st.*``
+rather than ``st.sidebar.*`` (a fragment may only write to its own
+container).
+"""
+
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import streamlit as st
+
+from journal.account import (
+    calculate_running_balance,
+    calculate_total_deposits,
+    calculate_total_withdrawals,
+    get_account_settings,
+    save_account_settings,
+)
+from journal.backup import backup_bytes, merge_backup, read_backup
+from journal.entries import get_date_key, get_trade_statistics
+from journal.pages import PAGES
+from journal.perf import startup, to_jsonl, to_otlp_json, traced, tracer
+from journal.reconcile import day_pnl, reconcile_journal
+from journal.risk import evaluate_from
+from journal.rules import compliance_counts
+from journal.storage import save_local_data, storage_backend
+from journal.sync import sync_engine
+from journal.ui import rerun_fragment
+
+NAV_KEYS = {
+    "📊 Calendar View": "nav_calendar",
+    "🌅 Morning Prep": "nav_morning",
+    "📈 Trade Day": "nav_trade_day",
+    "📈 Trading Review": "nav_trading",
+    "🌙 Evening Recap": "nav_evening",
+    "📚 Historical Analysis": "nav_history",
+    "🧠 Psychology": "nav_psychology",
+    "📄 Reports": "nav_reports",
+    "💰 Balance & Ledger": "nav_balance_history",
+    "🏷️ Tag Management": "nav_tag_management",
+}
+
+
+@traced()
+def render_account_balance(data):
+    """Account balance display plus setup/manage controls"""
+    st.sidebar.title("💰 Account Balance")
+
+    account_settings = get_account_settings(data)
+
+    with st.sidebar:
+        if not account_settings.get('starting_balance') or not account_settings.get('start_date'):
+            _setup_account_tracking(data, account_settings)
+        else:
+            _balance_display(data, account_settings)
+            _manage_balance(data, account_settings)
+
+
+@st.fragment
+def _setup_account_tracking(data, account_settings):
+    with st.expander("⚙️ Setup Account Tracking", expanded=True):
+        starting_balance = st.number_input(
+            "Starting Balance ($)",
+            min_value=0.0,
+            value=account_settings.get('starting_balance', 10000.0),
+            step=100.0,
+            format="%.2f"
+        )
+
+        start_date = st.date_input(
+            "Start Date",
+            value=datetime.strptime(account_settings.get('start_date', date.today().strftime("%Y-%m-%d")), "%Y-%m-%d").date() if account_settings.get('start_date') else date.today(),
+            max_value=date.today()
+        )
+
+        commission = _commission_input(account_settings, key="setup_commission")
+
+        if st.button("💾 Save Balance Settings", key="save_balance_settings"):
+            data = save_account_settings(data, starting_balance, start_date, commission)
+            reconcile_journal(data)
+            evaluate_from(data, "")
+
+            # Save to storage
+            save_local_data(data)
+            st.success("✅ Balance settings saved!")
+
+            st.rerun()
+
+
+def _balance_display(data, account_settings):
+    starting_balance = account_settings['starting_balance']
+    start_date_obj = datetime.strptime(account_settings['start_date'], "%Y-%m-%d").date()
+
+    # Calculate current balance
+    current_balance = calculate_running_balance(data, st.session_state.current_date, starting_balance, start_date_obj)
+
+    # Display balance with styling
+    balance_change = current_balance - starting_balance
+    balance_color = "#00ff88" if balance_change > 0 else "#ff4444" if balance_change < 0 else "#64ffda"
+    change_symbol = "↗" if balance_change > 0 else "↘" if balance_change < 0 else "→"
+
+    st.markdown(f"""
+    <div class="balance-display">
+        <div style="font-size: 1rem; color: #aaa;">Current Balance</div>
+        <div class="balance-amount" style="color: {balance_color};">
+            ${current_balance:,.2f} {change_symbol}
+        </div>
+        <div style="font-size: 0.9rem; color: #aaa;">
+            {change_symbol} ${abs(balance_change):,.2f} from start
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+def _commission_input(account_settings, key):
+    return st.number_input(
+        "Commission per Contract, Round Turn ($)",
+        min_value=0.0,
+        value=float(account_settings.get('commission_per_contract', 0.0)),
+        step=0.05,
+        format="%.2f",
+        help="Deducted from the P&L of imported trades",
+        key=key
+    )
+
+
+@st.fragment
+def _manage_balance(data, account_settings):
+    starting_balance = account_settings['starting_balance']
+    start_date_str = account_settings['start_date']
+    start_date_obj = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+
+    with st.expander("⚙️ Manage Balance"):
+        st.write(f"**Start Date:** {start_date_str}")
+        st.write(f"**Starting Balance:** ${starting_balance:,.2f}")
+
+        # Show transaction summary
+        total_deposits = calculate_total_deposits(data, st.session_state.current_date)
+        total_withdrawals = calculate_total_withdrawals(data, st.session_state.current_date)
+
+        st.write(f"**Total Deposits:** ${total_deposits:,.2f}")
+        st.write(f"**Total Withdrawals:** ${total_withdrawals:,.2f}")
+
+        # Option to reset/update
+        new_starting_balance = st.number_input(
+            "Update Starting Balance ($)",
+            min_value=0.0,
+            value=starting_balance,
+            step=100.0,
+            format="%.2f"
+        )
+
+        new_start_date = st.date_input(
+            "Update Start Date",
+            value=start_date_obj,
+            max_value=date.today()
+        )
+
+        new_commission = _commission_input(account_settings, key="update_commission")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("💾 Update", key="update_balance"):
+                data = save_account_settings(data, new_starting_balance, new_start_date, new_commission)
+                # Net P&L of days with imported trades depends on the commission, and the risk rules on both
+                reconcile_journal(data)
+                evaluate_from(data, "")
+
+                # Save to storage
+                save_local_data(data)
+                st.success("Updated!")
+                st.rerun()
+
+        with col2:
+            if st.button("🗑️ Reset", key="reset_balance"):
+                if 'account_settings' in data:
+                    del data['account_settings']
+                # Totals and risk were computed with the old commission and starting balance
+                reconcile_journal(data)
+                evaluate_from(data, "")
+
+                # Save to storage
+                save_local_data(data)
+                st.success("Reset!")
+                st.rerun()
+
+
+def render_date_selector():
+    """Date picker above the navigation menu; returns the selected date"""
+    st.sidebar.markdown("---")
+    st.sidebar.title("📅 Date Selection")
+    selected_date = st.sidebar.date_input(
+        "Select Date",
+        value=st.session_state.current_date,
+        key="date_selector"
+    )
+
+    # Update current date when changed
+    if selected_date != st.session_state.current_date:
+        st.session_state.current_date = selected_date
+
+    return selected_date
+
+
+def render_navigation():
+    """Navigation buttons; returns the page to render"""
+    st.sidebar.markdown("---")
+    st.sidebar.title("📋 Navigation")
+
+    for page in PAGES:
+        if st.sidebar.button(page, key=NAV_KEYS[page], use_container_width=True):
+            st.session_state.page = page
+
+    return st.session_state.page
+
+
+# Calculate stats for different periods
+def calculate_period_stats(data, days):
+    period_data = {}
+    current_date = date.today()
+    for i in range(days):
+        check_date = current_date - timedelta(days=i)
+        date_key = get_date_key(check_date)
+        if date_key in data:
+            period_data[date_key] = data[date_key]
+    return period_data
+
+
+def get_period_metrics(period_data):
+    if not period_data:
+        return 0, 0
+
+    total_pnl = sum(day_pnl(entry) for entry in period_data.values())
+
+    # Calculate EXACT rule compliance percentage (total rules followed / total rules)
+    total_rules_followed = 0
+    total_rules_possible = 0
+
+    for entry in period_data.values():
+        # Count how many rules were followed vs total rules for this day (0/0 without a review)
+        rules_followed_today, total_rules_today = compliance_counts(entry['trading'])
+
+        total_rules_followed += rules_followed_today
+        total_rules_possible += total_rules_today
+
+    # Calculate exact percentage of all rules followed
+    overall_compliance = (total_rules_followed / total_rules_possible * 100) if total_rules_possible > 0 else 0
+    return total_pnl, overall_compliance
+
+
+# Calculate average grade from recent trading reviews
+def get_recent_grades(period_data):
+    grades = []
+    for entry in period_data.values():
+        grade = entry['trading'].get('process_grade')
+        if grade:
+            grades.append(grade)
+    return grades
+
+
+@traced()
+def render_quick_stats(data):
+    """5/30-day P&L, rule compliance, process grade trend and trade stats"""
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("📊 Quick Stats")
+
+    # 5-day and 30-day stats
+    recent_5_data = calculate_period_stats(data, 5)
+    recent_30_data = calculate_period_stats(data, 30)
+
+    # Get metrics
+    pnl_5, compliance_5 = get_period_metrics(recent_5_data)
+    pnl_30, compliance_30 = get_period_metrics(recent_30_data)
+
+    # Get recent grades for trending
+    recent_grades = get_recent_grades(recent_30_data)
+    if recent_grades:
+        # Count frequency of each grade
+        grade_counts = Counter(recent_grades)
+        most_common_grade = grade_counts.most_common(1)[0][0]
+
+        # For display, show the trend of recent grades
+        recent_5_grades = get_recent_grades(recent_5_data)
+        if len(recent_5_grades) >= 2:
+            latest_grade_trend = Counter(recent_5_grades).most_common(1)[0][0]
+        else:
+            latest_grade_trend = most_common_grade
+    else:
+        latest_grade_trend = "N/A"
+
+    # Display metrics in organized way
+    st.sidebar.markdown("**📈 Last 5 Days**")
+    col1, col2 = st.sidebar.columns(2)
+    with col1:
+        st.metric("P&L", f"${pnl_5:.2f}")
+    with col2:
+        st.metric("Rules", f"{compliance_5:.1f}%")
+
+    st.sidebar.markdown("**📊 Last 30 Days**")
+    col1, col2 = st.sidebar.columns(2)
+    with col1:
+        st.metric("P&L", f"${pnl_30:.2f}")
+    with col2:
+        st.metric("Rules", f"{compliance_30:.1f}%")
+
+    # Process Grade Trend
+    st.sidebar.markdown("**🎯 Process Grade**")
+    if recent_grades:
+        grade_color = {
+            "A": "green",
+            "B": "blue",
+            "C": "orange",
+            "D": "red",
+            "F": "darkred"
+        }.get(latest_grade_trend, "gray")
+
+        st.sidebar.markdown(f"Recent Trend: <span style='color: {grade_color}; font-weight: bold; font-size: 1.2em'>{latest_grade_trend}</span>", unsafe_allow_html=True)
+        if len(recent_grades) > 1:
+            st.sidebar.write(f"Last {len(recent_grades)} grades: {' → '.join(recent_grades[-5:])}")
+    else:
+        st.sidebar.write("No grades yet")
+
+    # Display trade stats in sidebar if available
+    trade_stats = get_trade_statistics(data)
+    if trade_stats and trade_stats['total_trades'] > 0:
+        st.sidebar.markdown("**🏷️ Trade Stats**")
+        col1, col2 = st.sidebar.columns(2)
+        with col1:
+            st.metric("Total Trades", trade_stats['total_trades'])
+        with col2:
+            st.metric("Win Rate", f"{trade_stats['win_rate']:.1f}%")
+
+        if trade_stats['recent_trades']:
+            latest_outcome = trade_stats['recent_trades'][0].get('outcome', 'pending').upper()
+            outcome_emoji = {'WIN': '✅', 'LOSS': '❌', 'PENDING': '⏳'}.get(latest_outcome, '❓')
+            st.sidebar.write(f"**Latest:** {outcome_emoji} {latest_outcome}")
+
+
+@traced()
+def render_data_management(data):
+    """Export/Import controls"""
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("💾 Data Management")
+
+    with st.sidebar:
+        _data_management(data)
+
+
+@st.cache_data(show_spinner="Building the backup...", max_entries=1)
+def _backup_download(revision, _data):
+    """The backup of the journal as saved at ``revision``"""
+    return backup_bytes(_data)
+
+
+@st.cache_data(show_spinner="Building the tables...", max_entries=1)
+def _tables_download(revision, _data):
+    """The table export of the journal as saved at ``revision``"""
+    # Imported here: pandas would otherwise load on every cold start
+    from journal.tables import tables_zip
+
+    return tables_zip(_data)
+
+
+@st.fragment
+def _data_management(data):
+    # Built once asked for, then again only after the journal is saved, not on every rerun
+    if st.checkbox("📤 Export Data", key="export_backup"):
+        st.download_button(
+            label="Download Backup",
+            data=_backup_download(data.revision, data),
+            file_name=f"trading_journal_{date.today().strftime('%Y%m%d')}.jsonl.gz",
+            mime="application/gzip"
+        )
+
+    if st.checkbox("📊 Export Tables", key="export_tables",
+                   help="Days, trades, tags, fills and transactions as Parquet and CSV, by month"):
+        st.download_button(
+            label="Download Tables (.zip)",
+            data=_tables_download(data.revision, data),
+            file_name=f"trading_journal_tables_{date.today().strftime('%Y%m%d')}.zip",
+            mime="application/zip"
+        )
+
+    # A new uploader key after each import clears the file, so it is merged once
+    upload_key = f"import_backup_{st.session_state.get('import_backup_count', 0)}"
+    uploaded_file = st.file_uploader("📥 Import Data", type=['gz', 'jsonl', 'json'], key=upload_key,
+                                     help="A backup (.jsonl.gz) or an export from an older version (.json); "
+                                          "it is merged into the journal, nothing is deleted")
+    if uploaded_file is not None and st.button("🔀 Merge into Journal", key="merge_backup"):
+        try:
+            counts = merge_backup(data, read_backup(uploaded_file))
+        except (ValueError, KeyError, OSError, EOFError) as e:
+            st.error(f"Error importing data: {e}")
+            return
+
+        # One write for the whole import
+        save_local_data(data)
+
+        st.session_state.import_backup_count = st.session_state.get('import_backup_count', 0) + 1
+        st.success(f"Imported: {counts['days_added']} new days, {counts['days_merged']} merged, "
+                   f"{counts['trades_added']} trades added, {counts['trades_merged']} updated")
+        st.rerun()
+
+
+@traced()
+def render_cloud_status():
+    """GitHub status at the very bottom of the sidebar"""
+    st.sidebar.markdown("---")
+    st.sidebar.title("☁️ Cloud Storage")
+    if st.session_state.get('github_connected', False):
+        st.sidebar.success("✅ Connected to GitHub")
+        repo_url = f"https://github.com/{st.session_state.repo_owner}/{st.session_state.repo_name}"
+        st.sidebar.markdown(f"🔗 [View Repository]({repo_url})")
+        screenshots_url = f"{repo_url}/tree/main/screenshots"
+        st.sidebar.markdown(f"📸 [View Screenshots]({screenshots_url})")
+        engine = sync_engine(st.session_state.github_storage)
+        if engine is not None:
+            _sync_status(engine)
+        _api_budget(st.session_state.github_storage.rate_limit())
+        last_error = st.session_state.github_storage.last_error
+        if last_error is not None:
+            st.sidebar.caption(f"⚠️ Last GitHub error: {last_error}")
+    else:
+        st.sidebar.warning("⚠️ GitHub not connected")
+    _local_storage_status(storage_backend())
+
+
+def _local_storage_status(backend):
+    """Which local backend saves go to; for a git working copy, what is still to be pushed"""
+    if backend.name != "git":
+        return
+    status = backend.status()
+    line = f"💾 Local git repository · `{(status['head'] or '')[:7] or 'no commits'}`"
+    if status['remote'] and status['unpushed']:
+        line += f" · {status['unpushed']} commit{'s' if status['unpushed'] != 1 else ''} to push"
+    elif status['remote'] and status['unpushed'] == 0:
+        line += f" · pushed to {status['remote']}"
+    st.sidebar.caption(line)
+    if status['push_error']:
+        st.sidebar.caption(f"⚠️ Push failed (retrying): {status['push_error']}")
+
+
+def _sync_status(engine):
+    """Whether GitHub has this device's saves, and which units were changed on both sides"""
+    status = engine.status()
+    last_sync = (datetime.fromtimestamp(status['last_sync']).strftime('%H:%M:%S')
+                 if status['last_sync'] else "never")
+    line = {
+        'synced': "🔄 Synced",
+        'pending': "🔄 Local changes waiting to sync",
+        'syncing': "🔄 Syncing…",
+        'offline': "📴 Offline: saving locally",
+        'error': "⚠️ Sync failed: saving locally",
+    }[status['state']]
+    st.sidebar.caption(f"{line} · last sync {last_sync}")
+    if status['error'] and status['state'] in ('offline', 'error'):
+        st.sidebar.caption(status['error'])
+    conflicts = status['conflicts']
+    if conflicts:
+        with st.sidebar.expander(f"⚠️ {len(conflicts)} sync conflict{'s' if len(conflicts) != 1 else ''}"):
+            st.caption("Changed here and on another device; this device's version was kept. "
+                       "The other version is below.")
+            for conflict in reversed(conflicts):
+                st.markdown(f"**{conflict['unit']}** · "
+                            f"{datetime.fromtimestamp(conflict['time']).strftime('%Y-%m-%d %H:%M')}")
+                st.json(conflict['remote'], expanded=False)
+            if st.button("Dismiss", key="dismiss_sync_conflicts"):
+                engine.dismiss_conflicts()
+                st.rerun()
+
+
+def _api_budget(budget):
+    """Remaining GitHub API requests this hour, and when syncing resumes when it ran out"""
+    if not budget or budget['remaining'] is None:
+        return
+    limit = budget['limit'] or 1
+    reset = f" · resets {datetime.fromtimestamp(budget['reset']).strftime('%H:%M')}" if budget['reset'] else ""
+    st.sidebar.progress(min(budget['remaining'] / limit, 1.0),
+                        text=f"API budget: {budget['remaining']:,} / {limit:,}{reset}")
+    exhausted = budget['blocked_until'] or (budget['remaining'] == 0 and budget['reset'])
+    if exhausted:
+        until = datetime.fromtimestamp(exhausted).strftime('%H:%M:%S')
+        st.sidebar.warning(f"⏳ GitHub rate limit reached: syncing resumes at {until}")
+    if budget['deferred']:
+        st.sidebar.caption(f"{budget['deferred']} background requests deferred to save budget")
+
+
+def render_performance_panel():
+    """Span timings for the last run and call counts since the process started"""
+    with st.sidebar:
+        with st.expander("⏱ Performance"):
+            _performance_panel()
+
+
+@st.fragment
+def _performance_panel():
+    run = tracer.run_spans()
+    if run:
+        depth = {}
+        rows = []
+        for record in run:
+            depth[record['span_id']] = depth.get(record['parent_id'], -1) + 1
+            label = record['name'] + (f" ({', '.join(record['attributes'].values())})" if record['attributes'] else "")
+            rows.append({
+                'span': "\u00a0\u00a0" * depth[record['span_id']] + label,
+                'ms': round(record['duration_ns'] / 1e6, 1),
+            })
+        st.caption(f"Last run: {rows[0]['ms']:.0f} ms")
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+    totals = sorted(tracer.summary().items(), key=lambda item: item[1]['total_s'], reverse=True)
+    if totals:
+        st.caption("Since start")
+        st.dataframe([{
+            'span': name,
+            'calls': stats['calls'],
+            'total ms': round(stats['total_s'] * 1000, 1),
+            'mean ms': round(stats['total_s'] / stats['calls'] * 1000, 2),
+            'max ms': round(stats['max_s'] * 1000, 1),
+        } for name, stats in totals], hide_index=True, use_container_width=True)
+
+    st.caption("Startup")
+    st.json(startup.as_dict(), expanded=False)
+
+    if st.checkbox("Prepare trace export", key="perf_export"):
+        spans = tracer.all_spans()
+        st.download_button("⬇️ Spans (JSON lines)", to_jsonl(spans), file_name="journal_spans.jsonl", mime="application/x-ndjson")
+        st.download_button("⬇️ Trace (OpenTelemetry JSON)", to_otlp_json(spans), file_name="journal_trace.json", mime="application/json")
+
+    if st.button("Reset timings", key="perf_reset"):
+        tracer.reset()
+        rerun_fragment()
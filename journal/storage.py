@@ -0,0 +1,427 @@
+"""Persistence for the journal behind one storage interface.
+
+A :class:`StorageBackend` keeps the journal file and its screenshots:
+
+- :class:`LocalDirectoryBackend`: plain files in a directory (the default);
+- :class:`journal.git_storage.LocalGitBackend`: a local git working copy,
+  every save a commit made in-process, pushed in batches in the background;
+- :class:`GitHubStorage`: a GitHub repository over the REST Contents API.
+
+The local backend -- the file every page saves to with
+:func:`save_local_data` -- is chosen per process with ``JOURNAL_STORAGE``
+(``directory`` or ``git``) and ``JOURNAL_DATA_DIR`` (default: the working
+directory, or :data:`GIT_DATA_DIR` for ``git`` so the journal's commits stay
+out of the app's own checkout); see :func:`storage_backend`. Each backend works on its own, so
+the storage layer can be exercised offline against a scratch directory.
+A journal loaded with :func:`load_local_data` remembers what it was loaded
+from, so saving it after the file changed underneath keeps those changes in
+the sections it did not edit.
+
+GitHub access goes through :class:`journal.github_client.GitHubClient`
+(pooled connections, timeouts, :class:`~journal.github_client.GitHubError`);
+the methods here keep returning None/False on failure, as the pages expect,
+and leave the error in :attr:`GitHubStorage.last_error`.
+"""
+
+import json
+import os
+import threading
+
+from journal.github_client import API_URL, WRITE, GitHubClient, GitHubError
+from journal.perf import traced
+from journal.reconcile import reconcile_days, reconcile_journal
+from journal.risk import evaluate_from
+from journal.schema import Day, delete_unit, get_unit, migrate_journal, set_unit, unit_revisions
+
+DATA_FILE = "trading_journal_data.json"
+
+# Default working copy of the git backend
+GIT_DATA_DIR = "journal-data"
+
+
+class StorageBackend:
+    """Where the journal and its files live
+
+    ``load`` returns the journal (``{}`` when there is none), ``save``
+    writes it and returns True on success, ``save_file`` stores the bytes
+    of a file such as a screenshot under a repository-relative path and
+    returns a reference the app can display (a path or URL, None on
+    failure), and ``revision`` is a cheap token that changes whenever the
+    journal does.
+    """
+
+    name = ""
+
+    def load(self):
+        raise NotImplementedError
+
+    def save(self, data, message=None):
+        raise NotImplementedError
+
+    def save_file(self, path, raw, message=None):
+        raise NotImplementedError
+
+    def revision(self):
+        raise NotImplementedError
+
+
+class LocalDirectoryBackend(StorageBackend):
+    """The journal file and screenshots as plain files under ``root``"""
+
+    name = "directory"
+
+    def __init__(self, root="."):
+        self.root = root
+
+    def path(self, path):
+        return os.path.normpath(os.path.join(self.root, path))
+
+    def load(self):
+        try:
+            return json.loads(self.load_raw())
+        except (OSError, ValueError):
+            return {}
+
+    def load_raw(self):
+        """The journal file's bytes (OSError if there is none)"""
+        with open(self.path(DATA_FILE), 'rb') as f:
+            return f.read()
+
+    def save(self, data, message=None):
+        return self.save_raw(json.dumps(data, indent=2, default=str).encode(), message)
+
+    def save_raw(self, raw, message=None):
+        """Write the journal file's bytes as they are"""
+        self._write(DATA_FILE, raw)
+        return True
+
+    def save_file(self, path, raw, message=None):
+        self._write(path, raw)
+        return self.path(path)
+
+    def _write(self, path, raw):
+        target = self.path(path)
+        directory = os.path.dirname(target)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Replace, never truncate: a crash mid-save leaves the previous file
+        tmp = target + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp, target)
+
+    def revision(self):
+        """mtime and size of the journal file"""
+        try:
+            stat = os.stat(self.path(DATA_FILE))
+        except OSError:
+            return "empty"
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+class GitHubStorage(StorageBackend):
+    name = "github"
+
+    def __init__(self):
+        self.token = None
+        self.repo_owner = None
+        self.repo_name = None
+        self.connected = False
+        self.base_url = API_URL
+        self.data_sha = None
+        self.client = None
+        self.last_error = None
+
+    def connect(self, token, repo_owner, repo_name):
+        """Connect to GitHub repository"""
+        self.token = token
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        if self.client is not None:
+            self.client.close()
+        self.client = GitHubClient(token, repo_owner, repo_name, self.base_url)
+
+        # Test connection
+        try:
+            self.client.repository()
+        except GitHubError as e:
+            self.last_error = e
+            return False
+        self.connected = True
+        self.last_error = None
+        return True
+
+    def rate_limit(self):
+        """The token's API budget (see :meth:`journal.github_client.RateLimit.snapshot`), None before connecting"""
+        return self.client.rate_limit.snapshot() if self.client is not None else None
+
+    @traced("github.get_file_content")
+    def get_file_content(self, file_path):
+        """Get file content from GitHub repo"""
+        if not self.connected:
+            return None
+
+        try:
+            raw, sha = self.client.get_contents(file_path)
+            if raw is None:
+                return None, None
+            return json.loads(raw), sha
+        except (GitHubError, ValueError) as e:
+            self.last_error = e
+            return None, None
+
+    @traced("github.save_file_content")
+    def save_file_content(self, file_path, content, sha=None, message=None):
+        """Save file content to GitHub repo"""
+        if not self.connected:
+            return False
+
+        raw = json.dumps(content, indent=2, default=str).encode()
+        try:
+            new_sha = self.client.put_contents(file_path, raw, message or f'Update {file_path}', sha)
+        except GitHubError as e:
+            self.last_error = e
+            return False
+        if file_path == DATA_FILE:
+            self.data_sha = new_sha
+        self.last_error = None
+        return True
+
+    @traced("github.upload_screenshot")
+    def upload_screenshot(self, image_data, filename, date_key):
+        """Upload screenshot to GitHub repo"""
+        return self.save_file(f"screenshots/{date_key}/{filename}", image_data, f'Add screenshot {filename}')
+
+    def save_file(self, path, raw, message=None):
+        if not self.connected:
+            return None
+        try:
+            self.client.put_contents(path, raw, message or f'Add {path}')
+        except GitHubError as e:
+            self.last_error = e
+            return None
+        # Return the raw content URL for direct access
+        return f"https://raw.githubusercontent.com/{self.repo_owner}/{self.repo_name}/main/{path}"
+
+    def revision(self):
+        """Blob SHA of the journal file as last loaded or saved"""
+        return self.data_sha
+
+    @traced("github.load_all_journal_data")
+    def load_all_journal_data(self):
+        """Load all journal data from GitHub repo"""
+        if not self.connected:
+            return {}
+
+        # Try to get the main data file; its blob SHA doubles as the revision
+        data, self.data_sha = self.get_file_content(DATA_FILE)
+        return data if data else {}
+
+    @traced("github.save_journal_entry")
+    def save_journal_entry(self, date_key, entry_data, all_data):
+        """Save journal entry to GitHub repo"""
+        return self.save(all_data, f"Update {date_key}")
+
+    def load(self):
+        return self.load_all_journal_data()
+
+    def save(self, data, message=None):
+        """Save the journal
+
+        Writes over the SHA the journal was loaded (or last saved) with; if
+        the file changed on GitHub since, the current SHA is read and the
+        save repeated, so the app's copy wins as before.
+        """
+        if not self.connected:
+            return False
+
+        if self.data_sha is not None:
+            if self.save_file_content(DATA_FILE, data, self.data_sha, message):
+                return True
+            if not self.last_error.conflict:
+                return False
+        # Unknown or stale SHA: read the current one from the listing (without downloading the file)
+        try:
+            self.data_sha = self.client.list_directory(priority=WRITE).get(DATA_FILE)
+        except GitHubError as e:
+            self.last_error = e
+            return False
+        return self.save_file_content(DATA_FILE, data, self.data_sha, message)
+
+
+# The process's local backend, chosen from the environment on first use
+_backend = None
+_backend_lock = threading.Lock()
+
+# Held while the local journal is written; the sync engine holds it to write only if nothing was saved meanwhile
+local_write_lock = threading.RLock()
+
+
+def storage_backend():
+    """The local backend every page saves to (see the module docstring)"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            kind = os.environ.get("JOURNAL_STORAGE", "directory")
+            root = os.environ.get("JOURNAL_DATA_DIR", GIT_DATA_DIR if kind == "git" else ".")
+            if kind == "git":
+                from journal.git_storage import LocalGitBackend
+
+                _backend = LocalGitBackend(root)
+                _backend.start_pushing()
+            elif kind == "directory":
+                _backend = LocalDirectoryBackend(root)
+            else:
+                raise ValueError(f"JOURNAL_STORAGE must be 'directory' or 'git', not {kind!r}")
+        return _backend
+
+
+class LoadedJournal(dict):
+    """The local journal as :func:`load_local_data` returns it
+
+    ``revision`` and ``raw`` are the backend's revision and the file's bytes
+    it was loaded (or last saved) at: :func:`save_local_data` compares them
+    with the file to tell what the holder changed from what was saved since.
+    """
+
+    revision = None
+    raw = None
+
+
+# The local journal: what the app reads and saves (GitHub follows through journal.sync)
+@traced()
+def load_local_data():
+    """Load data from the local backend"""
+    backend = storage_backend()
+    with local_write_lock:
+        revision = backend.revision()
+        try:
+            raw = backend.load_raw()
+        except OSError:
+            raw = None
+    try:
+        data = LoadedJournal(json.loads(raw) if raw else {})
+    except ValueError:
+        data = LoadedJournal()
+    data.revision, data.raw = revision, raw
+    return data
+
+def local_data_revision():
+    """Cheap revision token for the local journal (see :meth:`StorageBackend.revision`)"""
+    return storage_backend().revision()
+
+@traced()
+def save_local_data(data):
+    """Save data to the local backend
+
+    A :class:`LoadedJournal` whose file was saved by someone else since it
+    was loaded (the sync engine pulling another device's edits, another
+    session, the live capture) is merged first: units it left as loaded take
+    the file's current version, so only what it changed overwrites the file.
+    ``data`` is updated in place. Any other dict is written as it is.
+    """
+    backend = storage_backend()
+    with local_write_lock:
+        if isinstance(data, LoadedJournal) and data.revision != backend.revision():
+            _merge_saved_since(data, backend)
+        raw = json.dumps(data, indent=2, default=str).encode()
+        backend.save_raw(raw)
+        if isinstance(data, LoadedJournal):
+            data.revision, data.raw = backend.revision(), raw
+
+
+def _comparable(raw):
+    """A journal file's bytes as the app sees them once loaded: migrated, totals reconciled"""
+    try:
+        data = json.loads(raw) if raw else {}
+    except ValueError:
+        data = {}
+    migrate_journal(data)
+    reconcile_journal(data)
+    return data
+
+
+@traced()
+def _merge_saved_since(data, backend):
+    """Take into ``data`` the units saved to the file since it was loaded that ``data`` did not change
+
+    A day's ``trade_day`` changed on both sides is merged further, field by
+    field and trade by trade (see :func:`_merge_trade_day`). Days whose trades
+    came from the file get their totals and risk rebuilt.
+    """
+    try:
+        current = _comparable(backend.load_raw())
+    except OSError:
+        current = {}
+    loaded = _comparable(data.raw)
+    base = unit_revisions(loaded)
+    mine, theirs = unit_revisions(data), unit_revisions(current)
+    empty_day = Day().to_dict()
+    rebuilt = set()
+    for unit in sorted(set(base) | set(mine) | set(theirs)):
+        ancestor = base.get(unit)
+        if theirs.get(unit) == ancestor or mine.get(unit) == theirs.get(unit):
+            continue
+        # A day the page created empty when it loaded counts as unchanged too
+        date_key, _, section = unit.partition('/')
+        untouched = mine.get(unit) == ancestor or (
+            ancestor is None and section and get_unit(data, unit) == empty_day.get(section))
+        if untouched:
+            if unit in theirs:
+                set_unit(data, unit, get_unit(current, unit))
+            else:
+                delete_unit(data, unit)
+        elif section == 'trade_day' and unit in mine and unit in theirs:
+            _merge_trade_day(get_unit(data, unit), loaded.get(date_key, {}).get('trade_day', {}),
+                             get_unit(current, unit))
+        else:
+            continue
+        if section == 'trade_day':
+            rebuilt.add(date_key)
+
+    if rebuilt:
+        # Risk carries from day to day: later days are checked again too
+        reconcile_days(data, sorted(rebuilt))
+        evaluate_from(data, min(rebuilt))
+
+
+def _merge_trade_day(mine, base, theirs):
+    """Three-way merge of one ``trade_day`` into ``mine``, which wins where both changed the same thing
+
+    Fields are merged one by one and trades by id, so a trade saved to the
+    file (by the live capture, say) survives a page editing the day's
+    observations or another trade. Totals and risk are left to be rebuilt.
+    """
+    for key in set(base) | set(theirs):
+        if key in ('trades', 'totals', 'risk'):
+            continue
+        if mine.get(key) == base.get(key) and theirs.get(key) != base.get(key):
+            if key in theirs:
+                mine[key] = theirs[key]
+            else:
+                mine.pop(key, None)
+
+    base_trades = {trade.get('id'): trade for trade in base.get('trades', [])}
+    their_trades = {trade.get('id'): trade for trade in theirs.get('trades', [])}
+    trades = []
+    for trade in mine.get('trades', []):
+        trade_id = trade.get('id')
+        if trade == base_trades.get(trade_id):
+            # Left alone here: the file's version, or gone if the file deleted it
+            if trade_id not in their_trades:
+                continue
+            trade = their_trades[trade_id]
+        trades.append(trade)
+    # Added to the file since (one deleted here stays deleted)
+    kept = {trade.get('id') for trade in mine.get('trades', [])}
+    trades += [trade for trade_id, trade in their_trades.items() if trade_id not in kept and trade_id not in base_trades]
+    mine['trades'] = trades
+
+
+def save_uploaded_file_local(uploaded_file, date_key, file_type):
+    """Save uploaded file locally as fallback"""
+    if uploaded_file is not None:
+        filename = f"{file_type}_{uploaded_file.name}"
+        return storage_backend().save_file(f"screenshots/{date_key}/{filename}", bytes(uploaded_file.getbuffer()),
+                                           f"Add screenshot {filename}")
+    return None
@@ -0,0 +1,296 @@
+"""Offline-first sync between the local journal and GitHub.
+
+The local backend (:func:`journal.storage.storage_backend`) is the journal's
+source of truth: the app always loads from it and every save goes to it,
+with or without a connection. A :class:`SyncEngine` thread brings GitHub's
+copy of the journal file in line in the background, so no page waits on
+the network.
+
+Changes are merged per unit: a setting (``tags``, ``transactions``, ...) or
+one section of one day (``2025-09-12/trade_day``). A unit's revision id is
+the SHA-1 of its canonical JSON, and the sync state (:data:`SYNC_STATE_FILE`,
+next to the journal) keeps the revisions of the last synced journal -- the
+common ancestor of both sides. Each round compares the three:
+
+- a unit only changed locally is pushed, one only changed on GitHub is
+  pulled (deletions included);
+- a unit changed on both sides since the last sync is a conflict: this
+  device's version is kept, GitHub's is saved in the sync state and listed
+  in the sidebar.
+
+The merged journal is written to GitHub with the SHA it was read at, so a
+write from another device in between fails the round instead of being
+overwritten; the next round merges again. Locally it is only written if no
+save happened while the round ran.
+
+A round runs when the local file changes (checked every
+:data:`POLL_INTERVAL`) and every :data:`SYNC_INTERVAL` to pick up changes
+from other devices. Reading GitHub's copy is a conditional request at
+background priority (see :mod:`journal.github_client`): free when nothing
+changed, deferred when the API budget runs low. After the engine's own
+write there is no ETag to ask with, so the file's SHA in the directory
+listing is checked instead of downloading it again. Offline, rounds fail
+and local saves pile up until one goes through.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+
+from journal.github_client import BACKGROUND, GitHubError
+from journal.perf import traced
+from journal.reconcile import reconcile_days
+from journal.risk import evaluate_from
+from journal.schema import delete_unit, get_unit, is_date_key, migrate_journal, set_unit, unit_revisions
+from journal.storage import (
+    DATA_FILE,
+    load_local_data,
+    local_data_revision,
+    local_write_lock,
+    save_local_data,
+    storage_backend,
+)
+
+SYNC_STATE_FILE = "sync_state.json"
+
+# Seconds between checks of the local file for saves to push
+POLL_INTERVAL = 2.0
+
+# Seconds between checks of GitHub for changes from other devices
+SYNC_INTERVAL = 30.0
+
+# Conflicting versions kept from GitHub, newest last
+MAX_CONFLICTS = 50
+
+
+def merge(base, local, remote, local_revisions=None, remote_revisions=None):
+    """Three-way merge of two journals by unit
+
+    ``base`` holds the unit revisions of the last synced journal. Returns
+    ``(merged, merged_revisions, pulled, pushed, conflicts)``: ``pulled`` and
+    ``pushed`` are the units taken from each side, ``conflicts`` maps units
+    changed on both sides to GitHub's version (the local one is kept).
+    ``local`` is not modified.
+    """
+    local_revisions = local_revisions if local_revisions is not None else unit_revisions(local)
+    remote_revisions = remote_revisions if remote_revisions is not None else unit_revisions(remote)
+    merged = {key: dict(value) if is_date_key(key) and isinstance(value, dict) else value
+              for key, value in local.items()}
+    revisions = dict(local_revisions)
+    pulled, pushed, conflicts = [], [], {}
+
+    for unit in sorted(set(local_revisions) | set(remote_revisions)):
+        mine, theirs, ancestor = local_revisions.get(unit), remote_revisions.get(unit), base.get(unit)
+        if mine == theirs:
+            continue
+        if mine == ancestor:
+            if theirs is None:
+                delete_unit(merged, unit)
+                revisions.pop(unit, None)
+            else:
+                set_unit(merged, unit, get_unit(remote, unit))
+                revisions[unit] = theirs
+            pulled.append(unit)
+        elif theirs == ancestor:
+            pushed.append(unit)
+        else:
+            conflicts[unit] = get_unit(remote, unit) if theirs is not None else None
+            pushed.append(unit)
+    return merged, revisions, pulled, pushed, conflicts
+
+
+class SyncEngine:
+    """Keeps GitHub's journal file in step with the local backend"""
+
+    def __init__(self, remote, state_file=None):
+        self.remote = remote
+        self.state_file = state_file or storage_backend().path(SYNC_STATE_FILE)
+        self.lock = threading.Lock()
+        self.state = self._read_state()
+        self.error = None
+        self.running_round = False
+        self.last_check = None
+        self.last_round = {}
+        # Revisions of the last journal read from each side, by its revision token
+        self._local_cache = (None, None)
+        self._remote_cache = (None, None)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _read_state(self):
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        return {'base': {}, 'local_revision': None, 'remote_sha': None, 'last_sync': None, 'conflicts': [],
+                **state}
+
+    def _save_state(self):
+        tmp = self.state_file + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.state_file)
+
+    def _local_revisions(self, revision, data):
+        if self._local_cache[0] != revision:
+            self._local_cache = (revision, unit_revisions(data))
+        return self._local_cache[1]
+
+    def _remote_revisions(self, sha, data):
+        if self._remote_cache[0] != sha:
+            self._remote_cache = (sha, unit_revisions(data))
+        return self._remote_cache[1]
+
+    @traced("sync.round")
+    def sync_once(self):
+        """One round; returns True when both sides hold the same journal afterwards"""
+        with self.lock:
+            self.running_round = True
+            try:
+                return self._sync()
+            except GitHubError as e:
+                # Offline, rate-limited or a concurrent write: the next round tries again
+                self.error = e
+                return False
+            finally:
+                self.running_round = False
+                self.last_check = time.time()
+
+    def _read_remote(self):
+        """``(bytes, sha)`` of GitHub's journal; bytes is None when it is still the one last synced"""
+        client = self.remote.client
+        last_sha = self.state['remote_sha']
+        if last_sha and not client.has_etag(DATA_FILE):
+            # After this engine's own write there is no ETag to ask with: the directory
+            # listing tells whether the file changed since, without downloading it
+            if client.list_directory(priority=BACKGROUND).get(DATA_FILE) == last_sha:
+                return None, last_sha
+        return client.get_contents(DATA_FILE, priority=BACKGROUND)
+
+    def _sync(self):
+        local_revision = local_data_revision()
+        raw, remote_sha = self._read_remote()
+        state = self.state
+        self.error = None
+        if local_revision == state['local_revision'] and remote_sha == state['remote_sha']:
+            return True
+
+        # An empty side stays empty: migrating it would add defaults that conflict with the other side
+        local = load_local_data()
+        if local:
+            migrate_journal(local)
+        if raw is None and remote_sha is not None:
+            # Unchanged since the last round: its units are the base, so nothing is pulled from it
+            remote, remote_revisions = {}, state['base']
+        else:
+            remote = json.loads(raw) if raw else {}
+            if remote:
+                migrate_journal(remote)
+            remote_revisions = self._remote_revisions(remote_sha, remote)
+        merged, revisions, pulled, pushed, conflicts = merge(
+            state['base'], local, remote, self._local_revisions(local_revision, local), remote_revisions)
+
+        # Days whose trades came from GitHub: derived P&L and risk as this journal computes them
+        days = sorted({unit.partition('/')[0] for unit in pulled if unit.endswith('/trade_day')} & set(merged))
+        if days:
+            reconcile_days(merged, days)
+            evaluate_from(merged, days[0])
+            revisions = unit_revisions(merged)
+
+        if revisions != remote_revisions:
+            message = f"Sync {len(pushed)} change{'s' if len(pushed) != 1 else ''} from {socket.gethostname()}"
+            raw = json.dumps(merged, indent=2, default=str).encode()
+            # Compare-and-swap on the SHA read above: another device's write in between fails this round
+            remote_sha = self.remote.client.put_contents(DATA_FILE, raw, message, remote_sha)
+            self._remote_cache = (remote_sha, revisions)
+
+        if revisions != self._local_revisions(local_revision, local):
+            with local_write_lock:
+                if local_data_revision() != local_revision:
+                    # Saved while this round ran: merge again with that save next round
+                    return False
+                save_local_data(merged)
+        local_revision = local_data_revision()
+        self._local_cache = (local_revision, revisions)
+
+        for unit, value in conflicts.items():
+            state['conflicts'].append({'unit': unit, 'time': time.time(), 'remote': value})
+        del state['conflicts'][:-MAX_CONFLICTS]
+        state.update(base=revisions, local_revision=local_revision, remote_sha=remote_sha, last_sync=time.time())
+        self._save_state()
+        self.remote.data_sha = remote_sha
+        self.last_round = {'pulled': len(pulled), 'pushed': len(pushed), 'conflicts': len(conflicts)}
+        return True
+
+    def status(self):
+        """What the sidebar shows: state, pending local changes, last sync, conflicts and the last error"""
+        pending = local_data_revision() != self.state['local_revision']
+        if self.running_round:
+            state = 'syncing'
+        elif self.error is not None:
+            state = 'offline' if self.error.status is None or self.error.rate_limited else 'error'
+        else:
+            state = 'pending' if pending else 'synced'
+        return {
+            'state': state,
+            'pending': pending,
+            'last_sync': self.state['last_sync'],
+            'last_round': self.last_round,
+            'conflicts': list(self.state['conflicts']),
+            'error': str(self.error) if self.error is not None else None,
+        }
+
+    def dismiss_conflicts(self):
+        with self.lock:
+            self.state['conflicts'] = []
+            self._save_state()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="journal-sync", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            due = self.last_check is None or time.time() - self.last_check >= SYNC_INTERVAL
+            if due or local_data_revision() != self.state['local_revision']:
+                self.sync_once()
+            self._stop.wait(POLL_INTERVAL)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+# One engine per repository in the process, shared by every session connected to it
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def start_sync(remote):
+    """The running engine for ``remote``'s repository, started on first use
+
+    A device without a local journal yet gets GitHub's before the first
+    page renders; otherwise the first round runs in the background.
+    """
+    key = (remote.repo_owner, remote.repo_name)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = SyncEngine(remote)
+            if local_data_revision() == "empty":
+                engine.sync_once()
+            engine.start()
+        return engine
+
+
+def sync_engine(remote):
+    """The engine already running for ``remote``'s repository, or None"""
+    with _engines_lock:
+        return _engines.get((remote.repo_owner, remote.repo_name))
@@ -0,0 +1,249 @@
+"""Columnar export of the journal for notebooks and pandas.
+
+The nested journal is flattened into five tables:
+
+- ``days``: one row per journal day with the morning check-in, the trading
+  review (manual and derived P&L, grade, rule compliance) and the evening
+  recap;
+- ``trades``: one row per trade;
+- ``trade_tags``: one row per (trade, tag), for tag-level grouping;
+- ``fills``: one row per broker fill of an imported trade;
+- ``transactions``: deposits and withdrawals.
+
+:func:`export_tables` writes them as Parquet and/or CSV partitioned by
+month (``parquet/trades/month=2025-09/part.parquet``, ``csv/trades/...``);
+pandas, pyarrow and DuckDB read a table directory as one dataset. A manifest records a hash of each month's
+journal content, so later runs rewrite only the months that changed (and
+remove months that no longer exist).
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+import pandas as pd
+
+from journal.perf import traced
+from journal.reconcile import day_pnl, derived_totals
+from journal.rules import compliance_counts
+from journal.schema import Day, is_date_key
+
+TABLES = ('days', 'trades', 'trade_tags', 'fills', 'transactions')
+FORMATS = ('parquet', 'csv')
+MANIFEST = "_manifest.json"
+
+MORNING_FIELDS = ('sleep_quality', 'emotional_state', 'post_night_shift', 'checked_news', 'market_news',
+                  'triggers_present', 'grateful_for', 'daily_goal', 'trading_process')
+TRADING_FIELDS = ('process_grade', 'grade_reasoning', 'general_comments', 'screenshot_notes',
+                  'what_could_improve', 'tomorrow_focus')
+EVENING_FIELDS = ('personal_recap', 'family_highlights', 'personal_wins', 'tomorrow_intentions')
+TRADE_FIELDS = ('timestamp', 'symbol', 'direction', 'quantity', 'entry_price', 'exit_price', 'stop_price',
+                'pnl', 'outcome', 'description')
+FILL_FIELDS = {
+    'DateTime': 'time', 'Symbol': 'symbol', 'BuySell': 'side', 'OpenClose': 'open_close',
+    'FillPrice': 'price', 'FilledQuantity': 'quantity', 'PositionQuantity': 'position',
+    'HighDuringPosition': 'high_during_position', 'LowDuringPosition': 'low_during_position',
+    'FillExecutionServiceID': 'execution_id', 'InternalOrderID': 'order_id', 'OrderType': 'order_type',
+}
+
+# Column dtypes; anything not listed is free text
+DTYPES = {
+    'date': 'datetime64[ns]', 'timestamp': 'datetime64[ns]', 'time': 'datetime64[ns]',
+    'sleep_quality': 'Int64', 'post_night_shift': 'boolean', 'checked_news': 'boolean',
+    'emotional_state': 'category', 'process_grade': 'category', 'symbol': 'category',
+    'direction': 'category', 'outcome': 'category', 'side': 'category', 'open_close': 'category',
+    'order_type': 'category', 'tag': 'category', 'type': 'category',
+    'quantity': 'float64', 'entry_price': 'float64', 'exit_price': 'float64', 'stop_price': 'float64',
+    'pnl': 'float64', 'manual_pnl': 'float64', 'gross_pnl': 'float64', 'fees': 'float64', 'amount': 'float64',
+    'price': 'float64', 'position': 'float64', 'high_during_position': 'float64', 'low_during_position': 'float64',
+    'rules_followed': 'Int64', 'rules_total': 'Int64', 'trade_count': 'Int64',
+}
+
+
+def _blank_to_none(value):
+    return None if value == "" else value
+
+
+def _day_row(date_key, entry):
+    morning = entry['morning']
+    trading = entry['trading']
+    evening = entry['evening']
+    totals = derived_totals(entry)
+    followed, total = compliance_counts(trading)
+
+    row = {'date': date_key}
+    row.update({field: morning.get(field) for field in MORNING_FIELDS})
+    row.update({
+        'pnl': day_pnl(entry) if 'pnl' in trading or totals else None,
+        'manual_pnl': trading.get('pnl'),
+        'gross_pnl': totals['gross_pnl'] if totals else None,
+        'fees': totals['fees'] if totals else None,
+        'trade_count': len(entry['trade_day']['trades']),
+        'rules_followed': followed if total else None,
+        'rules_total': total if total else None,
+    })
+    row.update({field: trading.get(field) for field in TRADING_FIELDS})
+    row.update({field: evening.get(field) for field in EVENING_FIELDS})
+    row['market_observations'] = entry['trade_day']['market_observations']
+    return row
+
+
+def month_rows(data, date_keys):
+    """Rows of every table for the given days (transactions are added by the caller)"""
+    rows = {table: [] for table in TABLES}
+    for date_key in date_keys:
+        entry = data[date_key]
+        rows['days'].append(_day_row(date_key, entry))
+        for trade in entry['trade_day']['trades']:
+            trade_id = trade['id']
+            rows['trades'].append({'trade_id': trade_id, 'date': date_key,
+                                   **{field: _blank_to_none(trade.get(field)) for field in TRADE_FIELDS},
+                                   'tags': ", ".join(trade['tags'])})
+            for tag in trade['tags']:
+                rows['trade_tags'].append({'trade_id': trade_id, 'date': date_key, 'tag': tag, 'pnl': trade.get('pnl')})
+            for fill in trade.get('raw_fills') or []:
+                rows['fills'].append({'trade_id': trade_id, 'date': date_key,
+                                      **{column: _blank_to_none(fill.get(field)) for field, column in FILL_FIELDS.items()}})
+    return rows
+
+
+def table_columns(table):
+    """Columns of an exported table, in order"""
+    if table == 'days':
+        return list(_day_row("", Day().to_dict()))
+    return {
+        'trades': ['trade_id', 'date', *TRADE_FIELDS, 'tags'],
+        'trade_tags': ['trade_id', 'date', 'tag', 'pnl'],
+        'fills': ['trade_id', 'date', *FILL_FIELDS.values()],
+        'transactions': ['date', 'type', 'amount', 'description'],
+    }[table]
+
+
+def to_frame(rows, columns=None):
+    """A table's rows as a DataFrame with the export dtypes"""
+    frame = pd.DataFrame.from_records(rows, columns=columns)
+    for column in frame.columns:
+        dtype = DTYPES.get(column)
+        if dtype == 'datetime64[ns]':
+            # Sierra Chart writes two spaces between date and time
+            frame[column] = pd.to_datetime(frame[column].astype('string').str.split().str.join(' '),
+                                           errors='coerce').astype(dtype)
+        elif dtype == 'float64':
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').astype(dtype)
+        elif dtype == 'Int64':
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').round().astype('Int64')
+        elif dtype is not None:
+            frame[column] = frame[column].astype(dtype)
+        else:
+            frame[column] = frame[column].astype('string')
+    return frame
+
+
+def _month_hash(data, date_keys, transactions):
+    digest = hashlib.sha1()
+    for date_key in date_keys:
+        digest.update(date_key.encode())
+        digest.update(json.dumps(data[date_key], sort_keys=True, default=str).encode())
+    digest.update(json.dumps(transactions, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _partition_dir(out_dir, fmt, table, month):
+    return os.path.join(out_dir, fmt, table, f"month={month}")
+
+
+def _write_partition(out_dir, table, month, frame, formats):
+    for fmt in FORMATS:
+        directory = _partition_dir(out_dir, fmt, table, month)
+        shutil.rmtree(directory, ignore_errors=True)
+        if fmt not in formats or frame.empty:
+            continue
+        os.makedirs(directory)
+        if fmt == 'parquet':
+            frame.to_parquet(os.path.join(directory, "part.parquet"), index=False)
+        else:
+            frame.to_csv(os.path.join(directory, "part.csv"), index=False)
+
+
+@traced()
+def export_tables(data, out_dir, formats=FORMATS, force=False):
+    """Write the journal's tables under ``out_dir``, rewriting only changed months
+
+    Returns ``(written, unchanged, removed)`` lists of months.
+    """
+    months = {}
+    for date_key in sorted(key for key in data if is_date_key(key)):
+        months.setdefault(date_key[:7], []).append(date_key)
+    transactions = {}
+    for transaction in data.get('transactions', []):
+        month = transaction['date'][:7]
+        months.setdefault(month, [])
+        transactions.setdefault(month, []).append(transaction)
+
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    previous = manifest.get('months', {})
+    # A different set of formats (or force) rewrites every month
+    reuse = {} if force or manifest.get('formats') != sorted(formats) else previous
+
+    written, unchanged = [], []
+    hashes = {}
+    for month, date_keys in sorted(months.items()):
+        month_transactions = transactions.get(month, [])
+        hashes[month] = _month_hash(data, date_keys, month_transactions)
+        if reuse.get(month) == hashes[month]:
+            unchanged.append(month)
+            continue
+
+        rows = month_rows(data, date_keys)
+        rows['transactions'] = [{'date': transaction['date'], 'type': transaction['type'],
+                                 'amount': transaction['amount'], 'description': transaction.get('description', '')}
+                                for transaction in month_transactions]
+        for table in TABLES:
+            _write_partition(out_dir, table, month, to_frame(rows[table]), formats)
+        written.append(month)
+
+    removed = sorted(set(previous) - set(months))
+    for month in removed:
+        for table in TABLES:
+            for fmt in FORMATS:
+                shutil.rmtree(_partition_dir(out_dir, fmt, table, month), ignore_errors=True)
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(manifest_path, 'w') as f:
+        json.dump({'formats': sorted(formats), 'months': hashes}, f, indent=2)
+    return written, unchanged, removed
+
+
+def load_table(out_dir, table):
+    """Read an exported table back as one DataFrame (all months)
+
+    Months without rows are not written, so a table with none at all (no
+    tags yet, say) has no directory: it reads as an empty frame.
+    """
+    path = os.path.join(out_dir, 'parquet', table)
+    if not os.path.isdir(path):
+        # With the partition column the dataset adds
+        return to_frame([], table_columns(table)).assign(month=pd.Series(dtype='category'))
+    return pd.read_parquet(path)
+
+
+def tables_zip(data, formats=FORMATS):
+    """Every table as a zip of month partitions, e.g. for a download button"""
+    buffer = io.BytesIO()
+    with tempfile.TemporaryDirectory() as out_dir:
+        export_tables(data, out_dir, formats)
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for root, _, files in os.walk(out_dir):
+                for name in files:
+                    if name != MANIFEST:
+                        path = os.path.join(root, name)
+                        archive.write(path, os.path.relpath(path, out_dir))
+    return buffer.getvalue()
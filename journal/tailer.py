@@ -0,0 +1,307 @@
+"""Live capture: follow a broker trade log while the session is running.
+
+Sierra Chart and NinjaTrader append a line per fill to their trade activity
+log during the session. :class:`LogTailer` follows such a file from a
+background thread: every :data:`POLL_INTERVAL` it compares the file's size
+with the byte offset it has read up to and reads only the bytes appended
+since. Complete lines are parsed with the same
+:func:`journal.trade_log.parse_trade_log` as an uploaded log; fills are
+kept per symbol until the position is flat again, and each completed group
+goes through :func:`journal.trade_log.group_fills_into_trades` and is
+saved to the journal from the tailer's thread by :func:`save_closed_trades`,
+whether or not any page is open. Every fill also updates the tailer's
+:class:`journal.live.LiveSession`, the source of the live P&L panel.
+
+Everything the tailer knows -- the log path, the offset and file identity,
+an incomplete last line, the fills of still open positions and closed
+trades not merged yet -- is written to :data:`LIVE_STATE_FILE` after every
+read, so a restart resumes where it stopped without losing an open
+position's entry fills. A log that is replaced or truncated (a new day's
+file) is read again from the start; trades the journal already has (saved
+just before a crash, say) are recognised by their fills when merged.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+
+from journal.importer import merge_trades
+from journal.live import LiveSession
+from journal.perf import traced
+from journal.risk import day_breaches
+from journal.schema import migrate_journal
+from journal.sessions import SessionCalendar, sortable_timestamp
+from journal.storage import load_local_data, local_write_lock, save_local_data
+from journal.trade_log import group_fills_into_trades, parse_trade_log
+
+LIVE_STATE_FILE = "live_capture.json"
+
+# Seconds between checks of the log's size; a fill shows up within one poll
+# plus the live panel's refresh
+POLL_INTERVAL = 0.25
+
+
+def split_closed(fills):
+    """Split one symbol's fills into those of completed trades and the open position's
+
+    Uses the rule of :func:`journal.trade_log.group_fills_into_trades`: a
+    trade ends on the fill that brings ``PositionQuantity`` back to zero.
+    """
+    boundary, count = 0, 0
+    for i, fill in enumerate(fills):
+        count += 1
+        position = float(fill.get('PositionQuantity') or 0)
+        if position == 0 and count > 1:
+            boundary, count = i + 1, 0
+    return fills[:boundary], fills[boundary:]
+
+
+@traced()
+def save_closed_trades(trades):
+    """Merge closed trades into the local journal and save it
+
+    Reads the journal as it is on disk and writes it back under
+    :data:`journal.storage.local_write_lock`, so nothing saved meanwhile is
+    lost. Returns ``(count, breaches)``: how many trades were added or
+    merged, and the risk breaches of each day that changed.
+    """
+    with local_write_lock:
+        data = load_local_data()
+        migrate_journal(data)
+        added, updated, _ = merge_trades(data, trades)
+        days = set(added) | set(updated)
+        if days:
+            save_local_data(data)
+    return sum(added.values()) + sum(updated.values()), {key: day_breaches(data[key]) or [] for key in days}
+
+
+class LogTailer:
+    """Incremental reader of one trade log, with its state in a JSON file
+
+    ``on_closed(trades)`` is called from the polling thread with the trades
+    closed since its last call; once it returns ``(count, breaches)`` (see
+    :func:`save_closed_trades`) they are forgotten, :attr:`saved` grows by
+    ``count`` and :attr:`breaches` is updated. Without it closed trades only
+    pile up in :attr:`closed`.
+    """
+
+    def __init__(self, path, calendar=None, state_file=LIVE_STATE_FILE, on_closed=None):
+        self.path = path
+        self.calendar = calendar or SessionCalendar()
+        self.state_file = state_file
+        self.on_closed = on_closed
+        self.lock = threading.Lock()
+        self.file_id = None
+        self.offset = 0
+        self.header = None
+        self.partial = b""
+        self.open_fills = {}
+        self.closed = []
+        self.live = LiveSession()
+        self.saved = 0
+        self.breaches = {}
+        self.error = None
+        self.last_poll = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._load_state()
+
+    def _load_state(self):
+        state = read_state(self.state_file)
+        if state.get('path') != self.path:
+            return
+        self.file_id = state.get('file_id')
+        self.offset = state.get('offset', 0)
+        self.header = state.get('header')
+        self.partial = state.get('partial', "").encode('utf-8')
+        self.open_fills = state.get('open_fills', {})
+        self.closed = state.get('closed', [])
+        self.live = LiveSession.from_dict(state.get('live', {}))
+
+    def _save_state(self):
+        state = {
+            'path': self.path,
+            'calendar': asdict(self.calendar),
+            'active': self.running,
+            'file_id': self.file_id,
+            'offset': self.offset,
+            'header': self.header,
+            'partial': self.partial.decode('utf-8', errors='replace'),
+            'open_fills': self.open_fills,
+            'closed': self.closed,
+            'live': self.live.to_dict(),
+        }
+        tmp = self.state_file + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_file)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    @traced("tailer.poll")
+    def poll(self):
+        """Read what was appended since the last poll; returns the number of trades it closed"""
+        with self.lock:
+            self.last_poll = time.time()
+            try:
+                stat = os.stat(self.path)
+            except OSError as e:
+                self.error = f"Cannot read {self.path}: {e.strerror}"
+                return 0
+            self.error = None
+
+            file_id = [stat.st_dev, stat.st_ino]
+            if file_id != self.file_id or stat.st_size < self.offset:
+                # A new or truncated log: read it from the start (open positions carry over)
+                self.file_id, self.offset, self.header, self.partial = file_id, 0, None, b""
+            if stat.st_size == self.offset:
+                return 0
+
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                chunk = f.read(stat.st_size - self.offset)
+            self.offset += len(chunk)
+
+            # Only complete lines; a line still being written waits for the next poll
+            *lines, self.partial = (self.partial + chunk).split(b"\n")
+            lines = [line.decode('utf-8-sig' if self.header is None and i == 0 else 'utf-8', errors='replace')
+                     for i, line in enumerate(lines) if line.strip()]
+            if lines and self.header is None:
+                self.header = lines.pop(0)
+
+            closed = 0
+            if lines:
+                fills, error = parse_trade_log(self.header + "\n" + "\n".join(lines))
+                if error:
+                    self.error = error
+                else:
+                    closed = self._add_fills(fills or [])
+            self._save_state()
+            return closed
+
+    def _add_fills(self, fills):
+        symbols = {}
+        for fill in fills:
+            symbol = fill.get('Symbol', 'Unknown')
+            self.open_fills.setdefault(symbol, []).append(fill)
+            symbols[symbol] = True
+            self.live.add_fill(fill, self.calendar.session_date_key(fill.get('DateTime', '')))
+
+        done_trades = []
+        for symbol in symbols:
+            done, still_open = split_closed(self.open_fills[symbol])
+            if done:
+                done_trades.extend(group_fills_into_trades(done))
+            if still_open:
+                self.open_fills[symbol] = still_open
+            else:
+                del self.open_fills[symbol]
+        # In the order they closed across symbols: the streak counts them in that order
+        done_trades.sort(key=lambda trade: sortable_timestamp(trade['raw_fills'][-1].get('DateTime', '')))
+        self.closed.extend(done_trades)
+        for trade in done_trades:
+            self.live.add_trade(trade)
+        return len(done_trades)
+
+    def save_closed(self):
+        """Hand the closed trades to ``on_closed`` and forget them once it returns
+
+        Runs on the polling thread (and in :meth:`stop` after it ended), the
+        only place trades leave :attr:`closed`, so ``poll`` appending more
+        meanwhile cannot shift what is forgotten.
+        """
+        with self.lock:
+            trades = list(self.closed)
+        if not trades or self.on_closed is None:
+            return
+        count, breaches = self.on_closed(trades)
+        with self.lock:
+            del self.closed[:len(trades)]
+            self.saved += count
+            self.breaches.update(breaches)
+            self._save_state()
+
+    def live_snapshot(self, commission=0.0, daily_loss_limit=0.0):
+        """Live P&L numbers (see :meth:`journal.live.LiveSession.snapshot`)"""
+        with self.lock:
+            return self.live.snapshot(commission, daily_loss_limit)
+
+    def start(self, interval=POLL_INTERVAL):
+        """Poll in a daemon thread until :meth:`stop`"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="journal-log-tailer", daemon=True)
+        self._thread.start()
+        with self.lock:
+            self._save_state()
+
+    def _run(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+                self.save_closed()
+            except Exception as e:
+                # Keep following; the page shows the error
+                self.error = str(e)
+            self._stop.wait(interval)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self.save_closed()
+        except Exception as e:
+            self.error = str(e)
+        with self.lock:
+            self._save_state()
+
+
+def read_state(state_file=LIVE_STATE_FILE):
+    try:
+        with open(state_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# The process's tailer: one log is followed at a time, shared by every session
+_tailer = None
+_tailer_lock = threading.Lock()
+
+
+def live_tailer():
+    """The running tailer, resuming the one saved as active after a restart; None if off"""
+    global _tailer
+    with _tailer_lock:
+        if _tailer is None:
+            state = read_state()
+            if state.get('active') and state.get('path'):
+                _tailer = LogTailer(state['path'], SessionCalendar(**state.get('calendar', {})),
+                                    on_closed=save_closed_trades)
+                _tailer.start()
+        return _tailer
+
+
+def start_live_capture(path, calendar=None):
+    """Follow ``path``, replacing any log followed so far; fills are dated with ``calendar``"""
+    global _tailer
+    with _tailer_lock:
+        if _tailer is not None:
+            _tailer.stop()
+        _tailer = LogTailer(path, calendar, on_closed=save_closed_trades)
+        _tailer.start()
+        return _tailer
+
+
+def stop_live_capture():
+    global _tailer
+    with _tailer_lock:
+        if _tailer is not None:
+            _tailer.stop()
+        _tailer = None
@@ -0,0 +1,185 @@
+"""Broker trade log parsing and grouping of fills into trades.
+
+Imported trades get deterministic ids: the same fills always produce the
+same trade id, so re-importing a log (or an overlapping one) can be
+recognised instead of duplicating trades. A fill is identified by the
+broker's ``FillExecutionServiceID`` or, for logs without one, a hash of its
+symbol, time, side, size, price and order id.
+"""
+
+import hashlib
+import uuid
+
+from journal.perf import traced
+from journal.sessions import sortable_timestamp
+
+
+@traced()
+def parse_trade_log(file_content):
+    """Parse uploaded trade log file"""
+    try:
+        lines = file_content.strip().split('\n')
+        if len(lines) < 2:
+            return None, "File appears to be empty or invalid"
+
+        # Try to detect delimiter
+        header_line = lines[0]
+        delimiter = '\t' if '\t' in header_line else ',' if ',' in header_line else None
+
+        if not delimiter:
+            return None, "Could not detect file format (expected CSV or TSV)"
+
+        headers = header_line.split(delimiter)
+        trades = []
+
+        for i, line in enumerate(lines[1:], 1):
+            if line.strip():
+                values = line.split(delimiter)
+                if len(values) >= len(headers):
+                    trade = {}
+                    for j, header in enumerate(headers):
+                        trade[header] = values[j] if j < len(values) else ''
+                    trades.append(trade)
+
+        return trades, None
+    except Exception as e:
+        return None, f"Error parsing file: {str(e)}"
+
+# Namespace for uuid5 trade ids derived from fill keys (any fixed UUID works; never change it)
+TRADE_ID_NAMESPACE = uuid.UUID('6f1c1a52-3c1e-4f7e-9a59-2b8d4c0e7a31')
+
+FILL_HASH_FIELDS = ('Symbol', 'DateTime', 'BuySell', 'Quantity', 'FillPrice', 'InternalOrderID')
+
+def fill_key(fill):
+    """Stable identity of a single fill"""
+    execution_id = fill.get('FillExecutionServiceID', '').strip()
+    if execution_id:
+        return execution_id
+    raw = '|'.join(fill.get(field, '').strip() for field in FILL_HASH_FIELDS)
+    return 'sha1:' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def trade_id_from_fills(fills):
+    """Deterministic trade id: a uuid5 of the trade's sorted fill keys"""
+    return str(uuid.uuid5(TRADE_ID_NAMESPACE, ','.join(sorted(fill_key(fill) for fill in fills))))
+
+def get_point_value(symbol):
+    """Get point value for P&L calculation"""
+    if 'ENQU25' in symbol:
+        return 20.0
+    elif 'mNQU25' in symbol or 'MNQU25' in symbol:
+        return 2.0
+    else:
+        return 1.0
+
+@traced()
+def group_fills_into_trades(trades_data):
+    """Group individual fills into complete trades based on position changes"""
+    if not trades_data:
+        return []
+
+    # Group by symbol first
+    symbol_groups = {}
+    for fill in trades_data:
+        symbol = fill.get('Symbol', 'Unknown')
+        if symbol not in symbol_groups:
+            symbol_groups[symbol] = []
+        symbol_groups[symbol].append(fill)
+
+    individual_trades = []
+
+    for symbol, fills in symbol_groups.items():
+        # Sort fills by time
+        fills.sort(key=lambda x: sortable_timestamp(x.get('DateTime', '')))
+
+        trade_fills = []
+
+        for fill in fills:
+            position_qty = float(fill.get('PositionQuantity', 0)) if fill.get('PositionQuantity') else 0
+            open_close = fill.get('OpenClose', '')
+
+            trade_fills.append(fill)
+
+            # Check if this completes a trade (position returns to 0)
+            if position_qty == 0 and len(trade_fills) > 1:
+                # Trade completed - position back to zero
+                trade_summary = create_trade_summary_from_fills(trade_fills, symbol)
+                if trade_summary:
+                    individual_trades.append(trade_summary)
+                trade_fills = []
+            elif len(trade_fills) == 1 and open_close == 'Open':
+                # Starting a new trade
+                pass
+
+    return individual_trades
+
+def create_trade_summary_from_fills(fills, symbol):
+    """Create a trade summary from a group of fills"""
+    if not fills:
+        return None
+
+    # Calculate trade details
+    entry_fills = [f for f in fills if f.get('OpenClose') == 'Open']
+    exit_fills = [f for f in fills if f.get('OpenClose') == 'Close']
+
+    if not entry_fills or not exit_fills:
+        return None
+
+    # Get entry and exit info
+    entry_time = entry_fills[0].get('DateTime', '')
+    exit_time = exit_fills[-1].get('DateTime', '')
+
+    # Calculate quantity and average prices
+    total_quantity = sum(float(f.get('Quantity', 0)) for f in entry_fills)
+
+    # Calculate weighted average entry price
+    total_entry_value = sum(float(f.get('Quantity', 0)) * float(f.get('FillPrice', 0)) for f in entry_fills)
+    entry_avg_price = total_entry_value / total_quantity if total_quantity > 0 else 0
+
+    # Calculate weighted average exit price
+    total_exit_quantity = sum(float(f.get('Quantity', 0)) for f in exit_fills)
+    total_exit_value = sum(float(f.get('Quantity', 0)) * float(f.get('FillPrice', 0)) for f in exit_fills)
+    exit_avg_price = total_exit_value / total_exit_quantity if total_exit_quantity > 0 else 0
+
+    # Determine direction
+    direction = "Long" if entry_fills and entry_fills[0].get('BuySell') == 'Buy' else "Short"
+
+    # Calculate P&L
+    pnl = 0
+    if entry_avg_price and exit_avg_price and total_quantity:
+        point_value = get_point_value(symbol)
+        if direction == "Long":
+            pnl = (exit_avg_price - entry_avg_price) * total_quantity * point_value
+        else:
+            pnl = (entry_avg_price - exit_avg_price) * total_quantity * point_value
+
+    # Determine outcome
+    outcome = "win" if pnl > 0 else "loss" if pnl < 0 else "pending"
+
+    # Create description
+    description = f"{direction} {total_quantity} {symbol} @ {entry_avg_price:.2f}"
+    if exit_avg_price:
+        description += f" → {exit_avg_price:.2f}"
+    if pnl != 0:
+        description += f" (P&L: ${pnl:.2f})"
+
+    # Add timing info
+    if entry_time and exit_time:
+        entry_time_only = entry_time.split(' ')[1] if ' ' in entry_time else entry_time
+        exit_time_only = exit_time.split(' ')[1] if ' ' in exit_time else exit_time
+        description += f" | {entry_time_only} - {exit_time_only}"
+
+    return {
+        'id': trade_id_from_fills(fills),
+        'timestamp': entry_time,
+        'description': description,
+        'tags': [],  # Will be filled by user
+        'outcome': outcome,
+        'screenshot': None,  # Will be added by user
+        'raw_fills': fills,  # Keep original data for reference
+        'symbol': symbol,
+        'direction': direction,
+        'quantity': total_quantity,
+        'entry_price': entry_avg_price,
+        'exit_price': exit_avg_price,
+        'pnl': pnl
+    }
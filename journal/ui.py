@@ -0,0 +1,51 @@
+"""Shared Streamlit UI helpers: styling and image display."""
+
+import os
+
+import streamlit as st
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
+
+
+@st.cache_resource
+def load_css():
+    """Read the app stylesheet once per server process"""
+    with open(os.path.join(ASSETS_DIR, "style.css"), 'r') as f:
+        return f"<style>\n{f.read()}</style>"
+
+
+def inject_css():
+    """Emit the cached stylesheet into the current run"""
+    st.markdown(load_css(), unsafe_allow_html=True)
+
+
+def display_image_full_size(image_source, caption="Screenshot"):
+    """Display image at full size with option to expand"""
+    if image_source:
+        if image_source.startswith('http'):
+            # For GitHub URLs, display directly
+            st.image(image_source, caption=caption, use_container_width=True)
+        elif os.path.exists(image_source):
+            # For local files, display at full size
+            try:
+                from PIL import Image
+
+                image = Image.open(image_source)
+                st.image(image, caption=caption, use_container_width=True)
+            except:
+                st.error(f"Could not load image: {image_source}")
+
+
+def rerun_fragment():
+    """Rerun only the enclosing fragment, or the whole app on a full run
+
+    ``st.rerun(scope="fragment")`` is only valid while Streamlit is rerunning
+    that fragment; a button in a fragment can also be seen as pressed during
+    a full run (e.g. right after a navigation), so fall back to an app rerun.
+    """
+    from streamlit.errors import StreamlitAPIException
+
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
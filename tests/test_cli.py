@@ -0,0 +1,14 @@
+"""Command-line option handling"""
+
+import pytest
+
+from journal import cli
+
+
+@pytest.mark.parametrize('option', [['--roll-time', "25:00"], ['--log-timezone', "Mars/Base"]])
+def test_bad_session_options_are_usage_errors(tmp_path, option, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['import', str(tmp_path), *option])
+
+    assert exit_info.value.code == 2
+    assert option[0] in capsys.readouterr().err
@@ -0,0 +1,57 @@
+"""Risk evaluation after trades are removed"""
+
+import copy
+import random
+from datetime import date
+
+from benchmarks.synthetic import fills_to_trade_log, generate_fills
+from journal.importer import merge_trades
+from journal.reconcile import reconcile_days
+from journal.risk import day_breaches, evaluate_from, save_risk_settings
+from journal.schema import migrate_journal
+from journal.trade_log import group_fills_into_trades, parse_trade_log
+
+
+def _trades(day, count, seed):
+    fills, _ = parse_trade_log(fills_to_trade_log(generate_fills(random.Random(seed), day, count, [900000 + seed * 1000])))
+    return group_fills_into_trades(fills)
+
+
+def _journal(first_seed, second_seed):
+    """Two days of three trades each, with limits the losing days break"""
+    data = {}
+    migrate_journal(data)
+    save_risk_settings(data, 100.0, trailing_drawdown=200.0, max_trades_per_day=1)
+    merge_trades(data, _trades(date(2025, 9, 11), 3, first_seed) + _trades(date(2025, 9, 12), 3, second_seed))
+    return data
+
+
+def _clear(data, date_key):
+    """What the Trade Day page does when a day's trades are deleted"""
+    data[date_key]['trade_day']['trades'] = []
+    reconcile_days(data, [date_key])
+    evaluate_from(data, date_key)
+
+
+def test_day_cleared_of_trades_loses_its_breaches():
+    data = _journal(7, 8)
+    assert {breach['rule'] for breach in day_breaches(data["2025-09-11"])} >= {'daily_loss', 'max_trades'}
+
+    _clear(data, "2025-09-11")
+
+    assert day_breaches(data["2025-09-11"]) is None
+    assert 'risk' not in data["2025-09-11"]['trade_day']
+
+
+def test_later_days_do_not_start_from_a_cleared_days_high_water():
+    # A winning first day raises the high-water mark the second day's drawdown is measured from
+    data = _journal(3, 7)
+    without = copy.deepcopy(data)
+    del without["2025-09-11"]
+    evaluate_from(without, "")
+
+    _clear(data, "2025-09-11")
+    # Editing the second day re-evaluates from there, on the high-water mark of the days before
+    evaluate_from(data, "2025-09-12")
+
+    assert data["2025-09-12"]['trade_day']['risk'] == without["2025-09-12"]['trade_day']['risk']
@@ -0,0 +1,21 @@
+"""Migrating journals written by older and newer versions of the app"""
+
+from journal.schema import migrate_journal, normalize_day
+
+DAY = "2025-09-12"
+
+
+def test_unknown_day_fields_survive_migration():
+    data = {DAY: {
+        'morning': {'sleep_quality': 7},
+        'trade_day': {'market_observations': "Gap up", 'trades': [], 'news': ["CPI 8:30"]},
+        'weekly_review': {'grade': "B"},
+    }}
+
+    migrate_journal(data)
+
+    day = data[DAY]
+    assert day['weekly_review'] == {'grade': "B"}
+    assert day['trade_day']['news'] == ["CPI 8:30"]
+    assert day['trade_day']['market_observations'] == "Gap up"
+    assert normalize_day(day) == day
@@ -0,0 +1,92 @@
+"""Saving a journal loaded before someone else saved the file"""
+
+import json
+import random
+from datetime import date
+
+import pytest
+
+from benchmarks.synthetic import fills_to_trade_log, generate_fills
+from journal import storage
+from journal.importer import merge_trades
+from journal.risk import evaluate_from, save_risk_settings
+from journal.schema import migrate_journal
+from journal.tailer import save_closed_trades
+from journal.trade_log import group_fills_into_trades, parse_trade_log
+
+DAY = "2025-09-12"
+
+
+def _trades(count, seed=0):
+    log = fills_to_trade_log(generate_fills(random.Random(seed), date(2025, 9, 12), count, [900000]))
+    fills, _ = parse_trade_log(log)
+    return group_fills_into_trades(fills)
+
+
+@pytest.fixture
+def closing(tmp_path, monkeypatch):
+    """A scratch local journal holding five trades on one day; returns the trades still to close"""
+    monkeypatch.setattr(storage, '_backend', storage.LocalDirectoryBackend(str(tmp_path)))
+    trades = _trades(6)
+    data = {}
+    migrate_journal(data)
+    save_risk_settings(data, 500.0, max_trades_per_day=5)
+    merge_trades(data, trades[:5])
+    storage.save_local_data(data)
+    return trades[5:]
+
+
+def _on_disk():
+    return storage.storage_backend().load()
+
+
+def test_page_save_keeps_trade_captured_meanwhile(closing):
+    page = storage.load_local_data()
+    count, _ = save_closed_trades(closing)
+    assert count == 1 and len(_on_disk()[DAY]['trade_day']['trades']) == 6
+
+    page[DAY]['trade_day']['market_observations'] = "Trend day"
+    storage.save_local_data(page)
+
+    trade_day = _on_disk()[DAY]['trade_day']
+    assert trade_day['market_observations'] == "Trend day"
+    assert len(trade_day['trades']) == 6
+    assert trade_day['totals']['trade_count'] == 6
+    # The sixth trade breaks the five-trade limit whichever copy was saved last
+    assert any(breach['rule'] == 'max_trades' for breach in trade_day['risk']['breaches'])
+    # The page's copy is merged in place
+    assert len(page[DAY]['trade_day']['trades']) == 6
+
+
+def test_page_risk_rebuild_keeps_trade_captured_meanwhile(closing):
+    page = storage.load_local_data()
+    save_closed_trades(closing)
+
+    # A settings change re-evaluates every day from the page's stale copy
+    save_risk_settings(page, 500.0, max_trades_per_day=3)
+    evaluate_from(page, "")
+    storage.save_local_data(page)
+
+    data = _on_disk()
+    assert data['risk_settings']['max_trades_per_day'] == 3
+    assert len(data[DAY]['trade_day']['trades']) == 6
+    risk = data[DAY]['trade_day']['risk']
+    assert risk['trades'] == 6
+    assert [breach['detail'] for breach in risk['breaches'] if breach['rule'] == 'max_trades'] == ["Trade 4 of max 3"]
+
+
+def test_page_edits_win_over_the_file(closing):
+    page = storage.load_local_data()
+    other = storage.load_local_data()
+    other[DAY]['trade_day']['trades'][0]['description'] = "theirs"
+    other[DAY]['trade_day']['trades'][1]['description'] = "theirs"
+    storage.save_local_data(other)
+
+    page[DAY]['trade_day']['trades'][0]['description'] = "mine"
+    del page[DAY]['trade_day']['trades'][4]
+    storage.save_local_data(page)
+
+    trades = _on_disk()[DAY]['trade_day']['trades']
+    assert [trade['description'] for trade in trades[:2]] == ["mine", "theirs"]
+    assert len(trades) == 4
+    assert json.loads(json.dumps(page)) == _on_disk()
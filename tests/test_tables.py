@@ -0,0 +1,21 @@
+"""Reading exported tables back"""
+
+from journal.entries import create_new_trade
+from journal.schema import Day, migrate_journal
+from journal.tables import TABLES, export_tables, load_table, table_columns
+
+
+def test_tables_without_rows_read_as_empty_frames(tmp_path):
+    data = {"2025-09-12": Day().to_dict()}
+    migrate_journal(data)
+    data["2025-09-12"]['trade_day']['trades'].append(create_new_trade("Opening drive", [], "win"))
+    export_tables(data, str(tmp_path))
+
+    assert len(load_table(str(tmp_path), 'trades')) == 1
+    for table in ('trade_tags', 'fills', 'transactions'):
+        frame = load_table(str(tmp_path), table)
+        assert frame.empty
+        assert list(frame.columns) == table_columns(table) + ['month']
+    # The same columns as a table with rows
+    assert {table: list(load_table(str(tmp_path), table).columns) for table in TABLES} == {
+        table: table_columns(table) + ['month'] for table in TABLES}
@@ -0,0 +1,34 @@
+"""Trade logs exported with US-locale timestamps"""
+
+from journal.importer import merge_trades
+from journal.risk import save_risk_settings
+from journal.schema import migrate_journal
+from journal.trade_log import group_fills_into_trades
+
+
+def _fill(time, position, side, price, order):
+    return {'Symbol': "F.US.MESZ25", 'DateTime': f"9/12/2025 {time}", 'BuySell': side, 'Quantity': "1",
+            'FillPrice': str(price), 'PositionQuantity': str(position), 'OpenClose': "Open" if position else "Close",
+            'InternalOrderID': str(order)}
+
+
+# 9:30 sorts after 10:00 as text
+FILLS = [
+    _fill("10:00:00 AM", 1, "Buy", 6500.0, 3), _fill("10:05:00 AM", 0, "Sell", 6490.0, 4),
+    _fill("9:30:00 AM", -1, "Sell", 6500.0, 1), _fill("9:35:00 AM", 0, "Buy", 6495.0, 2),
+]
+
+
+def test_fills_group_in_time_order():
+    trades = group_fills_into_trades(FILLS)
+    assert [(trade['timestamp'], trade['direction']) for trade in trades] == [
+        ("9/12/2025 9:30:00 AM", "Short"), ("9/12/2025 10:00:00 AM", "Long")]
+
+
+def test_risk_sees_trades_in_time_order():
+    data = {}
+    migrate_journal(data)
+    save_risk_settings(data, 0.0, max_trades_per_day=1)
+    merge_trades(data, group_fills_into_trades(FILLS))
+    breaches = data["2025-09-12"]['trade_day']['risk']['breaches']
+    assert [(breach['rule'], breach['time']) for breach in breaches] == [('max_trades', "2025-09-12 10:00:00")]